@@ -0,0 +1,217 @@
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from src.backend.Collection import Collection
+from src.backend.CollectionSummary import CollectionSummary
+from src.backend.Product import Product
+from src.backend.DataManager import DataManager
+from src.backend.StorageBackend import StorageBackend
+
+"""
+The apps saved collections, shared by every page and scrape job of the app.
+Collections are loaded from the storage backend the first time they are asked for and kept,
+a kept collection is only loaded again once its version has changed. A version is made up of
+the version the backend gives the collection (for CSVs, the files modification time and size,
+so changes made outside of the app are noticed) and a count of the writes made to it through
+the repository (so writes within the same modification time are noticed too).
+Callers are given their own copy of a kept collection, so changes made to one are not seen
+by anyone else until they are saved through the repository.
+"""
+class CollectionRepository:
+    _instance : "CollectionRepository" = None
+    _instance_lock : threading.Lock = threading.Lock()
+
+    """
+    backend is the storage backend to keep collections from, by default the one selected by the DataManager
+    """
+    def __init__(self, backend : Optional[StorageBackend] = None) -> None:
+        self._backend : Optional[StorageBackend] = backend
+        self._lock : threading.RLock = threading.RLock()
+        self._cached_backend : Optional[StorageBackend] = None
+        self._collections : Dict[str, Tuple[Hashable, Collection]] = {}
+        self._summaries : Optional[Tuple[Hashable, List[CollectionSummary]]] = None
+        self._write_counts : Dict[str, int] = {}
+        self._writes : int = 0
+        self.hits : int = 0
+        self.misses : int = 0
+
+    """
+    Returns the repository shared by the whole app
+    """
+    @staticmethod
+    def get() -> "CollectionRepository":
+        with CollectionRepository._instance_lock:
+            if CollectionRepository._instance is None:
+                CollectionRepository._instance = CollectionRepository()
+            return CollectionRepository._instance
+
+    """
+    The storage backend in use, everything kept is forgotten when it is replaced
+    """
+    @property
+    def backend(self) -> StorageBackend:
+        backend = self._backend or DataManager.get_storage_backend()
+        with self._lock:
+            if backend is not self._cached_backend:
+                self.clear()
+                self._cached_backend = backend
+        return backend
+
+    def list_summaries(self) -> List[CollectionSummary]:
+        backend = self.backend
+        with self._lock:
+            version = (self._writes, backend.get_version())
+            if self._summaries is not None and self._summaries[0] == version:
+                self.hits += 1
+                return list(self._summaries[1])
+            self.misses += 1
+            summaries = backend.list_collection_summaries()
+            self._summaries = (version, summaries)
+            return list(summaries)
+
+    """
+    Returns a copy of the collection with the given name, or None if there is no such collection
+    """
+    def get_collection(self, collectionName : str) -> Optional[Collection]:
+        backend = self.backend
+        with self._lock:
+            collection = self._get_cached_collection(backend, collectionName)
+            return None if collection is None else CollectionRepository._copy_collection(collection)
+
+    def save_collections(self, collections : List[Collection]) -> None:
+        backend = self.backend
+        with self._lock:
+            backend.save_collections(collections)
+            for collection in collections:
+                self._record_write(collection.name)
+
+    """
+    Saves a single product of a collection, the kept collection is updated
+    with the product rather than being loaded again
+    """
+    def save_product(self, collectionName : str, product : Product) -> None:
+        backend = self.backend
+        with self._lock:
+            collection = self._take_cached_collection(backend, collectionName)
+            backend.save_product(collectionName, product)
+            self._record_write(collectionName)
+            if collection is None:
+                return
+            product = product.copy()
+            for index, savedProduct in enumerate(collection.products):
+                if savedProduct.productID == product.productID:
+                    collection.products[index] = product
+                    break
+            else:
+                collection.add_product(product)
+            self._collections[collectionName] = (self._get_collection_version(backend, collectionName), collection)
+
+    """
+    Deletes a single product of a collection (see StorageBackend.delete_product),
+    the product is also removed from the kept collection rather than it being loaded again
+    """
+    def delete_product(self, collectionName : str, productId : str) -> bool:
+        backend = self.backend
+        with self._lock:
+            collection = self._take_cached_collection(backend, collectionName)
+            deleted = backend.delete_product(collectionName, productId)
+            self._record_write(collectionName)
+            if collection is not None:
+                collection.products = [product for product in collection.products if product.productID != productId]
+                self._collections[collectionName] = (self._get_collection_version(backend, collectionName), collection)
+            return deleted
+
+    """
+    Saves products of a collection over the saved products with the same ids, in a single write.
+    When attributes are given (such as ["description", "reviews"]) only those are saved,
+    the rest of each saved product is left as it is. Products that are no longer saved
+    (such as ones deleted since they were loaded) are not saved again.
+    Returns the number of products saved
+    """
+    def update_products(self, collectionName : str, products : Sequence[Product], attributes : Optional[Sequence[str]] = None) -> int:
+        backend = self.backend
+        with self._lock:
+            cached = self._get_cached_collection(backend, collectionName)
+            if cached is None:
+                return 0
+            # The kept collection is only changed once the changes have been saved
+            collection = CollectionRepository._copy_collection(cached)
+            productsById = {product.productID: product for product in products}
+            updated = 0
+            for index, savedProduct in enumerate(collection.products):
+                product = productsById.get(savedProduct.productID)
+                if product is None:
+                    continue
+                if attributes is None:
+                    collection.products[index] = product.copy()
+                else:
+                    for attribute in attributes:
+                        value = getattr(product, attribute)
+                        setattr(savedProduct, attribute, list(value) if isinstance(value, list) else value)
+                updated += 1
+            if updated:
+                backend.save_collections([collection])
+                self._record_write(collectionName)
+                self._collections[collectionName] = (self._get_collection_version(backend, collectionName), collection)
+            return updated
+
+    def delete_collection(self, collectionName : str) -> None:
+        backend = self.backend
+        with self._lock:
+            backend.delete_collection(collectionName)
+            self._record_write(collectionName)
+
+    def commit_partial_csv(self, csvFolderName : str, collectionName : str) -> Collection:
+        backend = self.backend
+        with self._lock:
+            collection = backend.commit_partial_csv(csvFolderName, collectionName)
+            self._record_write(collectionName)
+            return collection
+
+    """
+    Forgets every kept collection and summary
+    """
+    def clear(self) -> None:
+        with self._lock:
+            self._collections.clear()
+            self._summaries = None
+
+    """
+    The methods below must be called while holding the lock
+    """
+    def _get_collection_version(self, backend : StorageBackend, collectionName : str) -> Hashable:
+        return (self._write_counts.get(collectionName, 0), backend.get_collection_version(collectionName))
+
+    """
+    Returns the kept collection with the given name, loading it again if it is out of date
+    """
+    def _get_cached_collection(self, backend : StorageBackend, collectionName : str) -> Optional[Collection]:
+        version = self._get_collection_version(backend, collectionName)
+        cached = self._collections.get(collectionName)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        collection = backend.load_collection(collectionName)
+        if collection is None:
+            self._collections.pop(collectionName, None)
+        else:
+            self._collections[collectionName] = (version, collection)
+        return collection
+
+    """
+    Returns the kept collection with the given name if it is still up to date, forgetting it either way
+    """
+    def _take_cached_collection(self, backend : StorageBackend, collectionName : str) -> Optional[Collection]:
+        cached = self._collections.pop(collectionName, None)
+        if cached is None or cached[0] != self._get_collection_version(backend, collectionName):
+            return None
+        return cached[1]
+
+    def _record_write(self, collectionName : str) -> None:
+        self._write_counts[collectionName] = self._write_counts.get(collectionName, 0) + 1
+        self._writes += 1
+        self._collections.pop(collectionName, None)
+
+    @staticmethod
+    def _copy_collection(collection : Collection) -> Collection:
+        return Collection(collection.name, [product.copy() for product in collection.products])
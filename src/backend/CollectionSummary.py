@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional
+from src.backend.Collection import Collection
+
+"""
+The name, number of products and price and rating statistics of a saved collection,
+which is all the pages listing collections need. Summaries are kept by the storage backends
+so that listing collections does not require loading their products (and their reviews).
+"""
+class CollectionSummary:
+    def __init__(
+        self,
+        name : str,
+        productCount : int,
+        averagePrice : Optional[float] = None,
+        minPrice : Optional[float] = None,
+        maxPrice : Optional[float] = None,
+        averageRating : Optional[float] = None
+    ) -> None:
+        self.name : str = name
+        self.product_count : int = productCount
+        self.average_price : Optional[float] = averagePrice
+        self.min_price : Optional[float] = minPrice
+        self.max_price : Optional[float] = maxPrice
+        self.average_rating : Optional[float] = averageRating
+
+    @staticmethod
+    def from_prices_and_ratings(name : str, prices : List[float], ratings : List[float]) -> "CollectionSummary":
+        if not prices:
+            return CollectionSummary(name, 0)
+        return CollectionSummary(
+            name,
+            len(prices),
+            sum(prices) / len(prices),
+            min(prices),
+            max(prices),
+            sum(ratings) / len(ratings)
+        )
+
+    @staticmethod
+    def from_collection(collection : Collection) -> "CollectionSummary":
+        return CollectionSummary.from_prices_and_ratings(
+            collection.name,
+            [product.price for product in collection.products],
+            [product.rating for product in collection.products]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "productCount": self.product_count,
+            "averagePrice": self.average_price,
+            "minPrice": self.min_price,
+            "maxPrice": self.max_price,
+            "averageRating": self.average_rating
+        }
+
+    @staticmethod
+    def from_dict(dictionary : Dict[str, Any]) -> "CollectionSummary":
+        return CollectionSummary(
+            dictionary["name"],
+            dictionary["productCount"],
+            dictionary["averagePrice"],
+            dictionary["minPrice"],
+            dictionary["maxPrice"],
+            dictionary["averageRating"]
+        )
+
+    def __eq__(self, other : object) -> bool:
+        if not isinstance(other, CollectionSummary):
+            return False
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"CollectionSummary({self.name!r}, {self.product_count} products)"
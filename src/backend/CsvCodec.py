@@ -0,0 +1,84 @@
+import ast
+import json
+from typing import Any, Dict, List
+from src.backend.Product import Product
+
+"""
+Encodes products as the rows of a collections CSV and decodes them again.
+The reviews of a product are held in a single cell, how they are encoded depends on the files version,
+which is recognised from the name of the header's reviews column:
+ - Version 1 (legacy, a "reviews" column) holds the Python repr of the list of reviews,
+   which can only be read back with ast.literal_eval and is very slow for products with many reviews.
+   Some older files hold JSON in this column instead, both are read.
+ - Version 2 (a "reviews_json" column) holds the list of reviews as JSON.
+New files are always written as the latest VERSION.
+"""
+class CsvCodec:
+    LEGACY_VERSION : int = 1
+    VERSION : int = 2
+    HEADERS : Dict[int, List[str]] = {
+        1: ["productID", "name", "price", "url", "rating", "description", "reviews"],
+        2: ["productID", "name", "price", "url", "rating", "description", "reviews_json"]
+    }
+
+    def __init__(self, version : int = VERSION) -> None:
+        if version not in CsvCodec.HEADERS:
+            raise ValueError(f"Unknown CSV version: {version}")
+        self.version : int = version
+
+    """
+    Returns the codec for a file with the given header row
+    """
+    @staticmethod
+    def for_header(header : List[str]) -> "CsvCodec":
+        for version, versionHeader in CsvCodec.HEADERS.items():
+            if header == versionHeader:
+                return CsvCodec(version)
+        raise ValueError(f"Unrecognised CSV header: {header}")
+
+    @property
+    def header(self) -> List[str]:
+        return CsvCodec.HEADERS[self.version]
+
+    def encode_reviews(self, reviews : List[str]) -> str:
+        if self.version == CsvCodec.LEGACY_VERSION:
+            return str(reviews)
+        return json.dumps(reviews, ensure_ascii=False)
+
+    def decode_reviews(self, cell : str) -> List[str]:
+        if self.version == CsvCodec.LEGACY_VERSION:
+            return CsvCodec.decode_legacy_reviews(cell)
+        return json.loads(cell)
+
+    """
+    Reads the reviews cell of a version 1 file. The JSON written by older CSV exports is tried first
+    (it fails on the first character of a Python repr, so costs almost nothing when it is not JSON)
+    """
+    @staticmethod
+    def decode_legacy_reviews(cell : str) -> List[str]:
+        try:
+            return json.loads(cell)
+        except ValueError:
+            return ast.literal_eval(cell)
+
+    def encode_product(self, product : Product) -> List[Any]:
+        return [
+            product.productID,
+            product.name,
+            product.price,
+            product.url,
+            product.rating,
+            product.description,
+            self.encode_reviews(product.reviews)
+        ]
+
+    def decode_product(self, row : List[str]) -> Product:
+        return Product(
+            productID=row[0],
+            name=row[1],
+            price=float(row[2]),
+            url=row[3],
+            rating=float(row[4]),
+            description=row[5],
+            reviews=self.decode_reviews(row[6])
+        )
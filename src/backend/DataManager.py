@@ -1,12 +1,15 @@
 from src.backend.Collection import Collection
 from src.backend.Product import Product
-from typing import List, Dict, Any
+from src.backend.CsvCodec import CsvCodec
+from src.backend.CollectionSummary import CollectionSummary
+from typing import List, Dict, Any, Optional
 import json
 import io
 import csv
 import sys
 import os
-import ast
+import importlib.util
+import threading
 
 csv.field_size_limit(sys.maxsize)
 
@@ -16,9 +19,65 @@ Loading and uploading of data structures.
 Conversions between classes and data structures and vice-versa.
 """
 class DataManager:
+    CSV_HEADER : List[str] = CsvCodec.HEADERS[CsvCodec.VERSION]
+    # Suffix of a collections CSV while it is still being scraped, these are not loaded as collections
+    PARTIAL_CSV_SUFFIX : str = ".csv.partial"
+    # Where the apps collections are kept, "csv" (a CSV per collection in CSV_FOLDER) or "sqlite" (the database at SQLITE_PATH).
+    # CSV and JSON remain the import and export formats whichever is used,
+    # a new SQLite database starts with the collections in CSV_FOLDER.
+    STORAGE_BACKEND : str = "csv"
+    CSV_FOLDER : str = "CsvFolder"
+    SQLITE_PATH : str = os.path.join("SqliteFolder", "collections.sqlite")
+    storage_backend = None
+    storage_backend_lock : threading.Lock = threading.Lock()
+    # Columns of a collections Parquet file needed by its analytics, reading only these skips the review text
+    PARQUET_ANALYTICS_COLUMNS : List[str] = ["productID", "name", "price", "rating", "reviewsCount"]
+
     def __init__(self):
         raise TypeError("This is a utility class and cannot be instantiated")
 
+    """
+    Returns the storage backend selected by STORAGE_BACKEND, creating it on first use
+    """
+    @staticmethod
+    def get_storage_backend() -> "StorageBackend":
+        # Imported here as the storage backends use the DataManager to read and write CSVs
+        from src.backend.StorageBackend import CsvStorageBackend
+        from src.backend.SqliteStorageBackend import SqliteStorageBackend
+        with DataManager.storage_backend_lock:
+            if DataManager.storage_backend is None:
+                if DataManager.STORAGE_BACKEND == "csv":
+                    DataManager.storage_backend = CsvStorageBackend(DataManager.CSV_FOLDER)
+                elif DataManager.STORAGE_BACKEND == "sqlite":
+                    isNew = not os.path.exists(DataManager.SQLITE_PATH)
+                    DataManager.storage_backend = SqliteStorageBackend(DataManager.SQLITE_PATH)
+                    if isNew:
+                        DataManager.import_collections_from_csv_folder(DataManager.storage_backend, DataManager.CSV_FOLDER)
+                else:
+                    raise ValueError(f"Unknown storage backend: {DataManager.STORAGE_BACKEND}")
+            return DataManager.storage_backend
+
+    """
+    Replaces the storage backend in use, closing the previous one
+    """
+    @staticmethod
+    def set_storage_backend(backend : "StorageBackend") -> None:
+        with DataManager.storage_backend_lock:
+            if DataManager.storage_backend is not None and DataManager.storage_backend is not backend:
+                DataManager.storage_backend.close()
+            DataManager.storage_backend = backend
+
+    """
+    Saves every collection within a folder of CSVs to a storage backend, returning the number of collections imported
+    """
+    @staticmethod
+    def import_collections_from_csv_folder(backend : "StorageBackend", csvFolderName : str) -> int:
+        if not os.path.exists(csvFolderName):
+            return 0
+        collections = DataManager.load_collections_from_csv_folder(csvFolderName)
+        backend.save_collections(collections)
+        return len(collections)
+
     """
     Loads all csvs within folder and converts them to collections
     
@@ -36,33 +95,47 @@ class DataManager:
         for path, folders, files in os.walk(csvFolderName):
             for file in files:
                 if file.endswith(".csv"):
-                    with open(os.path.join(path, file), "r") as csvFile:
-                        reader = csv.reader(csvFile)
-                        next(reader)
-                        products = []
-                        for row in reader:
-                            # Reading all of the products data
-                            productID = row[0]
-                            name = row[1]
-                            price = float(row[2])
-                            url = row[3]
-                            rating = float(row[4])
-                            description = row[5]
-                            reviews = ast.literal_eval(row[6])
-                            # Instantiating the product using the data from the file
-                            products.append(Product(
-                                productID=productID,
-                                name=name,
-                                price=price,
-                                url=url,
-                                rating=rating,
-                                description=description,
-                                reviews=reviews
-                            ))
-                        # Creating a collection by passing in the collection name and its products
-                        collections.append(Collection(file[:-4], products))
+                    collections.append(DataManager.load_collection_from_csv(os.path.join(path, file)))
         return collections
 
+    """
+    Loads a single CSV file as a collection, named after the file.
+    The files CSV version is recognised from its header, so files written before the current version still load.
+    """
+    @staticmethod
+    def load_collection_from_csv(filePath : str) -> Collection:
+        with open(filePath, "r") as csvFile:
+            reader = csv.reader(csvFile)
+            codec = CsvCodec.for_header(next(reader))
+            products = [codec.decode_product(row) for row in reader]
+        # Creating a collection by passing in the collection name and its products
+        return Collection(DataManager.get_collection_name(filePath), products)
+
+    """
+    Summarises the collection within a CSV file (named after the file) from its prices and ratings,
+    without decoding the reviews of its products
+    """
+    @staticmethod
+    def summarise_collection_csv(filePath : str) -> CollectionSummary:
+        prices, ratings = [], []
+        with open(filePath, "r") as csvFile:
+            reader = csv.reader(csvFile)
+            CsvCodec.for_header(next(reader))
+            for row in reader:
+                prices.append(float(row[2]))
+                ratings.append(float(row[4]))
+        return CollectionSummary.from_prices_and_ratings(DataManager.get_collection_name(filePath), prices, ratings)
+
+    """
+    Returns the name of the collection saved in a CSV file (or partial CSV), which is named after the collection
+    """
+    @staticmethod
+    def get_collection_name(filePath : str) -> str:
+        fileName = os.path.basename(filePath)
+        if fileName.endswith(DataManager.PARTIAL_CSV_SUFFIX):
+            return fileName[:-len(DataManager.PARTIAL_CSV_SUFFIX)]
+        return fileName[:-4]
+
     """
     Saves a list of collections into a folder.
     A single collection is converted to a single CSV file.
@@ -82,20 +155,80 @@ class DataManager:
         # Iterate through each collection, creating a csv for each one
         for collection in collections:
             with open(os.path.join(csvFolderName, collection.name + ".csv"), "w") as file:
-                writer = csv.writer(file)
-                # Writing the csv header with each columns name
-                writer.writerow(["productID", "name", "price", "url", "rating", "description", "reviews"])
-                for product in collection.products:
-                    writer.writerow([
-                        product.productID,
-                        product.name,
-                        product.price,
-                        product.url,
-                        product.rating,
-                        product.description,
-                        product.reviews])
+                DataManager.write_collection_csv(file, collection)
+
+    """
+    Writes a collection to a file as CSV, in the current CSV version unless another codec is given
+    """
+    @staticmethod
+    def write_collection_csv(file, collection : Collection, codec : Optional[CsvCodec] = None) -> None:
+        codec = codec or CsvCodec()
+        writer = csv.writer(file)
+        # Writing the csv header with each columns name
+        writer.writerow(codec.header)
+        writer.writerows(codec.encode_product(product) for product in collection.products)
+
+    @staticmethod
+    def convert_product_to_csv_row(product : Product) -> List[Any]:
+        return CsvCodec().encode_product(product)
+
+    """
+    Returns the path of the CSV a collection is written to while it is still being scraped
+    """
+    @staticmethod
+    def get_partial_csv_path(csvFolderName : str, collectionName : str) -> str:
+        return os.path.join(csvFolderName, collectionName + DataManager.PARTIAL_CSV_SUFFIX)
+
+    """
+    Appends products to the partial CSV of a collection that is still being scraped,
+    creating it (with its header) if it does not exist yet. Each call is written to disk 
+    before returning, so the products scraped so far survive the scrape failing or the app stopping.
+    Products are appended in the version of the existing partial CSV, so it stays readable.
+    """
+    @staticmethod
+    def append_products_to_partial_csv(csvFolderName : str, collectionName : str, products : List[Product]) -> None:
+        if not isinstance(csvFolderName, str):
+            raise TypeError("Filename must be a string")
+        elif not all(isinstance(product, Product) for product in products):
+            raise TypeError("All products must be a Product")
+
+        if not os.path.exists(csvFolderName):
+            os.mkdir(csvFolderName)
+        partialPath = DataManager.get_partial_csv_path(csvFolderName, collectionName)
+        writeHeader = not os.path.exists(partialPath)
+        if writeHeader:
+            codec = CsvCodec()
+        else:
+            with open(partialPath, "r") as file:
+                codec = CsvCodec.for_header(next(csv.reader(file)))
+        with open(partialPath, "a") as file:
+            writer = csv.writer(file)
+            if writeHeader:
+                writer.writerow(codec.header)
+            for product in products:
+                writer.writerow(codec.encode_product(product))
+            file.flush()
+            os.fsync(file.fileno())
+
+    """
+    Turns a collections finished partial CSV into its CSV (replacing any previous one)
+    and returns the collection it holds
+    """
+    @staticmethod
+    def commit_partial_csv(csvFolderName : str, collectionName : str) -> Collection:
+        partialPath = DataManager.get_partial_csv_path(csvFolderName, collectionName)
+        if not os.path.exists(partialPath):
+            raise FileNotFoundError("Partial CSV not found")
+        csvPath = os.path.join(csvFolderName, collectionName + ".csv")
+        os.replace(partialPath, csvPath)
+        return DataManager.load_collection_from_csv(csvPath)
+
+    @staticmethod
+    def discard_partial_csv(csvFolderName : str, collectionName : str) -> None:
+        partialPath = DataManager.get_partial_csv_path(csvFolderName, collectionName)
+        if os.path.exists(partialPath):
+            os.remove(partialPath)
 
-        
 
     """
     Loads json data from given path and converts it to a collection
@@ -209,6 +342,125 @@ class DataManager:
         
         return dictionary
     """
+    Whether collections can be saved and loaded as Parquet, which requires the optional pyarrow package
+    """
+    @staticmethod
+    def is_parquet_available() -> bool:
+        return importlib.util.find_spec("pyarrow") is not None
+
+    @staticmethod
+    def import_pyarrow():
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet support requires pyarrow to be installed (pip install pyarrow)")
+        return pyarrow
+
+    """
+    Converts a collection into an Arrow table with a row per product.
+    The reviews are kept in a nested list column of their own, along with a reviewsCount column,
+    so the other columns can be read without reading any review text.
+    """
+    @staticmethod
+    def convert_collection_to_arrow_table(collection : Collection):
+        if not isinstance(collection, Collection):
+            raise TypeError("Collection must be a Collection")
+        pa = DataManager.import_pyarrow()
+        schema = pa.schema([
+            ("productID", pa.string()),
+            ("name", pa.string()),
+            ("price", pa.float64()),
+            ("url", pa.string()),
+            ("rating", pa.float64()),
+            ("description", pa.string()),
+            ("reviewsCount", pa.int32()),
+            ("reviews", pa.list_(pa.string()))
+        ], metadata={"collection": collection.name})
+        products = collection.products
+        return pa.table({
+            "productID": [product.productID for product in products],
+            "name": [product.name for product in products],
+            "price": [product.price for product in products],
+            "url": [product.url for product in products],
+            "rating": [product.rating for product in products],
+            "description": [product.description for product in products],
+            "reviewsCount": [len(product.reviews) for product in products],
+            "reviews": [product.reviews for product in products]
+        }, schema=schema)
+
+    @staticmethod
+    def convert_arrow_table_to_collection(name : str, table) -> Collection:
+        columns = table.to_pydict()
+        products = [
+            Product(
+                productID=columns["productID"][i],
+                name=columns["name"][i],
+                price=columns["price"][i],
+                url=columns["url"][i],
+                rating=columns["rating"][i],
+                description=columns["description"][i],
+                reviews=columns["reviews"][i]
+            )
+            for i in range(table.num_rows)
+        ]
+        return Collection(name, products)
+
+    """
+    Saves a collection to a Parquet file within a directory(folder)
+    """
+    @staticmethod
+    def save_collection_to_parquet(directoryPath : str, collection : Collection) -> None:
+        if not isinstance(directoryPath, str):
+            raise TypeError("Directory path must be a string")
+        elif not isinstance(collection, Collection):
+            raise TypeError("Collection must be a Collection")
+        pa = DataManager.import_pyarrow()
+        if not os.path.exists(directoryPath):
+            os.mkdir(directoryPath)
+        pa.parquet.write_table(
+            DataManager.convert_collection_to_arrow_table(collection), 
+            os.path.join(directoryPath, collection.name + ".parquet")
+        )
+
+    """
+    Loads a Parquet file saved by save_collection_to_parquet as a collection, named after the file
+    """
+    @staticmethod
+    def load_collection_from_parquet(filePath : str) -> Collection:
+        if not isinstance(filePath, str):
+            raise TypeError("Filename must be a string")
+        elif not filePath.endswith(".parquet"):
+            raise ValueError("Filename must end with .parquet")
+        elif not os.path.exists(filePath):
+            raise FileNotFoundError("File not found")
+        pa = DataManager.import_pyarrow()
+        table = pa.parquet.read_table(filePath)
+        return DataManager.convert_arrow_table_to_collection(os.path.basename(filePath)[:-8], table)
+
+    """
+    Loads only the given columns of a collections Parquet file as a pandas DataFrame,
+    by default the columns its analytics need, which leaves the review text unread
+    """
+    @staticmethod
+    def load_collection_dataframe_from_parquet(filePath : str, columns : Optional[List[str]] = None):
+        if not os.path.exists(filePath):
+            raise FileNotFoundError("File not found")
+        pa = DataManager.import_pyarrow()
+        columns = DataManager.PARQUET_ANALYTICS_COLUMNS if columns is None else columns
+        return pa.parquet.read_table(filePath, columns=columns).to_pandas()
+
+    """
+    Converts a collection into Parquet format, storing it within bytes and returning them
+    """
+    @staticmethod
+    def convert_collection_to_parquet_bytes(collection : Collection) -> bytes:
+        pa = DataManager.import_pyarrow()
+        output = pa.BufferOutputStream()
+        pa.parquet.write_table(DataManager.convert_collection_to_arrow_table(collection), output)
+        return output.getvalue().to_pybytes()
+
+    """
     This method is used to convert a collection into CSV 
     format but store this format within a String and return it
     """
@@ -218,36 +470,20 @@ class DataManager:
             raise TypeError("Collection must be a Collection")
 
         output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(["productID", "name", "price", "url", "rating", "description", "reviews"])
-        
-        # Write product data
-        for product in collection.products:
-            writer.writerow([
-                product.productID,
-                product.name,
-                product.price,
-                product.url,
-                product.rating,
-                product.description,
-                json.dumps(product.reviews)  # Convert reviews list to JSON string
-            ])
-        
+        DataManager.write_collection_csv(output, collection)
         return output.getvalue()
     
     """
     Deletes a given collections data that is stored within 
-    the CSV and JSON folders
+    the storage backend (through the shared collection repository) and the JSON folder
     """
     @staticmethod
     def delete_collection(collection_name: str) -> None:
-        csv_path = os.path.join("CsvFolder", f"{collection_name}.csv")
+        # Imported here as the collection repository uses the DataManager to get the storage backend
+        from src.backend.CollectionRepository import CollectionRepository
         json_path = os.path.join("JsonFolder", f"{collection_name}.json")
         
-        if os.path.exists(csv_path):
-            os.remove(csv_path)
+        CollectionRepository.get().delete_collection(collection_name)
         
         if os.path.exists(json_path):
             os.remove(json_path)
\ No newline at end of file
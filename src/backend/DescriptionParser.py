@@ -0,0 +1,222 @@
+from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup, SoupStrainer
+from html.parser import HTMLParser
+import importlib.util
+import re
+from typing import Dict, List, Optional, Tuple
+
+DESCRIPTION_CLASS : str = "product-description-content-text"
+# A div start tag, capturing the value of its class attribute
+DIV_START_TAG = re.compile(r"""<div\b[^>]*?\bclass\s*=\s*("[^"]*"|'[^']*'|[^\s>]+)[^>]*>""", re.IGNORECASE)
+# Elements whose text is not part of the description, as with get_text
+NON_TEXT_TAGS : Tuple[str, ...] = ("script", "style")
+
+"""
+Base class for the engines that extract a products description from its product page HTML.
+Each engine returns the text of the description element with whitespace stripped
+(matching BeautifulSoup's get_text(strip=True), so the text of script and style elements is left out),
+or None if the element is not found.
+"""
+class DescriptionParser(ABC):
+    name : str = ""
+
+    @abstractmethod
+    def parse(self, html : str) -> Optional[str]:
+        pass
+
+"""
+Builds a full BeautifulSoup tree of the page using the standard library html.parser
+"""
+class HtmlParserDescriptionParser(DescriptionParser):
+    name : str = "html.parser"
+
+    def parse(self, html : str) -> Optional[str]:
+        soup = BeautifulSoup(html, 'html.parser')
+        description_element = soup.select_one(f'div.{DESCRIPTION_CLASS}')
+        return description_element.get_text(strip=True) if description_element else None
+
+"""
+Uses html.parser but only builds the tree for the description element (via a SoupStrainer),
+skipping the cost of building the rest of the page
+"""
+class SoupStrainerDescriptionParser(DescriptionParser):
+    name : str = "strainer"
+
+    def __init__(self) -> None:
+        # Matching on a function so that elements with more than one class are also matched
+        self.strainer : SoupStrainer = SoupStrainer(
+            "div", class_=lambda classes: classes is not None and DESCRIPTION_CLASS in classes.split()
+        )
+
+    def parse(self, html : str) -> Optional[str]:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=self.strainer)
+        description_element = soup.find("div")
+        return description_element.get_text(strip=True) if description_element else None
+
+"""
+Uses lxml's C HTML parser, this requires the optional lxml package to be installed
+"""
+class LxmlDescriptionParser(DescriptionParser):
+    name : str = "lxml"
+
+    def __init__(self) -> None:
+        try:
+            import lxml.etree
+            import lxml.html
+        except ImportError:
+            raise ImportError("The lxml description parser requires lxml to be installed (pip install lxml)")
+        self.lxml_etree = lxml.etree
+        self.lxml_html = lxml.html
+        self.xpath : str = f'//div[contains(concat(" ", normalize-space(@class), " "), " {DESCRIPTION_CLASS} ")]'
+
+    def parse(self, html : str) -> Optional[str]:
+        if not html.strip():
+            return None
+        elements = self.lxml_html.fromstring(html).xpath(self.xpath)
+        if not elements:
+            return None
+        # The text following a script or style element is kept
+        self.lxml_etree.strip_elements(elements[0], *NON_TEXT_TAGS, with_tail=False)
+        return "".join(text.strip() for text in elements[0].itertext())
+
+DESCRIPTION_PARSERS : Dict[str, type] = {
+    HtmlParserDescriptionParser.name: HtmlParserDescriptionParser,
+    SoupStrainerDescriptionParser.name: SoupStrainerDescriptionParser,
+    LxmlDescriptionParser.name: LxmlDescriptionParser
+}
+
+"""
+Returns the parsers that can be used in the current environment
+"""
+def available_parsers() -> Dict[str, type]:
+    available : Dict[str, type] = {}
+    for name, parserClass in DESCRIPTION_PARSERS.items():
+        try:
+            parserClass()
+            available[name] = parserClass
+        except ImportError:
+            pass
+    return available
+
+"""
+Resolves a parser name into the parser to use,
+"auto" picks lxml when it is installed and otherwise the SoupStrainer parser
+"""
+def resolve_parser_name(name : str) -> str:
+    if name == "auto":
+        return LxmlDescriptionParser.name if importlib.util.find_spec("lxml") else SoupStrainerDescriptionParser.name
+    elif name not in DESCRIPTION_PARSERS:
+        raise ValueError(f"Unknown description parser: {name}")
+    return name
+
+_parsers : Dict[str, DescriptionParser] = {}
+
+"""
+Extracts a products description using the named parser.
+This is a module level function so that it can be sent to a thread or process pool,
+each worker creates its parser once and then reuses it.
+"""
+def parse_description(name : str, html : str) -> Optional[str]:
+    name = resolve_parser_name(name)
+    if name not in _parsers:
+        _parsers[name] = DESCRIPTION_PARSERS[name]()
+    return _parsers[name].parse(html)
+
+"""
+An incremental parser that is fed a product page a chunk at a time while it is downloaded.
+Until the description element is found the chunks are only searched for its class name 
+(which is much cheaper than parsing them), from the description elements start tag onwards
+the chunks are parsed until the element is closed, at which point the parser is complete
+and the rest of the page does not need to be downloaded.
+The extracted description matches BeautifulSoup's get_text(strip=True), leaving out the text of script and style elements.
+"""
+class DescriptionStreamParser(HTMLParser):
+    # Characters kept from the end of the searched text, in case the start tag is split across chunks
+    SEARCH_OVERLAP : int = 1024
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.search_buffer : str = ""
+        self.found : bool = False
+        self.complete : bool = False
+        self.depth : int = 0
+        self.strings : List[str] = []
+        # Whether the parser is within a script or style element of the description
+        self.in_non_text : bool = False
+        # Text of the current text node, which can arrive split over several chunks
+        self.pending_text : List[str] = []
+
+    @property
+    def description(self) -> Optional[str]:
+        return "".join(self.strings) if self.complete else None
+
+    def feed_text(self, text : str) -> None:
+        if self.complete:
+            return
+        if not self.found:
+            self.search_buffer += text
+            start = self.find_description_start()
+            if start is None:
+                return
+            text = self.search_buffer[start:]
+            self.search_buffer = ""
+            self.found = True
+        self.feed(text)
+
+    """
+    Returns the index of the description elements start tag within the search buffer,
+    or None if it has not been downloaded yet (trimming the search buffer as it goes)
+    """
+    def find_description_start(self) -> Optional[int]:
+        searchFrom = 0
+        while True:
+            classIndex = self.search_buffer.find(DESCRIPTION_CLASS, searchFrom)
+            if classIndex < 0:
+                self.search_buffer = self.search_buffer[-self.SEARCH_OVERLAP:]
+                return None
+            divIndex = self.search_buffer.rfind("<div", 0, classIndex)
+            if divIndex >= 0 and ">" not in self.search_buffer[divIndex:classIndex]:
+                match = DIV_START_TAG.match(self.search_buffer, divIndex)
+                if match is None and ">" not in self.search_buffer[classIndex:]:
+                    # The rest of the start tag has not been downloaded yet
+                    self.search_buffer = self.search_buffer[divIndex:]
+                    return None
+                if match and DESCRIPTION_CLASS in match.group(1).strip("\"'").split():
+                    return divIndex
+            searchFrom = classIndex + len(DESCRIPTION_CLASS)
+
+    def flush_text(self) -> None:
+        stripped = "".join(self.pending_text).strip()
+        if stripped:
+            self.strings.append(stripped)
+        self.pending_text = []
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if self.depth > 0:
+            self.flush_text()
+        if tag == "div" and not self.complete:
+            self.depth += 1
+        elif tag in NON_TEXT_TAGS and self.depth > 0:
+            self.in_non_text = True
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        if self.depth > 0:
+            self.flush_text()
+
+    def handle_endtag(self, tag) -> None:
+        if self.depth > 0:
+            self.flush_text()
+        if tag in NON_TEXT_TAGS:
+            self.in_non_text = False
+        elif tag == "div" and self.depth > 0:
+            self.depth -= 1
+            if self.depth == 0:
+                self.complete = True
+
+    def handle_comment(self, data) -> None:
+        if self.depth > 0:
+            self.flush_text()
+
+    def handle_data(self, data) -> None:
+        if self.depth > 0 and not self.complete and not self.in_non_text:
+            self.pending_text.append(data)
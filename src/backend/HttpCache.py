@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+from typing import Dict, Any, Optional
+
+"""
+A single response stored within the HTTP cache
+"""
+class CachedResponse:
+    def __init__(self, body : str, etag : Optional[str], last_modified : Optional[str], stored_at : float) -> None:
+        self.body : str = body
+        self.etag : Optional[str] = etag
+        self.last_modified : Optional[str] = last_modified
+        self.stored_at : float = stored_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    """
+    Whether the server gave a validator that allows the response to be revalidated
+    with a conditional request (If-None-Match/If-Modified-Since) once it is stale
+    """
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+"""
+An on-disk (SQLite) cache of successful GET responses keyed by URL and query parameters.
+Bodies are stored compressed, entries expire after a given time to live and the least
+recently used entries are evicted once the cache grows beyond its maximum size.
+It is safe to use from multiple threads.
+"""
+class HttpCache:
+    def __init__(self, path : str, ttl : float = 24 * 60 * 60, max_size_bytes : int = 200 * 1024 * 1024) -> None:
+        if not isinstance(path, str):
+            raise TypeError("Path must be a string")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path : str = path
+        self.ttl : float = ttl
+        self.max_size_bytes : int = max_size_bytes
+        self._lock : threading.Lock = threading.Lock()
+        self._connection : sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )""")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_last_accessed ON responses (last_accessed)")
+
+    """
+    Builds the cache key from the url and its query parameters,
+    sorting the parameters so that their order does not matter
+    """
+    @staticmethod
+    def make_key(url : str, params : Optional[Dict[str, Any]] = None) -> str:
+        if not params:
+            return url
+        return url + "?" + urllib.parse.urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+
+    """
+    Whether a cached response is still within the given time to live (defaults to the caches ttl)
+    """
+    def is_fresh(self, response : CachedResponse, ttl : Optional[float] = None) -> bool:
+        return response.age < (self.ttl if ttl is None else ttl)
+
+    def get(self, url : str, params : Optional[Dict[str, Any]] = None) -> Optional[CachedResponse]:
+        key = HttpCache.make_key(url, params)
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE responses SET last_accessed = ? WHERE key = ?", (time.time(), key))
+        body, etag, last_modified, stored_at = row
+        return CachedResponse(zlib.decompress(body).decode("utf-8"), etag, last_modified, stored_at)
+
+    def put(self, url : str, params : Optional[Dict[str, Any]], body : str, etag : Optional[str] = None, last_modified : Optional[str] = None) -> None:
+        key = HttpCache.make_key(url, params)
+        compressed = zlib.compress(body.encode("utf-8"))
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, etag, last_modified, stored_at, last_accessed, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, compressed, etag, last_modified, now, now, len(compressed))
+            )
+            self._evict()
+
+    """
+    Marks a cached response as fresh again after the server confirmed (304) it has not changed
+    """
+    def touch(self, url : str, params : Optional[Dict[str, Any]] = None) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ?, last_accessed = ? WHERE key = ?",
+                (now, now, HttpCache.make_key(url, params))
+            )
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    """
+    Removes expired responses that cannot be revalidated, then removes the least
+    recently used responses until the cache is within its maximum size.
+    Must be called while holding the lock.
+    """
+    def _evict(self) -> None:
+        self._connection.execute(
+            "DELETE FROM responses WHERE stored_at < ? AND etag IS NULL AND last_modified IS NULL",
+            (time.time() - self.ttl,)
+        )
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_accessed ASC"
+        ).fetchall():
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_size_bytes:
+                break
@@ -133,6 +133,12 @@ class Product:
         else:
             self._reviews.remove(review)
 
+    """
+    Returns a copy of the product, which can be changed without changing this product
+    """
+    def copy(self) -> "Product":
+        return Product(self.productID, self.name, self.price, self.url, self.rating, self.description, list(self.reviews))
+
     def __str__(self) -> str:
         return f"""Product ID: {self.productID}
     Name: {self.name}
@@ -0,0 +1,101 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+from src.backend.Product import Product
+
+"""
+A product held within the ProductStore, along with when it was scraped
+"""
+class StoredProduct:
+    def __init__(self, product : Product, scraped_at : float) -> None:
+        self.product : Product = product
+        self.scraped_at : float = scraped_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.scraped_at
+
+"""
+An on-disk (SQLite) store of scraped products keyed by productID, remembering each products
+parsed description and reviews along with when it was scraped. Unlike the HttpCache it holds
+the scraped result rather than the responses, so a product found again by any search
+(or in any collection) can be used without fetching or parsing anything.
+It is safe to use from multiple threads.
+"""
+class ProductStore:
+    def __init__(self, path : str) -> None:
+        if not isinstance(path, str):
+            raise TypeError("Path must be a string")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path : str = path
+        self._lock : threading.Lock = threading.Lock()
+        self._connection : sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS products (
+                    product_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    url TEXT NOT NULL,
+                    rating REAL NOT NULL,
+                    description TEXT NOT NULL,
+                    reviews TEXT NOT NULL,
+                    scraped_at REAL NOT NULL
+                )""")
+
+    """
+    Returns the stored product with the given id, or None if it is not stored
+    or was scraped more than maxAge seconds ago
+    """
+    def get(self, productId : str, maxAge : Optional[float] = None) -> Optional[StoredProduct]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT product_id, name, price, url, rating, description, reviews, scraped_at FROM products WHERE product_id = ?",
+                (productId,)
+            ).fetchone()
+        if row is None:
+            return None
+        productId, name, price, url, rating, description, reviews, scrapedAt = row
+        if maxAge is not None and time.time() - scrapedAt > maxAge:
+            return None
+        return StoredProduct(Product(productId, name, price, url, rating, description, json.loads(reviews)), scrapedAt)
+
+    """
+    Stores products, replacing any stored product with the same id that was scraped before them
+    """
+    def put_many(self, products : List[Product], scrapedAt : Optional[float] = None) -> None:
+        scrapedAt = time.time() if scrapedAt is None else scrapedAt
+        with self._lock, self._connection:
+            self._connection.executemany(
+                """INSERT INTO products (product_id, name, price, url, rating, description, reviews, scraped_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (product_id) DO UPDATE SET
+                       name = excluded.name, price = excluded.price, url = excluded.url, rating = excluded.rating,
+                       description = excluded.description, reviews = excluded.reviews, scraped_at = excluded.scraped_at
+                   WHERE excluded.scraped_at >= products.scraped_at""",
+                [
+                    (product.productID, product.name, product.price, product.url, product.rating,
+                     product.description, json.dumps(product.reviews), scrapedAt)
+                    for product in products
+                ]
+            )
+
+    def put(self, product : Product, scrapedAt : Optional[float] = None) -> None:
+        self.put_many([product], scrapedAt)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM products")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
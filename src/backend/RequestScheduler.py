@@ -0,0 +1,433 @@
+import asyncio
+import collections
+import contextlib
+import time
+from typing import Dict, Any, Deque, AsyncIterator, Optional
+
+"""
+A token bucket that refills at a given rate (tokens per second) up to a maximum burst size.
+Each request consumes a single token, waiting for the bucket to refill if it is empty.
+"""
+class TokenBucket:
+    def __init__(self, rate : float, burst : int) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be greater than 0")
+        elif burst < 1:
+            raise ValueError("Burst must be at least 1")
+        self.rate : float = rate
+        self.burst : int = burst
+        self.tokens : float = float(burst)
+        self.last_refill : float = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    """
+    Takes a token from the bucket and returns how long the caller must wait before using it.
+    The bucket is allowed to go negative so that concurrent callers queue up behind
+    each other at the refill rate instead of all waking up at the same time.
+    """
+    def reserve(self) -> float:
+        self.refill()
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    """
+    Empties the bucket so that no further requests are sent until it has refilled
+    """
+    def drain(self) -> None:
+        self.refill()
+        self.tokens = min(self.tokens, 0.0)
+
+    """
+    Empties the bucket so that no further requests are sent for at least the given number of seconds
+    """
+    def pause(self, seconds : float) -> None:
+        self.refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+"""
+Limits the requests sent to a single endpoint using its own token bucket (rate and burst)
+and its own limit on the number of requests in flight at once.
+The rate is halved whenever the endpoint responds with a 429 and slowly
+recovers back up to the configured rate after successful requests.
+"""
+class EndpointLimiter:
+    def __init__(self, name : str, rate : float, burst : int, max_concurrency : int, min_rate : float = 0.2, recovery_step : float = 0.1) -> None:
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1")
+        self.name : str = name
+        self.configured_rate : float = rate
+        self.min_rate : float = min(min_rate, rate)
+        self.recovery_step : float = recovery_step
+        self.max_concurrency : int = max_concurrency
+        self.bucket : TokenBucket = TokenBucket(rate, burst)
+        self.rate_limited_count : int = 0
+        self.in_flight : int = 0
+        self._semaphore : asyncio.Semaphore = None
+        self._loop : asyncio.AbstractEventLoop = None
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    """
+    asyncio primitives are bound to the event loop they are first used on,
+    so the semaphore is recreated if the scraper is run on a different loop
+    """
+    def get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def __aenter__(self) -> "EndpointLimiter":
+        await self.get_semaphore().acquire()
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    """
+    Additively increases the rate after a successful request, up to the configured rate
+    """
+    def record_success(self) -> None:
+        self.bucket.rate = min(self.configured_rate, self.bucket.rate + self.recovery_step)
+
+    """
+    Halves the rate and empties the bucket after the endpoint responds with a 429,
+    sending nothing more for retryAfter seconds when the response said how long to wait
+    """
+    def record_rate_limited(self, retryAfter : Optional[float] = None) -> None:
+        self.rate_limited_count += 1
+        self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+        if retryAfter:
+            self.bucket.pause(retryAfter)
+        else:
+            self.bucket.drain()
+
+"""
+A single queue that every request must pass through, with one ceiling on the number
+of requests in flight across all endpoints.
+Each request belongs to an owner (such as the product it is for). When a slot frees up,
+owners with requests waiting take turns, so an owner with lots of requests queued
+(a product with many review pages) cannot starve the others.
+"""
+class FairWorkQueue:
+    def __init__(self, maxConcurrency : int) -> None:
+        if maxConcurrency < 1:
+            raise ValueError("Max concurrency must be at least 1")
+        self.max_concurrency : int = maxConcurrency
+        self.in_flight : int = 0
+        self.granted_count : int = 0
+        # Owners in the order they will next be given a slot, each with its waiting requests
+        self.waiting : "collections.OrderedDict[str, Deque[asyncio.Future]]" = collections.OrderedDict()
+        self._loop : asyncio.AbstractEventLoop = None
+
+    @property
+    def waiting_count(self) -> int:
+        return sum(len(futures) for futures in self.waiting.values())
+
+    """
+    The waiting futures are bound to the event loop they were created on,
+    so the queue is reset if the scraper is run on a different loop
+    """
+    def check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self.in_flight = 0
+            self.waiting.clear()
+
+    async def acquire(self, owner : str) -> None:
+        self.check_loop()
+        if self.in_flight < self.max_concurrency and not self.waiting:
+            self.in_flight += 1
+            self.granted_count += 1
+            return
+
+        future = self._loop.create_future()
+        self.waiting.setdefault(owner, collections.deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as the request was cancelled, so hand it on
+                self.release()
+            else:
+                self.remove_waiting(owner, future)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self.grant_waiting()
+
+    """
+    Changes the ceiling on requests in flight, letting waiting requests start if it was raised
+    """
+    def set_max_concurrency(self, maxConcurrency : int) -> None:
+        self.max_concurrency = max(1, maxConcurrency)
+        if self._loop is not None:
+            self.grant_waiting()
+
+    """
+    Gives free slots to waiting requests, taking one request from each owner in turn
+    """
+    def grant_waiting(self) -> None:
+        while self.in_flight < self.max_concurrency and self.waiting:
+            owner, futures = self.waiting.popitem(last=False)
+            future = futures.popleft()
+            # The owner moves to the back of the queue if it has more requests waiting
+            if futures:
+                self.waiting[owner] = futures
+            if future.done():
+                continue
+            future.set_result(None)
+            self.in_flight += 1
+            self.granted_count += 1
+
+    def remove_waiting(self, owner : str, future : asyncio.Future) -> None:
+        futures = self.waiting.get(owner)
+        if futures is None:
+            return
+        with contextlib.suppress(ValueError):
+            futures.remove(future)
+        if not futures:
+            del self.waiting[owner]
+
+    """
+    Holds a slot for the duration of the with block, to be used as: async with queue.slot(owner): ...
+    """
+    @contextlib.asynccontextmanager
+    async def slot(self, owner : str) -> AsyncIterator[None]:
+        await self.acquire(owner)
+        try:
+            yield
+        finally:
+            self.release()
+
+"""
+The round trip times of the responses from a single endpoint, their smoothed average and the fastest seen.
+The fastest seen is forgotten once it is minRttWindow seconds old, so an endpoint that has become
+slower for good sets a new baseline.
+"""
+class RoundTripTimes:
+    def __init__(self, smoothing : float, minRttWindow : float) -> None:
+        self.smoothing : float = smoothing
+        self.min_rtt_window : float = minRttWindow
+        self.smoothed_rtt : Optional[float] = None
+        self.min_rtt : Optional[float] = None
+        self.min_rtt_expires_at : float = float("-inf")
+
+    def record(self, rtt : float) -> None:
+        now = time.monotonic()
+        if self.min_rtt is None or rtt <= self.min_rtt or now >= self.min_rtt_expires_at:
+            self.min_rtt = rtt
+            self.min_rtt_expires_at = now + self.min_rtt_window
+        self.smoothed_rtt = rtt if self.smoothed_rtt is None else self.smoothed_rtt + self.smoothing * (rtt - self.smoothed_rtt)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"smoothedRtt": self.smoothed_rtt, "minRtt": self.min_rtt}
+
+"""
+Adapts the number of requests a FairWorkQueue allows in flight using AIMD
+(additive increase, multiplicative decrease), the same way TCP finds a connections speed.
+While response times stay close to the fastest seen, the window grows by about one request
+per round trip. A 429 cuts the window by decreaseFactor and response times rising well above
+the fastest seen cut it by the gentler latencyDecreaseFactor (at most one cut per round trip,
+so one burst of slow responses or 429s is a single cut). Response times are compared against the
+fastest seen from the same endpoint (see RoundTripTimes), as the endpoints normal response times differ.
+"""
+class AimdConcurrencyController:
+    def __init__(
+        self, 
+        queue : FairWorkQueue, 
+        minWindow : int = 1, 
+        maxWindow : int = 16, 
+        initialWindow : Optional[int] = None,
+        decreaseFactor : float = 0.5,
+        latencyDecreaseFactor : float = 0.8,
+        latencySpikeFactor : float = 2.0,
+        smoothing : float = 0.2,
+        minRttWindow : float = 10.0
+    ) -> None:
+        if minWindow < 1 or maxWindow < minWindow:
+            raise ValueError("Window limits must satisfy 1 <= minWindow <= maxWindow")
+        self.queue : FairWorkQueue = queue
+        self.min_window : int = minWindow
+        self.max_window : int = maxWindow
+        self.window : float = float(min(max(initialWindow or minWindow, minWindow), maxWindow))
+        self.decrease_factor : float = decreaseFactor
+        self.latency_decrease_factor : float = latencyDecreaseFactor
+        self.latency_spike_factor : float = latencySpikeFactor
+        self.smoothing : float = smoothing
+        self.min_rtt_window : float = minRttWindow
+        # Round trip times in seconds of each endpoint, by endpoint name
+        self.round_trips : Dict[str, RoundTripTimes] = {}
+        self.increases : int = 0
+        self.decreases : int = 0
+        self.responses : int = 0
+        self.last_decrease : float = float("-inf")
+        self.apply()
+
+    """
+    The smoothed round trip time of the slowest endpoint, the longest a full window takes to come back
+    """
+    @property
+    def smoothed_rtt(self) -> Optional[float]:
+        smoothedRtts = [times.smoothed_rtt for times in self.round_trips.values() if times.smoothed_rtt is not None]
+        return max(smoothedRtts) if smoothedRtts else None
+
+    """
+    The request rate (per second) the current window allows, a full window every round trip
+    (of the slowest endpoint)
+    """
+    @property
+    def rate(self) -> float:
+        return self.window / self.smoothed_rtt if self.smoothed_rtt else 0.0
+
+    def apply(self) -> None:
+        self.queue.set_max_concurrency(int(self.window))
+
+    """
+    Records the round trip time of a successful response from an endpoint, growing the window
+    unless the response time shows the endpoint is slowing down
+    """
+    def record_latency(self, rtt : float, endpoint : str = "") -> None:
+        self.responses += 1
+        if endpoint not in self.round_trips:
+            self.round_trips[endpoint] = RoundTripTimes(self.smoothing, self.min_rtt_window)
+        times = self.round_trips[endpoint]
+        times.record(rtt)
+        if times.smoothed_rtt > times.min_rtt * self.latency_spike_factor:
+            self.decrease(self.latency_decrease_factor)
+        elif self.window < self.max_window:
+            self.window = min(self.max_window, self.window + 1 / self.window)
+            self.increases += 1
+            self.apply()
+
+    def record_rate_limited(self) -> None:
+        self.responses += 1
+        self.decrease(self.decrease_factor)
+
+    def decrease(self, factor : float) -> None:
+        now = time.monotonic()
+        if now - self.last_decrease < (self.smoothed_rtt or 0.0):
+            return
+        self.last_decrease = now
+        self.window = max(self.min_window, self.window * factor)
+        self.decreases += 1
+        self.apply()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "rate": self.rate,
+            "smoothedRtt": self.smoothed_rtt,
+            "roundTrips": {endpoint: times.stats() for endpoint, times in self.round_trips.items()},
+            "responses": self.responses,
+            "increases": self.increases,
+            "decreases": self.decreases
+        }
+
+"""
+Schedules requests across the separate endpoints used by the web scraper.
+Every request first passes through its endpoints own EndpointLimiter, then waits its turn
+in a FairWorkQueue shared by all endpoints, which caps the total number of requests in flight.
+Requests only take a slot in the queue once their endpoint is ready to send them, so a slow
+or rate limited endpoint (waiting on its token bucket) does not hold back requests to the others.
+When adaptiveConcurrency is given (the AimdConcurrencyController arguments, other than the queue)
+the queues ceiling is adapted between its minWindow and maxWindow instead of staying at maxConcurrency.
+"""
+class RequestScheduler:
+    def __init__(
+        self, 
+        endpointLimits : Dict[str, Dict[str, Any]], 
+        maxConcurrency : Optional[int] = None, 
+        adaptiveConcurrency : Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.limiters : Dict[str, EndpointLimiter] = {}
+        for name, limits in endpointLimits.items():
+            self.configure(name, **limits)
+        # Without a ceiling, the queue allows as many requests as all of the endpoints together
+        self.queue : FairWorkQueue = FairWorkQueue(
+            maxConcurrency or sum(limiter.max_concurrency for limiter in self.limiters.values())
+        )
+        self.controller : Optional[AimdConcurrencyController] = None
+        if adaptiveConcurrency is not None:
+            self.controller = AimdConcurrencyController(self.queue, **adaptiveConcurrency)
+
+    """
+    Creates (or replaces) the limiter for a given endpoint
+    """
+    def configure(self, name : str, rate : float, burst : int, max_concurrency : int, **kwargs) -> None:
+        self.limiters[name] = EndpointLimiter(name, rate, burst, max_concurrency, **kwargs)
+
+    """
+    Returns the limiter for an endpoint, to be used as: async with scheduler.limit("product"): ...
+    """
+    def limit(self, name : str) -> EndpointLimiter:
+        if name not in self.limiters:
+            raise KeyError(f"Unknown endpoint: {name}")
+        return self.limiters[name]
+
+    """
+    Waits for a requests endpoint limiter and then for its turn in the work queue,
+    to be used as: async with scheduler.request("reviews", productUrl): ...
+    """
+    @contextlib.asynccontextmanager
+    async def request(self, name : str, owner : str) -> AsyncIterator[EndpointLimiter]:
+        limiter = self.limit(name)
+        async with limiter, self.queue.slot(owner):
+            yield limiter
+
+    """
+    Records a successful response from an endpoint, along with how long it took (in seconds) when known
+    """
+    def record_success(self, name : str, latency : Optional[float] = None) -> None:
+        self.limit(name).record_success()
+        if self.controller and latency is not None:
+            self.controller.record_latency(latency, name)
+
+    def record_rate_limited(self, name : str, retryAfter : Optional[float] = None) -> None:
+        self.limit(name).record_rate_limited(retryAfter)
+        if self.controller:
+            self.controller.record_rate_limited()
+
+    """
+    Returns the current state of every endpoint limiter
+    """
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {
+            name: {
+                "rate": limiter.rate,
+                "configuredRate": limiter.configured_rate,
+                "inFlight": limiter.in_flight,
+                "maxConcurrency": limiter.max_concurrency,
+                "rateLimited": limiter.rate_limited_count
+            }
+            for name, limiter in self.limiters.items()
+        }
+        stats["queue"] = {
+            "inFlight": self.queue.in_flight,
+            "maxConcurrency": self.queue.max_concurrency,
+            "waiting": self.queue.waiting_count
+        }
+        if self.controller:
+            stats["concurrency"] = self.controller.stats()
+        return stats
@@ -0,0 +1,152 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import email.utils
+import random
+import time
+from typing import Dict, Iterator, Optional, Set, Tuple, Type
+import aiohttp
+
+# The retry budget of the scrape running in the current context (each scrape gets its own)
+_current_budget : contextvars.ContextVar = contextvars.ContextVar("retry_budget", default=None)
+
+"""
+Decides whether and when a failed request is sent again. Retryable responses (429 and 5xx)
+and network errors (including timeouts) are retried up to attempts times in total,
+waiting as long as the servers Retry-After header asks or otherwise a jittered exponential backoff
+(a random delay between 0 and baseDelay * 2^retry, at most maxDelay) so that retries
+from concurrent requests do not all arrive at the same moment.
+A Retry-After longer than maxRetryAfter is not waited for, the request gives up instead.
+Counts of each outcome are kept for every request the policy has handled.
+"""
+class RetryPolicy:
+    RETRYABLE_STATUSES : Set[int] = {403, 429, 500, 502, 503, 504}
+    RETRYABLE_EXCEPTIONS : Tuple[Type[BaseException], ...] = (aiohttp.ClientError, asyncio.TimeoutError)
+    # Outcomes counted by record
+    SUCCEEDED : str = "succeeded"
+    RECOVERED : str = "recovered" # Succeeded after at least one retry
+    NOT_RETRYABLE : str = "not_retryable"
+    RETRIED : str = "retried"
+    GAVE_UP : str = "gave_up"
+    BUDGET_EXHAUSTED : str = "budget_exhausted"
+    TIMEOUT : str = "timeout"
+    CONNECTION_ERROR : str = "connection_error"
+
+    def __init__(
+        self,
+        attempts : int = 4,
+        baseDelay : float = 0.5,
+        maxDelay : float = 30.0,
+        maxRetryAfter : float = 60.0,
+        statuses : Optional[Set[int]] = None,
+        seed : Optional[int] = None
+    ) -> None:
+        if attempts < 1:
+            raise ValueError("Attempts must be at least 1")
+        elif baseDelay < 0 or maxDelay < 0:
+            raise ValueError("Delays cannot be negative")
+        self.attempts : int = attempts
+        self.base_delay : float = baseDelay
+        self.max_delay : float = maxDelay
+        self.max_retry_after : float = maxRetryAfter
+        self.statuses : Set[int] = set(RetryPolicy.RETRYABLE_STATUSES if statuses is None else statuses)
+        self.random : random.Random = random.Random(seed)
+        self.counters : Dict[str, int] = collections.Counter()
+
+    def is_retryable_status(self, status : int) -> bool:
+        return status in self.statuses
+
+    """
+    Returns the number of seconds a Retry-After header asks for (given either as seconds or as an HTTP date),
+    or None if there is no valid header
+    """
+    @staticmethod
+    def parse_retry_after(value : Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retryAt = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retryAt is None:
+            return None
+        return max(0.0, retryAt.timestamp() - time.time())
+
+    def backoff_delay(self, retry : int) -> float:
+        return self.random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    """
+    Returns how long to wait before sending the request again after the given (zero based) attempt failed,
+    or None if it should not be sent again
+    """
+    def retry_delay(self, attempt : int, retryAfter : Optional[float] = None) -> Optional[float]:
+        if attempt + 1 >= self.attempts:
+            return None
+        if retryAfter is not None:
+            if retryAfter > self.max_retry_after:
+                return None
+            # A little jitter on top, so requests told to wait the same time do not all return together
+            return retryAfter + self.random.uniform(0, self.base_delay)
+        return self.backoff_delay(attempt)
+
+    def record(self, outcome : str) -> None:
+        self.counters[outcome] += 1
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+"""
+Limits how many retries a single scrape can send, so that when Argos is failing most requests
+a scrape gives up quickly instead of multiplying its load on the server.
+A scrape may retry minRetries times plus retryRatio of the requests it has sent.
+"""
+class RetryBudget:
+    def __init__(self, minRetries : int = 10, retryRatio : float = 0.2) -> None:
+        if minRetries < 0 or retryRatio < 0:
+            raise ValueError("Retry budget cannot be negative")
+        self.min_retries : int = minRetries
+        self.retry_ratio : float = retryRatio
+        self.requests : int = 0
+        self.retries : int = 0
+        self.exhausted : int = 0
+
+    """
+    Returns the retry budget of the scrape running in the current context, or None outside of a scrape
+    """
+    @staticmethod
+    def current() -> Optional["RetryBudget"]:
+        return _current_budget.get()
+
+    """
+    Makes the given budget the current budget for the duration of the with block.
+    Tasks created within the block inherit it.
+    """
+    @staticmethod
+    @contextlib.contextmanager
+    def track(budget : "RetryBudget") -> Iterator["RetryBudget"]:
+        token = _current_budget.set(budget)
+        try:
+            yield budget
+        finally:
+            _current_budget.reset(token)
+
+    @property
+    def remaining(self) -> float:
+        return self.min_retries + self.retry_ratio * self.requests - self.retries
+
+    def record_request(self) -> None:
+        self.requests += 1
+
+    """
+    Takes a retry from the budget, returning False if there are none left
+    """
+    def try_spend(self) -> bool:
+        if self.remaining < 1:
+            self.exhausted += 1
+            return False
+        self.retries += 1
+        return True
@@ -0,0 +1,104 @@
+import re
+from typing import List, Dict, Optional, Tuple
+
+"""
+A single Allow or Disallow rule from a robots.txt file.
+Rules without wildcards are matched as plain path prefixes, rules using the
+"*" wildcard or the "$" end anchor are compiled into a regular expression.
+"""
+class RobotsRule:
+    def __init__(self, allow : bool, path : str) -> None:
+        self.allow : bool = allow
+        self.path : str = path
+        self.pattern : Optional[re.Pattern] = None
+        if "*" in path or path.endswith("$"):
+            anchored = path.endswith("$")
+            body = path[:-1] if anchored else path
+            regex = ".*".join(re.escape(part) for part in body.split("*"))
+            self.pattern = re.compile(regex + ("$" if anchored else ""))
+
+    """
+    How specific the rule is, the most specific matching rule decides whether a path is allowed
+    """
+    @property
+    def specificity(self) -> int:
+        return len(self.path)
+
+    def matches(self, path : str) -> bool:
+        if self.pattern is None:
+            return path.startswith(self.path)
+        return self.pattern.match(path) is not None
+
+"""
+The rules of a robots.txt file, parsed once into groups of rules per user agent.
+Follows RFC 9309: the group naming the user agent is used (falling back to the "*" group),
+groups naming the same user agent are merged, the longest matching rule wins and
+Allow wins over Disallow when matching rules are equally long.
+"""
+class RobotsRules:
+    # Maximum number of is_allowed results remembered per user agent
+    CACHE_SIZE : int = 4096
+
+    def __init__(self, groups : Dict[str, List[RobotsRule]]) -> None:
+        self.groups : Dict[str, List[RobotsRule]] = groups
+        self._results : Dict[Tuple[str, str], bool] = {}
+
+    @staticmethod
+    def parse(content : str) -> "RobotsRules":
+        groups : Dict[str, List[RobotsRule]] = {}
+        currentAgents : List[str] = []
+        inRules : bool = False
+        for line in (content or "").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+            if field == "user-agent":
+                # A user-agent line after rules starts a new group
+                if inRules:
+                    currentAgents = []
+                    inRules = False
+                agent = value.lower()
+                currentAgents.append(agent)
+                groups.setdefault(agent, [])
+            elif field in ("allow", "disallow"):
+                inRules = True
+                # An empty Disallow allows everything, so it adds no rule
+                if not value or not currentAgents:
+                    continue
+                rule = RobotsRule(field == "allow", value)
+                for agent in currentAgents:
+                    groups[agent].append(rule)
+        return RobotsRules(groups)
+
+    """
+    Returns the rules that apply to the given user agent
+    """
+    def rules_for(self, userAgent : str = "*") -> List[RobotsRule]:
+        userAgent = userAgent.lower()
+        if userAgent in self.groups:
+            return self.groups[userAgent]
+        return self.groups.get("*", [])
+
+    def is_allowed(self, path : str, userAgent : str = "*") -> bool:
+        if path == "/robots.txt":
+            return True
+        key = (userAgent, path)
+        if key in self._results:
+            return self._results[key]
+
+        bestRule : Optional[RobotsRule] = None
+        for rule in self.rules_for(userAgent):
+            if not rule.matches(path):
+                continue
+            if (bestRule is None
+                or rule.specificity > bestRule.specificity
+                or (rule.specificity == bestRule.specificity and rule.allow and not bestRule.allow)):
+                bestRule = rule
+        allowed = bestRule is None or bestRule.allow
+
+        if len(self._results) >= RobotsRules.CACHE_SIZE:
+            self._results.clear()
+        self._results[key] = allowed
+        return allowed
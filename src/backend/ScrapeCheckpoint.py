@@ -0,0 +1,169 @@
+import contextlib
+import contextvars
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# The checkpoint of the scrape running in the current context, if it is being checkpointed
+_current_checkpoint : contextvars.ContextVar = contextvars.ContextVar("scrape_checkpoint", default=None)
+
+"""
+The frontier of a single search scrape, saved to disk as it goes so that a scrape interrupted
+by the process stopping can carry on where it left off rather than starting again.
+It records the search pages that have been fetched (and the products they listed),
+the products that are finished (and saved elsewhere, such as to a partial CSV),
+and for each product still being scraped its description and the review pages fetched so far.
+Finished products are dropped from the in progress state, so the checkpoint stays small.
+Saves are atomic (written to a temporary file and renamed) and at most once every SAVE_INTERVAL seconds,
+apart from save() which always writes.
+"""
+class ScrapeCheckpoint:
+    SAVE_INTERVAL : float = 1.0
+    VERSION : int = 1
+
+    def __init__(self, path : str, productName : str) -> None:
+        self.path : str = path
+        self.product_name : str = productName
+        self.created_at : float = time.time()
+        self.total_pages : Optional[int] = None
+        self.search_pages : Dict[int, List[Dict[str, Any]]] = {}
+        self.completed_products : Set[str] = set()
+        # productID -> {"description": str or None, "reviews": {offset: [review, ...]}}
+        self.products_in_progress : Dict[str, Dict[str, Any]] = {}
+        self.last_saved : float = 0.0
+        self.dirty : bool = False
+
+    """
+    Returns the checkpoint of the scrape running in the current context, or None if it is not checkpointed
+    """
+    @staticmethod
+    def current() -> Optional["ScrapeCheckpoint"]:
+        return _current_checkpoint.get()
+
+    """
+    Makes the given checkpoint the current checkpoint for the duration of the with block.
+    Tasks created within the block inherit it. Anything not yet saved is saved when the block exits.
+    """
+    @staticmethod
+    @contextlib.contextmanager
+    def track(checkpoint : "ScrapeCheckpoint") -> Iterator["ScrapeCheckpoint"]:
+        token = _current_checkpoint.set(checkpoint)
+        try:
+            yield checkpoint
+        finally:
+            _current_checkpoint.reset(token)
+            if checkpoint.dirty:
+                checkpoint.save()
+
+    """
+    Loads the checkpoint saved at the given path, returning None if there is no usable checkpoint
+    (it does not exist, cannot be read, or was started more than maxAge seconds ago)
+    """
+    @staticmethod
+    def load(path : str, maxAge : Optional[float] = None) -> Optional["ScrapeCheckpoint"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+            if data.get("version") != ScrapeCheckpoint.VERSION:
+                return None
+            checkpoint = ScrapeCheckpoint(path, data["productName"])
+            checkpoint.created_at = data["createdAt"]
+            checkpoint.total_pages = data["totalPages"]
+            checkpoint.search_pages = {int(page): results for page, results in data["searchPages"].items()}
+            checkpoint.completed_products = set(data["completedProducts"])
+            checkpoint.products_in_progress = {
+                productId: {
+                    "description": state["description"],
+                    "reviews": {int(offset): reviews for offset, reviews in state["reviews"].items()}
+                }
+                for productId, state in data["productsInProgress"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading scrape checkpoint {path}: {e}")
+            return None
+        if maxAge is not None and time.time() - checkpoint.created_at > maxAge:
+            return None
+        return checkpoint
+
+    """
+    Whether the checkpoint is for a search of the given product name, ignoring case and surrounding spaces
+    """
+    def is_for(self, productName : str) -> bool:
+        return self.product_name.strip().lower() == productName.strip().lower()
+
+    """
+    Whether the checkpoint holds nothing to continue from
+    """
+    @property
+    def is_empty(self) -> bool:
+        return not (self.search_pages or self.completed_products or self.products_in_progress)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": ScrapeCheckpoint.VERSION,
+            "productName": self.product_name,
+            "createdAt": self.created_at,
+            "totalPages": self.total_pages,
+            "searchPages": self.search_pages,
+            "completedProducts": sorted(self.completed_products),
+            "productsInProgress": self.products_in_progress
+        }
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temporaryPath = self.path + ".tmp"
+        with open(temporaryPath, "w") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(temporaryPath, self.path)
+        self.last_saved = time.monotonic()
+        self.dirty = False
+
+    def save_if_due(self) -> None:
+        self.dirty = True
+        if time.monotonic() - self.last_saved >= ScrapeCheckpoint.SAVE_INTERVAL:
+            self.save()
+
+    def delete(self) -> None:
+        self.dirty = False
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get_search_page(self, page : int) -> Tuple[Optional[List[Dict[str, Any]]], Optional[int]]:
+        if page not in self.search_pages:
+            return None, None
+        return self.search_pages[page], self.total_pages
+
+    def record_search_page(self, page : int, results : List[Dict[str, Any]], totalPages : int) -> None:
+        self.search_pages[page] = results
+        self.total_pages = totalPages
+        self.save_if_due()
+
+    def is_product_completed(self, productId : str) -> bool:
+        return productId in self.completed_products
+
+    def record_product_completed(self, productId : str) -> None:
+        self.completed_products.add(productId)
+        self.products_in_progress.pop(productId, None)
+        self.save_if_due()
+
+    def get_description(self, productId : str) -> Optional[str]:
+        return self.products_in_progress.get(productId, {}).get("description")
+
+    def record_description(self, productId : str, description : str) -> None:
+        self._product_state(productId)["description"] = description
+        self.save_if_due()
+
+    def get_review_page(self, productId : str, offset : int) -> Optional[List[str]]:
+        return self.products_in_progress.get(productId, {}).get("reviews", {}).get(offset)
+
+    def record_review_page(self, productId : str, offset : int, reviews : List[str]) -> None:
+        self._product_state(productId)["reviews"][offset] = reviews
+        self.save_if_due()
+
+    def _product_state(self, productId : str) -> Dict[str, Any]:
+        return self.products_in_progress.setdefault(productId, {"description": None, "reviews": {}})
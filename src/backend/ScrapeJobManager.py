@@ -0,0 +1,232 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import itertools
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import aiohttp
+from src.backend.ScraperRuntime import ScraperRuntime
+from src.backend.ScrapeProgress import ScrapeProgress
+from src.backend.ScrapeTracer import ScrapeTracer
+
+"""
+A single scrape (or review refresh) that has been submitted to the ScrapeJobManager
+"""
+class ScrapeJob:
+    QUEUED : str = "queued"
+    RUNNING : str = "running"
+    COMPLETED : str = "completed"
+    FAILED : str = "failed"
+    CANCELLED : str = "cancelled"
+
+    def __init__(self, jobId : str, kind : str, name : str, key : Tuple[str, str]) -> None:
+        self.jobId : str = jobId
+        self.kind : str = kind
+        self.name : str = name
+        self.key : Tuple[str, str] = key
+        self.status : str = ScrapeJob.QUEUED
+        self.created_at : float = time.time()
+        self.started_at : Optional[float] = None
+        self.finished_at : Optional[float] = None
+        self.result : Any = None
+        self.message : str = ""
+        self.future : Optional[concurrent.futures.Future] = None
+        self.progress : ScrapeProgress = ScrapeProgress()
+        # Time spent in each phase of the scrape and the Chrome trace it was exported to, once it has run (if traced)
+        self.trace_summary : Dict[str, Dict[str, float]] = {}
+        self.trace_path : Optional[str] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (ScrapeJob.COMPLETED, ScrapeJob.FAILED, ScrapeJob.CANCELLED)
+
+    """
+    Seconds the job has been running for, or ran for if it has finished
+    """
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "jobId": self.jobId,
+            "kind": self.kind,
+            "name": self.name,
+            "status": self.status,
+            "elapsed": self.elapsed,
+            "message": self.message,
+            "progress": self.progress.to_dict(),
+            "traceSummary": self.trace_summary,
+            "tracePath": self.trace_path
+        }
+
+"""
+Runs scrape jobs on the shared ScraperRuntime, allowing several scrapes to run at the same time
+(up to MAX_CONCURRENT_JOBS, the rest wait in a queue) without stepping on each other.
+Each job has an id that its status can be looked up by, can be cancelled,
+and submitting a job identical to one that is still queued or running returns the existing job.
+"""
+class ScrapeJobManager:
+    MAX_CONCURRENT_JOBS : int = 2
+    MAX_FINISHED_JOBS : int = 50 # Number of finished jobs remembered for status lookups
+    # When TRACE_JOBS is enabled each job that runs is traced and exported to TRACE_FOLDER as a Chrome trace
+    # (<jobId>.json), only the newest MAX_TRACE_FILES traces are kept. It is off by default as every job writes a file
+    TRACE_JOBS : bool = False
+    TRACE_FOLDER : str = os.path.join("ScraperCache", "traces")
+    MAX_TRACE_FILES : int = 20
+    _instance : "ScrapeJobManager" = None
+    _instance_lock : threading.Lock = threading.Lock()
+
+    def __init__(self, runtime : Optional[ScraperRuntime] = None, maxConcurrentJobs : Optional[int] = None) -> None:
+        self.runtime : ScraperRuntime = runtime or ScraperRuntime.get()
+        self.max_concurrent_jobs : int = maxConcurrentJobs or ScrapeJobManager.MAX_CONCURRENT_JOBS
+        self.jobs : Dict[str, ScrapeJob] = {}
+        self.last_finished_job : Optional[ScrapeJob] = None
+        self._active_keys : Dict[Tuple[str, str], ScrapeJob] = {}
+        self._ids = itertools.count(1)
+        self._lock : threading.Lock = threading.Lock()
+        self._job_slots : asyncio.Semaphore = None
+
+    """
+    Returns the job manager shared by the whole app
+    """
+    @staticmethod
+    def get() -> "ScrapeJobManager":
+        with ScrapeJobManager._instance_lock:
+            if ScrapeJobManager._instance is None:
+                ScrapeJobManager._instance = ScrapeJobManager()
+            return ScrapeJobManager._instance
+
+    """
+    Submits a job. work is a coroutine function that is given the runtimes pooled client
+    and returns the jobs result along with a message describing the outcome.
+    Jobs with the same kind and (case insensitive) name as a job that has not
+    finished yet are not run twice, the existing job is returned instead.
+    """
+    def submit(self, kind : str, name : str, work : Callable[[aiohttp.ClientSession], Awaitable[Tuple[Any, str]]]) -> ScrapeJob:
+        key = (kind, name.strip().lower())
+        with self._lock:
+            if key in self._active_keys:
+                return self._active_keys[key]
+            job = ScrapeJob(f"{kind}-{next(self._ids)}-{int(time.time())}", kind, name, key)
+            self.jobs[job.jobId] = job
+            self._active_keys[key] = job
+            self._forget_old_jobs()
+        job.future = self.runtime.submit(self._run_job, job, work)
+        # A job cancelled while still queued may never run, so it is also finished from here.
+        # A running job is only finished by _run_job, once it has finished unwinding
+        job.future.add_done_callback(lambda future: self._finish_job(job, ScrapeJob.CANCELLED, queuedOnly=True))
+        return job
+
+    def get_job(self, jobId : str) -> Optional[ScrapeJob]:
+        return self.jobs.get(jobId)
+
+    def active_jobs(self) -> List[ScrapeJob]:
+        with self._lock:
+            return list(self._active_keys.values())
+
+    """
+    Cancels a queued or running job, returning whether the job was cancelled.
+    A running job is only finished (and can only be submitted again) once it has stopped
+    """
+    def cancel(self, jobId : str) -> bool:
+        job = self.jobs.get(jobId)
+        if job is None or job.is_finished or job.future is None:
+            return False
+        return job.future.cancel()
+
+    async def _run_job(self, job : ScrapeJob, work : Callable[[aiohttp.ClientSession], Awaitable[Tuple[Any, str]]], client : aiohttp.ClientSession) -> Any:
+        if self._job_slots is None:
+            self._job_slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        try:
+            async with self._job_slots:
+                if not self._start_job(job):
+                    raise asyncio.CancelledError()
+                job.progress = ScrapeProgress()
+                # Everything the job does (including the tasks it starts) reports to the jobs progress
+                with ScrapeProgress.track(job.progress), self._trace_job(job):
+                    job.result, job.message = await work(client)
+        except asyncio.CancelledError:
+            self._finish_job(job, ScrapeJob.CANCELLED)
+            raise
+        except Exception as e:
+            print(f"Scrape job {job.jobId} failed: {e}")
+            job.message = f"Scrape of '{job.name}' failed: {e}"
+            self._finish_job(job, ScrapeJob.FAILED)
+        else:
+            self._finish_job(job, ScrapeJob.COMPLETED)
+        return job.result
+
+    """
+    Traces everything the job does within the with block when TRACE_JOBS is enabled,
+    exporting the trace and keeping its summary on the job however the block exits
+    """
+    @contextlib.contextmanager
+    def _trace_job(self, job : ScrapeJob) -> Iterator[None]:
+        if not ScrapeJobManager.TRACE_JOBS:
+            yield
+            return
+        tracer = ScrapeTracer(f"{job.kind} '{job.name}'")
+        try:
+            with ScrapeTracer.track(tracer), tracer.span("job", job.name, jobId=job.jobId):
+                yield
+        finally:
+            job.trace_summary = tracer.summary()
+            try:
+                job.trace_path = tracer.export_chrome_trace(os.path.join(ScrapeJobManager.TRACE_FOLDER, f"{job.jobId}.json"))
+                self._forget_old_traces()
+            except OSError as e:
+                print(f"Error exporting the trace of scrape job {job.jobId}: {e}")
+
+    """
+    Deletes the oldest exported traces once there are more than MAX_TRACE_FILES
+    """
+    def _forget_old_traces(self) -> None:
+        paths = [
+            os.path.join(ScrapeJobManager.TRACE_FOLDER, file) 
+            for file in os.listdir(ScrapeJobManager.TRACE_FOLDER) if file.endswith(".json")
+        ]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:max(0, len(paths) - ScrapeJobManager.MAX_TRACE_FILES)]:
+            os.remove(path)
+
+    """
+    Records that a queued job has started running, returns False if it was cancelled while it was queued
+    """
+    def _start_job(self, job : ScrapeJob) -> bool:
+        with self._lock:
+            if job.is_finished:
+                return False
+            job.status = ScrapeJob.RUNNING
+            job.started_at = time.time()
+            return True
+
+    """
+    Records that a job has finished with the given status, if it has not already been recorded.
+    queuedOnly only records it if the job has not started running yet
+    """
+    def _finish_job(self, job : ScrapeJob, status : str, queuedOnly : bool = False) -> None:
+        with self._lock:
+            if job.is_finished or (queuedOnly and job.status != ScrapeJob.QUEUED):
+                return
+            job.status = status
+            if status == ScrapeJob.CANCELLED:
+                job.message = f"Scrape of '{job.name}' cancelled."
+            job.finished_at = time.time()
+            if job.started_at is None:
+                job.started_at = job.finished_at
+            self._active_keys.pop(job.key, None)
+            self.last_finished_job = job
+
+    """
+    Forgets the oldest finished jobs once more than MAX_FINISHED_JOBS are remembered.
+    Must be called while holding the lock.
+    """
+    def _forget_old_jobs(self) -> None:
+        finished = [job for job in self.jobs.values() if job.is_finished]
+        for job in finished[:max(0, len(finished) - ScrapeJobManager.MAX_FINISHED_JOBS)]:
+            del self.jobs[job.jobId]
@@ -0,0 +1,138 @@
+import collections
+import contextlib
+import contextvars
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, Iterator, Optional
+import aiohttp
+
+# The progress of the scrape running in the current context (each scrape job runs in its own)
+_current_progress : contextvars.ContextVar = contextvars.ContextVar("scrape_progress", default=None)
+
+"""
+A live feed of how far a single scrape has got, published by the WebScraper as it runs.
+Counters are only updated from the scraper runtimes event loop and can be read from any thread.
+Requests are counted per attempt (including retries),
+so the request rate and number of 429 responses reflect what Argos actually saw.
+"""
+class ScrapeProgress:
+    RATE_WINDOW : float = 10.0 # Seconds of recent requests the request rate is measured over
+
+    def __init__(self) -> None:
+        self.started_at : float = time.time()
+        self.products_discovered : int = 0
+        self.products_scraped : int = 0
+        self.products_from_store : int = 0
+        self.descriptions_fetched : int = 0
+        self.review_pages_fetched : int = 0
+        self.requests_sent : int = 0
+        self.cache_hits : int = 0
+        self.bytes_downloaded : int = 0
+        self.rate_limited : int = 0
+        self.retries : int = 0
+        self.failed_requests : int = 0 # Requests that were given up on, after any retries
+        self._request_times : Deque[float] = collections.deque()
+        self._lock : threading.Lock = threading.Lock()
+
+    """
+    Returns the progress of the scrape running in the current context, or None outside of a scrape
+    """
+    @staticmethod
+    def current() -> Optional["ScrapeProgress"]:
+        return _current_progress.get()
+
+    """
+    Makes the given progress the current progress for the duration of the with block.
+    Tasks created within the block inherit it.
+    """
+    @staticmethod
+    @contextlib.contextmanager
+    def track(progress : "ScrapeProgress") -> Iterator["ScrapeProgress"]:
+        token = _current_progress.set(progress)
+        try:
+            yield progress
+        finally:
+            _current_progress.reset(token)
+
+    def record_products_discovered(self, count : int) -> None:
+        self.products_discovered += count
+
+    def record_product_scraped(self) -> None:
+        self.products_scraped += 1
+
+    def record_product_from_store(self) -> None:
+        self.products_from_store += 1
+
+    def record_description(self) -> None:
+        self.descriptions_fetched += 1
+
+    def record_review_page(self) -> None:
+        self.review_pages_fetched += 1
+
+    def record_cache_hit(self) -> None:
+        self.cache_hits += 1
+
+    def record_bytes(self, count : int) -> None:
+        self.bytes_downloaded += count
+
+    def record_retry(self) -> None:
+        self.retries += 1
+
+    def record_failed_request(self) -> None:
+        self.failed_requests += 1
+
+    def record_response(self, status : int) -> None:
+        now = time.time()
+        with self._lock:
+            self.requests_sent += 1
+            if status == 429:
+                self.rate_limited += 1
+            self._request_times.append(now)
+            self._drop_old_request_times(now)
+
+    """
+    Requests sent per second over the last RATE_WINDOW seconds
+    """
+    @property
+    def request_rate(self) -> float:
+        now = time.time()
+        with self._lock:
+            self._drop_old_request_times(now)
+            window = min(ScrapeProgress.RATE_WINDOW, max(now - self.started_at, 1.0))
+            return len(self._request_times) / window
+
+    def _drop_old_request_times(self, now : float) -> None:
+        while self._request_times and self._request_times[0] < now - ScrapeProgress.RATE_WINDOW:
+            self._request_times.popleft()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "products_discovered": self.products_discovered,
+            "products_scraped": self.products_scraped,
+            "products_from_store": self.products_from_store,
+            "descriptions_fetched": self.descriptions_fetched,
+            "review_pages_fetched": self.review_pages_fetched,
+            "requests_sent": self.requests_sent,
+            "cache_hits": self.cache_hits,
+            "bytes_downloaded": self.bytes_downloaded,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "failed_requests": self.failed_requests,
+            "request_rate": self.request_rate
+        }
+
+    """
+    Creates a trace config that records every response the session receives
+    against the progress of the scrape that sent the request
+    """
+    @staticmethod
+    def create_trace_config() -> aiohttp.TraceConfig:
+        async def on_request_end(session : aiohttp.ClientSession, context : SimpleNamespace, params : aiohttp.TraceRequestEndParams) -> None:
+            progress = ScrapeProgress.current()
+            if progress is not None:
+                progress.record_response(params.response.status)
+
+        traceConfig = aiohttp.TraceConfig()
+        traceConfig.on_request_end.append(on_request_end)
+        return traceConfig
@@ -0,0 +1,179 @@
+import asyncio
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterator, List, Optional
+
+# The tracer of the scrape running in the current context, if it is being traced
+_current_tracer : contextvars.ContextVar = contextvars.ContextVar("scrape_tracer", default=None)
+
+"""
+Records timed spans of the phases of a scrape (robots.txt, search pages, waiting for the rate limiter,
+description fetches, HTML parsing, review pages, CSV writes and so on) so that where its time goes can be seen.
+The spans can be exported as a Chrome trace (the JSON trace event format), which can be opened
+in Perfetto (ui.perfetto.dev) or chrome://tracing, with each asyncio task (or thread) shown as its own track.
+Spans of different phases nest, a description fetch includes the time its request waited for the rate limiter.
+Tracing is optional, the phase() hooks do nothing unless a tracer is being tracked.
+"""
+class ScrapeTracer:
+    MAX_EVENTS : int = 200000 # Spans beyond this are counted but not kept, bounding the memory a long scrape uses
+    PROCESS_ID : int = 1
+
+    def __init__(self, name : str = "scrape") -> None:
+        self.name : str = name
+        self.started_at : float = time.time()
+        self._origin : float = time.perf_counter()
+        self.events : List[Dict[str, Any]] = []
+        self.dropped_events : int = 0
+        self.phases : Dict[str, Dict[str, float]] = {}
+        self._track_names : Dict[int, str] = {}
+        self._task_tracks : "weakref.WeakKeyDictionary[asyncio.Task, int]" = weakref.WeakKeyDictionary()
+        self._thread_tracks : Dict[int, int] = {}
+        self._lock : threading.Lock = threading.Lock()
+
+    """
+    Returns the tracer of the scrape running in the current context, or None if it is not being traced
+    """
+    @staticmethod
+    def current() -> Optional["ScrapeTracer"]:
+        return _current_tracer.get()
+
+    """
+    Makes the given tracer the current tracer for the duration of the with block.
+    Tasks created within the block (and work sent to threads with asyncio.to_thread) inherit it.
+    """
+    @staticmethod
+    @contextlib.contextmanager
+    def track(tracer : "ScrapeTracer") -> Iterator["ScrapeTracer"]:
+        token = _current_tracer.set(tracer)
+        try:
+            yield tracer
+        finally:
+            _current_tracer.reset(token)
+
+    """
+    Times the with block as a span of the given phase on the current tracer,
+    doing nothing when the current scrape is not being traced
+    """
+    @staticmethod
+    def phase(phase : str, name : Optional[str] = None, **args : Any) -> contextlib.AbstractContextManager:
+        tracer = _current_tracer.get()
+        if tracer is None:
+            return contextlib.nullcontext()
+        return tracer.span(phase, name, **args)
+
+    """
+    Returns a timestamp to pass to record_phase as the start of a span
+    """
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    """
+    Records a span of the given phase on the current tracer that started at startedAt (from now()) and ends now,
+    for spans that cannot be wrapped in a with block
+    """
+    @staticmethod
+    def record_phase(phase : str, startedAt : float, name : Optional[str] = None, **args : Any) -> None:
+        tracer = _current_tracer.get()
+        if tracer is not None:
+            tracer.record(phase, startedAt, time.perf_counter(), name, **args)
+
+    @contextlib.contextmanager
+    def span(self, phase : str, name : Optional[str] = None, **args : Any) -> Iterator[None]:
+        startedAt = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, startedAt, time.perf_counter(), name, **args)
+
+    def record(self, phase : str, startedAt : float, endedAt : float, name : Optional[str] = None, **args : Any) -> None:
+        duration = max(0.0, endedAt - startedAt)
+        trackId = self._track_id()
+        with self._lock:
+            totals = self.phases.setdefault(phase, {"count": 0, "total": 0.0, "max": 0.0})
+            totals["count"] += 1
+            totals["total"] += duration
+            totals["max"] = max(totals["max"], duration)
+            if len(self.events) >= ScrapeTracer.MAX_EVENTS:
+                self.dropped_events += 1
+                return
+            event = {
+                "name": name or phase,
+                "cat": phase,
+                "ph": "X",
+                "ts": (startedAt - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": ScrapeTracer.PROCESS_ID,
+                "tid": trackId
+            }
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+    """
+    Returns the track that spans recorded now belong to, one for each asyncio task,
+    or for each thread when called outside of the event loop
+    """
+    def _track_id(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        with self._lock:
+            if task is not None:
+                trackId = self._task_tracks.get(task)
+                if trackId is None:
+                    trackId = self._task_tracks[task] = len(self._track_names) + 1
+                    self._track_names[trackId] = task.get_name()
+            else:
+                thread = threading.current_thread()
+                trackId = self._thread_tracks.get(thread.ident)
+                if trackId is None:
+                    trackId = self._thread_tracks[thread.ident] = len(self._track_names) + 1
+                    self._track_names[trackId] = thread.name
+        return trackId
+
+    """
+    Returns the number of spans, total and longest time (in seconds) of each phase, longest total first.
+    Concurrent spans are each counted in full, so a phase can total more than the scrapes wall time.
+    """
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return dict(sorted(
+                ((phase, dict(totals)) for phase, totals in self.phases.items()),
+                key=lambda item: item[1]["total"], reverse=True
+            ))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        with self._lock:
+            metadata = [{
+                "name": "process_name", "ph": "M", "pid": ScrapeTracer.PROCESS_ID, "tid": 0,
+                "args": {"name": self.name}
+            }] + [{
+                "name": "thread_name", "ph": "M", "pid": ScrapeTracer.PROCESS_ID, "tid": trackId,
+                "args": {"name": trackName}
+            } for trackId, trackName in self._track_names.items()]
+            events = list(self.events)
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"name": self.name, "startedAt": self.started_at, "droppedEvents": self.dropped_events}
+        }
+
+    """
+    Writes the trace to the given path as Chrome trace JSON, returning the path
+    """
+    def export_chrome_trace(self, path : str) -> str:
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temporaryPath = path + ".tmp"
+        with open(temporaryPath, "w") as file:
+            json.dump(self.to_chrome_trace(), file)
+        os.replace(temporaryPath, path)
+        return path
@@ -0,0 +1,82 @@
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from typing import Any, Callable, Awaitable, Optional
+import aiohttp
+from src.backend.WebScraper import WebScraper
+
+"""
+Owns a single long-lived event loop, running on its own background thread, and a pooled
+aiohttp session that is shared by every scrape the app starts.
+Connections (and their TLS sessions and DNS lookups) are kept alive and reused between
+scrapes, rather than a new event loop, connector and session being created for every search.
+"""
+class ScraperRuntime:
+    _instance : "ScraperRuntime" = None
+    _instance_lock : threading.Lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.loop : asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.session : Optional[aiohttp.ClientSession] = None
+        self._client_lock : asyncio.Lock = None
+        self.thread : threading.Thread = threading.Thread(target=self._run_loop, name="scraper-runtime", daemon=True)
+        self.thread.start()
+
+    """
+    Returns the runtime shared by the whole app, starting it on first use
+    """
+    @staticmethod
+    def get() -> "ScraperRuntime":
+        with ScraperRuntime._instance_lock:
+            if ScraperRuntime._instance is None or not ScraperRuntime._instance.thread.is_alive():
+                ScraperRuntime._instance = ScraperRuntime()
+                atexit.register(ScraperRuntime._instance.shutdown)
+            return ScraperRuntime._instance
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    """
+    Returns the pooled session, creating it on first use (or if it has been closed).
+    Must be called from within the runtimes event loop.
+    """
+    async def get_client(self) -> aiohttp.ClientSession:
+        if self._client_lock is None:
+            self._client_lock = asyncio.Lock()
+        async with self._client_lock:
+            if self.session is None or self.session.closed:
+                self.session = WebScraper.create_client_session()
+        return self.session
+
+    async def _run_with_client(self, coroutineFunction : Callable[..., Awaitable[Any]], args, kwargs) -> Any:
+        client = await self.get_client()
+        return await coroutineFunction(*args, client=client, **kwargs)
+
+    """
+    Schedules a scraper coroutine function on the runtimes event loop, passing it the pooled client
+    (as the client keyword argument). Returns a future that can be waited on from any thread.
+    """
+    def submit(self, coroutineFunction : Callable[..., Awaitable[Any]], *args, **kwargs) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(self._run_with_client(coroutineFunction, args, kwargs), self.loop)
+
+    """
+    Runs a scraper coroutine function on the runtime and blocks until its result is ready
+    """
+    def run(self, coroutineFunction : Callable[..., Awaitable[Any]], *args, timeout : Optional[float] = None, **kwargs) -> Any:
+        return self.submit(coroutineFunction, *args, **kwargs).result(timeout)
+
+    """
+    Closes the pooled session and stops the event loop
+    """
+    def shutdown(self) -> None:
+        if not self.loop.is_running():
+            return
+        if self.session is not None and not self.session.closed:
+            try:
+                asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(5)
+            except Exception as e:
+                print(f"Error closing scraper session: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
@@ -0,0 +1,212 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple
+from src.backend.Collection import Collection
+from src.backend.CollectionSummary import CollectionSummary
+from src.backend.Product import Product
+from src.backend.StorageBackend import StorageBackend
+
+"""
+Keeps the collections in a SQLite database, with a table each for the collections, their products
+and the products reviews (one row per review). Products are indexed by their collection
+and by productID, so reading, saving or deleting a single product only touches that products rows
+rather than the whole collection. It is safe to use from multiple threads.
+"""
+class SqliteStorageBackend(StorageBackend):
+    name : str = "sqlite"
+
+    def __init__(self, path : str) -> None:
+        if not isinstance(path, str):
+            raise TypeError("Path must be a string")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path : str = path
+        self._lock : threading.Lock = threading.Lock()
+        self._connection : sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            # Deleting a collection or product deletes its products and reviews along with it
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS collections (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                );
+                CREATE TABLE IF NOT EXISTS products (
+                    id INTEGER PRIMARY KEY,
+                    collection_id INTEGER NOT NULL REFERENCES collections (id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    product_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    url TEXT NOT NULL,
+                    rating REAL NOT NULL,
+                    description TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS products_by_collection ON products (collection_id, position);
+                CREATE INDEX IF NOT EXISTS products_by_product_id ON products (product_id, collection_id);
+                CREATE TABLE IF NOT EXISTS reviews (
+                    product_row INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (product_row, position)
+                ) WITHOUT ROWID;
+            """)
+
+    def list_collection_names(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT name FROM collections ORDER BY name")]
+
+    def load_collections(self) -> List[Collection]:
+        with self._lock:
+            collectionRows = self._connection.execute("SELECT id, name FROM collections ORDER BY name").fetchall()
+            return [Collection(name, self._load_products(collectionId)) for collectionId, name in collectionRows]
+
+    def list_collection_summaries(self) -> List[CollectionSummary]:
+        with self._lock:
+            rows = self._connection.execute(
+                """SELECT collections.name, COUNT(products.id), AVG(price), MIN(price), MAX(price), AVG(rating)
+                   FROM collections LEFT JOIN products ON products.collection_id = collections.id
+                   GROUP BY collections.id ORDER BY collections.name"""
+            ).fetchall()
+        return [CollectionSummary(*row) for row in rows]
+
+    def load_collection(self, collectionName : str) -> Optional[Collection]:
+        with self._lock:
+            collectionId = self._get_collection_id(collectionName)
+            if collectionId is None:
+                return None
+            return Collection(collectionName, self._load_products(collectionId))
+
+    def save_collections(self, collections : List[Collection]) -> None:
+        if not all(isinstance(collection, Collection) for collection in collections):
+            raise TypeError("All collections must be a Collection")
+        with self._lock, self._connection:
+            for collection in collections:
+                collectionId = self._get_or_create_collection_id(collection.name)
+                self._connection.execute("DELETE FROM products WHERE collection_id = ?", (collectionId,))
+                for position, product in enumerate(collection.products):
+                    self._insert_product(collectionId, position, product)
+
+    def delete_collection(self, collectionName : str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM collections WHERE name = ?", (collectionName,))
+
+    def get_product(self, collectionName : str, productId : str) -> Optional[Product]:
+        with self._lock:
+            row = self._connection.execute(
+                """SELECT products.id, product_id, products.name, price, url, rating, description
+                   FROM products JOIN collections ON collections.id = products.collection_id
+                   WHERE collections.name = ? AND product_id = ? ORDER BY position LIMIT 1""",
+                (collectionName, productId)
+            ).fetchone()
+            if row is None:
+                return None
+            reviews = [review for (review,) in self._connection.execute(
+                "SELECT text FROM reviews WHERE product_row = ? ORDER BY position", (row[0],)
+            )]
+        return self._create_product(row, reviews)
+
+    def save_product(self, collectionName : str, product : Product) -> None:
+        if not isinstance(product, Product):
+            raise TypeError("Product must be a Product")
+        with self._lock, self._connection:
+            collectionId = self._get_or_create_collection_id(collectionName)
+            row = self._find_product_row(collectionId, product.productID)
+            if row is None:
+                position = self._connection.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM products WHERE collection_id = ?", (collectionId,)
+                ).fetchone()[0]
+                self._insert_product(collectionId, position, product)
+                return
+            self._connection.execute(
+                "UPDATE products SET name = ?, price = ?, url = ?, rating = ?, description = ? WHERE id = ?",
+                (product.name, product.price, product.url, product.rating, product.description, row)
+            )
+            self._connection.execute("DELETE FROM reviews WHERE product_row = ?", (row,))
+            self._insert_reviews(row, product.reviews)
+
+    def delete_product(self, collectionName : str, productId : str) -> bool:
+        with self._lock, self._connection:
+            collectionId = self._get_collection_id(collectionName)
+            row = self._find_product_row(collectionId, productId) if collectionId is not None else None
+            if row is None:
+                return False
+            self._connection.execute("DELETE FROM products WHERE id = ?", (row,))
+            return True
+
+    """
+    The version changes with every change made through this backend (counted by the connections total_changes)
+    and with every change committed by another connection (counted by the data_version pragma)
+    """
+    def get_version(self) -> Optional[Hashable]:
+        with self._lock:
+            return (self._connection.execute("PRAGMA data_version").fetchone()[0], self._connection.total_changes)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    """
+    The methods below must be called while holding the lock
+    """
+    def _get_collection_id(self, collectionName : str) -> Optional[int]:
+        row = self._connection.execute("SELECT id FROM collections WHERE name = ?", (collectionName,)).fetchone()
+        return row[0] if row else None
+
+    def _get_or_create_collection_id(self, collectionName : str) -> int:
+        collectionId = self._get_collection_id(collectionName)
+        if collectionId is None:
+            collectionId = self._connection.execute("INSERT INTO collections (name) VALUES (?)", (collectionName,)).lastrowid
+        return collectionId
+
+    def _find_product_row(self, collectionId : int, productId : str) -> Optional[int]:
+        row = self._connection.execute(
+            "SELECT id FROM products WHERE collection_id = ? AND product_id = ? ORDER BY position LIMIT 1",
+            (collectionId, productId)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _insert_product(self, collectionId : int, position : int, product : Product) -> None:
+        row = self._connection.execute(
+            """INSERT INTO products (collection_id, position, product_id, name, price, url, rating, description)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (collectionId, position, product.productID, product.name, product.price, product.url, product.rating, product.description)
+        ).lastrowid
+        self._insert_reviews(row, product.reviews)
+
+    def _insert_reviews(self, productRow : int, reviews : List[str]) -> None:
+        self._connection.executemany(
+            "INSERT INTO reviews (product_row, position, text) VALUES (?, ?, ?)",
+            [(productRow, position, review) for position, review in enumerate(reviews)]
+        )
+
+    def _load_products(self, collectionId : int) -> List[Product]:
+        productRows = self._connection.execute(
+            """SELECT id, product_id, name, price, url, rating, description
+               FROM products WHERE collection_id = ? ORDER BY position""",
+            (collectionId,)
+        ).fetchall()
+        reviews : Dict[int, List[str]] = {row[0]: [] for row in productRows}
+        for productRow, review in self._connection.execute(
+            """SELECT product_row, text FROM reviews
+               WHERE product_row IN (SELECT id FROM products WHERE collection_id = ?)
+               ORDER BY product_row, position""",
+            (collectionId,)
+        ):
+            reviews[productRow].append(review)
+        return [self._create_product(row, reviews[row[0]]) for row in productRows]
+
+    @staticmethod
+    def _create_product(row : Tuple, reviews : List[str]) -> Product:
+        _, productId, name, price, url, rating, description = row
+        return Product(
+            productID=productId,
+            name=name,
+            price=price,
+            url=url,
+            rating=rating,
+            description=description,
+            reviews=reviews
+        )
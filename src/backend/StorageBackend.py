@@ -0,0 +1,274 @@
+from abc import ABC, abstractmethod
+import json
+import os
+import threading
+from typing import Any, Dict, Hashable, List, Optional
+from src.backend.Collection import Collection
+from src.backend.CollectionSummary import CollectionSummary
+from src.backend.Product import Product
+from src.backend.DataManager import DataManager
+
+"""
+Base class for where the apps collections are kept. Collections are saved and loaded whole,
+single products can also be read, saved and deleted, which backends can do without
+reading or rewriting the rest of the collection. Collections are identified by their name,
+and a collections products are kept in the order they were saved in.
+"""
+class StorageBackend(ABC):
+    name : str = ""
+
+    @abstractmethod
+    def list_collection_names(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def load_collections(self) -> List[Collection]:
+        pass
+
+    """
+    Returns a summary of every collection (ordered by name), without loading their products
+    unless the backend has no quicker way of summarising them
+    """
+    def list_collection_summaries(self) -> List[CollectionSummary]:
+        return sorted(
+            (CollectionSummary.from_collection(collection) for collection in self.load_collections()),
+            key=lambda summary: summary.name
+        )
+
+    """
+    Returns the collection with the given name, or None if there is no such collection
+    """
+    @abstractmethod
+    def load_collection(self, collectionName : str) -> Optional[Collection]:
+        pass
+
+    """
+    Saves each collection, replacing everything previously saved for a collection of the same name
+    """
+    @abstractmethod
+    def save_collections(self, collections : List[Collection]) -> None:
+        pass
+
+    @abstractmethod
+    def delete_collection(self, collectionName : str) -> None:
+        pass
+
+    """
+    Returns the product with the given id from a collection, or None if the collection does not hold it
+    """
+    @abstractmethod
+    def get_product(self, collectionName : str, productId : str) -> Optional[Product]:
+        pass
+
+    """
+    Saves a single product of a collection, replacing the saved product with the same id
+    or adding it to the end of the collection (which is created if it does not exist)
+    """
+    @abstractmethod
+    def save_product(self, collectionName : str, product : Product) -> None:
+        pass
+
+    """
+    Deletes the product with the given id from a collection, returning whether it was there
+    """
+    @abstractmethod
+    def delete_product(self, collectionName : str, productId : str) -> bool:
+        pass
+
+    """
+    Returns a value that changes whenever the saved collections change, including when they are
+    changed by another process, or None if the backend cannot tell
+    """
+    def get_version(self) -> Optional[Hashable]:
+        return None
+
+    """
+    Returns a value that changes whenever the saved collection with the given name changes
+    (see get_version), backends that cannot tell the collections apart return the version of all of them
+    """
+    def get_collection_version(self, collectionName : str) -> Optional[Hashable]:
+        return self.get_version()
+
+    """
+    Saves the collection held in a finished partial CSV (see DataManager.append_products_to_partial_csv)
+    and removes the partial CSV, returning the collection
+    """
+    def commit_partial_csv(self, csvFolderName : str, collectionName : str) -> Collection:
+        partialPath = DataManager.get_partial_csv_path(csvFolderName, collectionName)
+        if not os.path.exists(partialPath):
+            raise FileNotFoundError("Partial CSV not found")
+        collection = DataManager.load_collection_from_csv(partialPath)
+        self.save_collections([collection])
+        os.remove(partialPath)
+        return collection
+
+    def close(self) -> None:
+        pass
+
+"""
+Keeps each collection as a CSV file within a folder (the format the app has always used).
+Saving or deleting a single product rewrites its collections whole CSV.
+The summaries of the collections are kept in a manifest (CATALOG_FILE) alongside the CSVs,
+each with the modification time and size of the CSV it summarises. A CSV changed outside of
+the backend no longer matches its entry, and is summarised again from its prices and ratings.
+"""
+class CsvStorageBackend(StorageBackend):
+    name : str = "csv"
+    CATALOG_FILE : str = "catalog.json"
+    CATALOG_VERSION : int = 1
+
+    def __init__(self, csvFolderName : str) -> None:
+        if not isinstance(csvFolderName, str):
+            raise TypeError("Folder name must be a string")
+        self.folder : str = csvFolderName
+        self._catalog_lock : threading.Lock = threading.Lock()
+
+    def get_csv_path(self, collectionName : str) -> str:
+        return os.path.join(self.folder, collectionName + ".csv")
+
+    def list_collection_names(self) -> List[str]:
+        if not os.path.exists(self.folder):
+            return []
+        return sorted(file[:-4] for file in os.listdir(self.folder) if file.endswith(".csv"))
+
+    def load_collections(self) -> List[Collection]:
+        if not os.path.exists(self.folder):
+            return []
+        return DataManager.load_collections_from_csv_folder(self.folder)
+
+    """
+    A CSVs version is its modification time and size, or None once it has been deleted
+    """
+    def get_collection_version(self, collectionName : str) -> Optional[Hashable]:
+        try:
+            fileStats = os.stat(self.get_csv_path(collectionName))
+        except FileNotFoundError:
+            return None
+        return (fileStats.st_mtime_ns, fileStats.st_size)
+
+    def get_version(self) -> Optional[Hashable]:
+        return tuple((collectionName, self.get_collection_version(collectionName)) for collectionName in self.list_collection_names())
+
+    def list_collection_summaries(self) -> List[CollectionSummary]:
+        with self._catalog_lock:
+            catalog = self._read_catalog()
+            summaries, changed = [], False
+            for collectionName in self.list_collection_names():
+                csvPath = self.get_csv_path(collectionName)
+                try:
+                    fileStats = os.stat(csvPath)
+                    entry = catalog.get(collectionName)
+                    if entry is None or (entry["mtime"], entry["size"]) != (fileStats.st_mtime, fileStats.st_size):
+                        entry = self._catalog_entry(csvPath, DataManager.summarise_collection_csv(csvPath))
+                        catalog[collectionName] = entry
+                        changed = True
+                except (OSError, ValueError, IndexError) as e:
+                    print(f"Error summarising collection {collectionName}: {e}")
+                    continue
+                summaries.append(CollectionSummary.from_dict(entry["summary"]))
+            # Entries of CSVs that were removed outside of the backend
+            for collectionName in set(catalog) - {summary.name for summary in summaries}:
+                del catalog[collectionName]
+                changed = True
+            if changed:
+                self._write_catalog(catalog)
+        return summaries
+
+    def load_collection(self, collectionName : str) -> Optional[Collection]:
+        csvPath = self.get_csv_path(collectionName)
+        if not os.path.exists(csvPath):
+            return None
+        return DataManager.load_collection_from_csv(csvPath)
+
+    def save_collections(self, collections : List[Collection]) -> None:
+        DataManager.save_collections_to_csv_folder(self.folder, collections)
+        self._update_catalog({collection.name: CollectionSummary.from_collection(collection) for collection in collections})
+
+    def delete_collection(self, collectionName : str) -> None:
+        csvPath = self.get_csv_path(collectionName)
+        if os.path.exists(csvPath):
+            os.remove(csvPath)
+        self._update_catalog({collectionName: None})
+
+    def get_product(self, collectionName : str, productId : str) -> Optional[Product]:
+        collection = self.load_collection(collectionName)
+        if collection is None:
+            return None
+        return next((product for product in collection.products if product.productID == productId), None)
+
+    def save_product(self, collectionName : str, product : Product) -> None:
+        collection = self.load_collection(collectionName) or Collection(collectionName, [])
+        for index, savedProduct in enumerate(collection.products):
+            if savedProduct.productID == product.productID:
+                collection.products[index] = product
+                break
+        else:
+            collection.add_product(product)
+        self.save_collections([collection])
+
+    def delete_product(self, collectionName : str, productId : str) -> bool:
+        collection = self.load_collection(collectionName)
+        if collection is None:
+            return False
+        for index, savedProduct in enumerate(collection.products):
+            if savedProduct.productID == productId:
+                del collection.products[index]
+                self.save_collections([collection])
+                return True
+        return False
+
+    """
+    The partial CSV is already in the CSV format, so it is renamed to the collections CSV
+    when it is in the same folder rather than being loaded and written again
+    """
+    def commit_partial_csv(self, csvFolderName : str, collectionName : str) -> Collection:
+        if os.path.abspath(csvFolderName) != os.path.abspath(self.folder):
+            return super().commit_partial_csv(csvFolderName, collectionName)
+        collection = DataManager.commit_partial_csv(csvFolderName, collectionName)
+        self._update_catalog({collectionName: CollectionSummary.from_collection(collection)})
+        return collection
+
+    def get_catalog_path(self) -> str:
+        return os.path.join(self.folder, CsvStorageBackend.CATALOG_FILE)
+
+    """
+    Records the summaries of collections that have just been written (or None for those deleted) in the catalog
+    """
+    def _update_catalog(self, summaries : Dict[str, Optional[CollectionSummary]]) -> None:
+        with self._catalog_lock:
+            catalog = self._read_catalog()
+            for collectionName, summary in summaries.items():
+                csvPath = self.get_csv_path(collectionName)
+                if summary is None or not os.path.exists(csvPath):
+                    catalog.pop(collectionName, None)
+                else:
+                    catalog[collectionName] = self._catalog_entry(csvPath, summary)
+            self._write_catalog(catalog)
+
+    @staticmethod
+    def _catalog_entry(csvPath : str, summary : CollectionSummary) -> Dict[str, Any]:
+        fileStats = os.stat(csvPath)
+        return {"mtime": fileStats.st_mtime, "size": fileStats.st_size, "summary": summary.to_dict()}
+
+    """
+    The methods below must be called while holding the catalog lock
+    """
+    def _read_catalog(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.get_catalog_path(), "r") as file:
+                data = json.load(file)
+            if data.get("version") == CsvStorageBackend.CATALOG_VERSION:
+                return data["collections"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading the collection catalog, it will be rebuilt: {e}")
+        return {}
+
+    def _write_catalog(self, catalog : Dict[str, Dict[str, Any]]) -> None:
+        if not os.path.exists(self.folder):
+            return
+        temporaryPath = self.get_catalog_path() + ".tmp"
+        with open(temporaryPath, "w") as file:
+            json.dump({"version": CsvStorageBackend.CATALOG_VERSION, "collections": catalog}, file)
+        os.replace(temporaryPath, self.get_catalog_path())
@@ -1,48 +1,30 @@
 import aiohttp
 import asyncio
-from aiohttp_retry import RetryClient, ExponentialRetry
-from bs4 import BeautifulSoup
+import concurrent.futures
+import codecs
+import contextlib
+import hashlib
 import json
 import random
 import math
+import os
+import re
+import threading
 import time
 import urllib.parse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set, Tuple, AsyncIterator, Iterator, Optional, Callable, Awaitable
 from src.backend.Product import Product
 from src.backend.Collection import Collection
+from src.backend.RequestScheduler import RequestScheduler
+from src.backend.RetryPolicy import RetryPolicy, RetryBudget
+from src.backend.HttpCache import HttpCache
+from src.backend.ProductStore import ProductStore, StoredProduct
+from src.backend.RobotsRules import RobotsRules
+from src.backend.DescriptionParser import parse_description, resolve_parser_name, DescriptionStreamParser
+from src.backend.ScrapeProgress import ScrapeProgress
+from src.backend.ScrapeCheckpoint import ScrapeCheckpoint
+from src.backend.ScrapeTracer import ScrapeTracer
 
-"""
-A class to dynamically adjust the rate of requests based on server responses.
-It helps in avoiding rate limiting by increasing or decreasing the request rate as needed.
-"""
-class AdaptiveRateLimiter:
-    def __init__(self, initial_rate=1, max_rate=10, min_delay=1.0, max_delay=2.0):
-        self.rate = initial_rate
-        self.max_rate = max_rate
-        self.min_delay = min_delay
-        self.max_delay = max_delay
-        self.last_request_time = 0
-    """
-    Ensures that requests are not made too quickly by waiting if necessary.
-    """
-    async def wait(self):
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        delay = max(1 / self.rate - time_since_last_request, 0)
-        delay += random.uniform(self.min_delay, self.max_delay)
-        if delay > 0:
-            await asyncio.sleep(delay)
-        self.last_request_time = time.time()
-    """
-    Increases the request rate after successful requests.
-    """
-    def increase_rate(self):
-        self.rate = min(self.rate * 1.1, self.max_rate)
-    """
-    Decreases the request rate if rate limiting is detected.
-    """
-    def decrease_rate(self):
-        self.rate = max(self.rate * 0.9, 1)
 """
 A utility class for scraping product information from the Argos website.
 It includes methods for searching products, parsing product pages, and fetching reviews.
@@ -58,19 +40,80 @@ class WebScraper:
         "Mozilla/5.0 (Android 11; Mobile; rv:68.0) Gecko/68.0 Firefox/89.0",
         "Mozilla/5.0 (Android 11; Mobile; LG-M255; rv:89.0) Gecko/89.0 Firefox/89.0"
     ]
-    MIN_SLEEP_TIME: float = 0.3
-    MAX_SLEEP_TIME: float = 0.6
-    MAX_CONCURRENT_REQUESTS: int = 6
+    MAX_CONCURRENT_REQUESTS: int = 16 # Most requests in flight at once, across every endpoint and product
+    # Adapts the requests in flight (between minWindow and maxWindow) to how quickly Argos is responding
+    ADAPTIVE_CONCURRENCY: Dict[str, Any] = {"minWindow": 1, "maxWindow": MAX_CONCURRENT_REQUESTS, "initialWindow": 4}
+    MAX_PRODUCTS_IN_FLIGHT: int = 12 # Products being scraped at once, their requests share the request slots fairly
     MAX_NUMBER_OF_REVIEWS: int = 400
     MAX_NUMBER_OF_PRODUCTS: int = 150 # Limiting size so that searches dont take too long for when you are reviewing/testing
+    PIPELINE_SEARCH: bool = True # Start scraping products while the remaining search pages are still being fetched
     BASE_URL: str = "https://www.argos.co.uk"
+    # Paths a scrape requests, which must all be allowed by robots.txt
+    SCRAPE_PATHS: List[str] = [
+        "/finder-api/product",
+        "/product/",
+        "/product-api/bazaar-voice-reviews/partNumber/"
+    ]
+    # Connection pool settings of the session that requests are sent through
+    CONNECTION_LIMIT: int = 30
+    CONNECTION_LIMIT_PER_HOST: int = 12
+    DNS_CACHE_TTL: int = 300
+    KEEPALIVE_TIMEOUT: float = 60.0
     ROBOTS_TXT_CONTENT: str = None
-    rate_limiter: AdaptiveRateLimiter = AdaptiveRateLimiter(
-        initial_rate=1, 
-        max_rate=10, 
-        min_delay=MIN_SLEEP_TIME, 
-        max_delay=MAX_SLEEP_TIME
-    )
+    ROBOTS_TTL: float = 24 * 60 * 60 # Seconds before robots.txt is fetched again
+    ROBOTS_USER_AGENT: str = "*" # The robots.txt user agent group the scraper follows
+    robots_rules: RobotsRules = None
+    robots_fetched_at: float = 0.0
+    # Requests per second, burst size and requests in flight allowed for each endpoint
+    ENDPOINT_LIMITS: Dict[str, Dict[str, Any]] = {
+        "search": {"rate": 1.0, "burst": 3, "max_concurrency": 3},
+        "product": {"rate": 3.0, "burst": 6, "max_concurrency": 6},
+        "reviews": {"rate": 4.0, "burst": 8, "max_concurrency": 6}
+    }
+    scheduler: RequestScheduler = RequestScheduler(ENDPOINT_LIMITS, MAX_CONCURRENT_REQUESTS, ADAPTIVE_CONCURRENCY)
+    # Every endpoint shares one retry policy, and each scrape gets a retry budget of
+    # minRetries plus retryRatio of the requests it sends
+    retry_policy: RetryPolicy = RetryPolicy(attempts=4, baseDelay=0.5, maxDelay=30.0, maxRetryAfter=60.0)
+    RETRY_BUDGET: Dict[str, Any] = {"minRetries": 10, "retryRatio": 0.2}
+    # Time allowed for a request as a whole, to connect and between reads of its response
+    REQUEST_TIMEOUT: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=30, connect=10, sock_read=15)
+    NO_RESPONSE_STATUS: int = 599 # Status returned by fetch for requests that failed without a response
+    USE_HTTP_CACHE: bool = True
+    HTTP_CACHE_PATH: str = os.path.join("ScraperCache", "http_cache.sqlite")
+    HTTP_CACHE_MAX_SIZE: int = 200 * 1024 * 1024
+    # How long (in seconds) a cached response for each endpoint is used before it is revalidated
+    HTTP_CACHE_TTLS: Dict[str, float] = {
+        "search": 60 * 60,
+        "product": 24 * 60 * 60,
+        "reviews": 6 * 60 * 60
+    }
+    http_cache: HttpCache = None
+    REVIEW_REFRESH_PAGE_SIZE: int = 100
+    # The newest stored reviews that must be found in sequence to recognise where the new reviews end
+    REVIEW_MATCH_LENGTH: int = 3
+    # Description of a product created from its search data alone, until its description and reviews are scraped
+    PENDING_DESCRIPTION: str = "Description not loaded yet"
+    # Scraped products are remembered by productID, products scraped within PRODUCT_STORE_MAX_AGE seconds
+    # are used from the store rather than scraped again. Only products the scraper has scraped itself are stored,
+    # a saved collection is not a record of when its products were scraped.
+    USE_PRODUCT_STORE: bool = True
+    PRODUCT_STORE_PATH: str = os.path.join("ScraperCache", "products.sqlite")
+    PRODUCT_STORE_MAX_AGE: float = 3 * 24 * 60 * 60
+    product_store: ProductStore = None
+    product_store_lock: threading.Lock = threading.Lock()
+    # Checkpoints of the streamed scrapes still in progress, a scrape interrupted less than
+    # CHECKPOINT_MAX_AGE seconds ago carries on from its checkpoint rather than starting again
+    CHECKPOINT_FOLDER: str = os.path.join("ScraperCache", "checkpoints")
+    CHECKPOINT_MAX_AGE: float = 24 * 60 * 60
+    # Description parsing engine ("auto", "lxml", "strainer" or "html.parser") and 
+    # whether it runs on a "thread" or "process" pool, keeping the event loop free to service sockets
+    DESCRIPTION_PARSER: str = "auto"
+    PARSER_EXECUTOR: str = "thread"
+    PARSER_WORKERS: int = 2
+    parser_executor: concurrent.futures.Executor = None
+    # Read product pages a chunk at a time, closing the connection once the description has been read
+    STREAM_DESCRIPTIONS: bool = True
+    STREAM_CHUNK_SIZE: int = 16 * 1024
 
     def __init__(self):
         raise TypeError("This is a utility class and cannot be instantiated")
@@ -101,62 +144,70 @@ class WebScraper:
         }
 
     """
-    Retrieves the robots.txt file from the target website.
+    Retrieves the robots.txt file from the target website and parses it into rules.
+    If it cannot be retrieved the previous rules are kept (or everything is allowed if there are none).
     """
     @staticmethod
-    async def fetch_robots_txt(client: RetryClient) -> None:
+    async def fetch_robots_txt(client: aiohttp.ClientSession) -> None:
         headers = WebScraper.get_headers()
         robotsUrl = urllib.parse.urljoin(WebScraper.BASE_URL, "/robots.txt")
+        content = None
         try:
-            async with client.get(robotsUrl, headers=headers) as response:
-                if response.status == 200:
-                    WebScraper.ROBOTS_TXT_CONTENT = await response.text()
-                else:
-                    print(f"Failed to fetch robots.txt. Status: {response.status}")
-                    WebScraper.ROBOTS_TXT_CONTENT = ""
+            with ScrapeTracer.phase("robots", "robots.txt"):
+                async with client.get(robotsUrl, headers=headers, timeout=WebScraper.REQUEST_TIMEOUT) as response:
+                    if response.status == 200:
+                        content = await response.text()
+                    else:
+                        print(f"Failed to fetch robots.txt. Status: {response.status}")
         except Exception as e:
             print(f"Error fetching robots.txt: {e}")
-            WebScraper.ROBOTS_TXT_CONTENT = ""
+
+        if content is not None or WebScraper.robots_rules is None:
+            WebScraper.ROBOTS_TXT_CONTENT = content or ""
+            WebScraper.robots_rules = RobotsRules.parse(WebScraper.ROBOTS_TXT_CONTENT)
+        WebScraper.robots_fetched_at = time.time()
 
     """
-    Verifies if the given paths are allowed to be scraped according to robots.txt.
+    Ensures the robots.txt rules are loaded and refreshes them once they are older than ROBOTS_TTL.
+    While a refresh is in progress the previous rules carry on being used.
     """
     @staticmethod
-    async def check_paths_allowed(client: RetryClient, paths: List[str]) -> bool:
-        if WebScraper.ROBOTS_TXT_CONTENT is None:
+    async def ensure_robots_rules(client: aiohttp.ClientSession) -> None:
+        if WebScraper.robots_rules is None:
+            await WebScraper.fetch_robots_txt(client)
+        elif time.time() - WebScraper.robots_fetched_at > WebScraper.ROBOTS_TTL:
+            # Marking the rules as fetched straight away stops concurrent requests from also refreshing them
+            WebScraper.robots_fetched_at = time.time()
             await WebScraper.fetch_robots_txt(client)
 
-        lines = WebScraper.ROBOTS_TXT_CONTENT.splitlines()
-        for path in paths:
-            for line in lines:
-                if line.lower().startswith("disallow:"):
-                    disallowedPath = line.split(":", 1)[1].strip()
-                    if path.startswith(disallowedPath):
-                        print(f"Access to {path} is disallowed by robots.txt")
-                        return False
-        return True
     """
-    Creates a RetryClient with specific retry options for handling failed requests.
-    """  
+    Verifies if a url is allowed to be scraped according to the loaded robots.txt rules.
+    This is cheap enough to be checked before every request.
+    """
     @staticmethod
-    def create_retry_client(session):
-        retry_options = ExponentialRetry(
-            attempts=3,
-            start_timeout=0.8,
-            max_timeout=60,
-            factor=2,
-            statuses={403, 429, 500, 502, 503, 504}
-        )
-        return RetryClient(client_session=session, retry_options=retry_options)
+    def is_url_allowed(url: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        if WebScraper.robots_rules is None:
+            return True
+        parts = urllib.parse.urlsplit(url)
+        query = parts.query
+        if params:
+            query = "&".join(filter(None, [query, urllib.parse.urlencode(params)]))
+        path = (parts.path or "/") + (f"?{query}" if query else "")
+        return WebScraper.robots_rules.is_allowed(path, WebScraper.ROBOTS_USER_AGENT)
+
     """
-    Implements an exponential backoff strategy for rate limiting.
+    Verifies if the given paths are allowed to be scraped according to robots.txt.
     """
     @staticmethod
-    async def handle_rate_limit(attempt):
-        wait_time = min((2 ** attempt) + random.uniform(0, 1), 60)  # Cap at 60 seconds
-        print(f"Rate limited. Waiting for {wait_time:.2f} seconds before retry.")
-        await asyncio.sleep(wait_time)
-        
+    async def check_paths_allowed(client: aiohttp.ClientSession, paths: List[str]) -> bool:
+        await WebScraper.ensure_robots_rules(client)
+
+        for path in paths:
+            if not WebScraper.robots_rules.is_allowed(path, WebScraper.ROBOTS_USER_AGENT):
+                print(f"Access to {path} is disallowed by robots.txt")
+                return False
+        return True
+
     @staticmethod
     def create_ssl_context():
         import ssl
@@ -165,58 +216,331 @@ class WebScraper:
         return ssl_context
 
     """
-    Main method to search for products and collect their data.
-    It orchestrates the entire scraping process for a given product search term.
+    Creates the aiohttp session that requests are sent through,
+    with a connection pool that keeps connections alive and caches DNS lookups.
+    Extra trace configs can be given to observe the sessions requests (such as for benchmarking).
     """
     @staticmethod
-    async def search_for_products(productName: str) -> Collection:
+    def create_client_session(traceConfigs: Optional[List[aiohttp.TraceConfig]] = None) -> aiohttp.ClientSession:
         ssl_context = WebScraper.create_ssl_context()
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        async with aiohttp.ClientSession(
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            limit=WebScraper.CONNECTION_LIMIT,
+            limit_per_host=WebScraper.CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=WebScraper.DNS_CACHE_TTL,
+            keepalive_timeout=WebScraper.KEEPALIVE_TIMEOUT
+        )
+        return aiohttp.ClientSession(
             cookie_jar=aiohttp.CookieJar(),
-            connector=connector
-        ) as session:
-            retryClient : RetryClient = WebScraper.create_retry_client(session)
-            
-            # Check if all required paths are allowed by robots.txt
-            paths_to_check = [
-                "/finder-api/product",
-                "/product/",
-                "/product-api/bazaar-voice-reviews/partNumber/"
-            ]
-            if not await WebScraper.check_paths_allowed(retryClient, paths_to_check):
-                print("One or more required paths are not allowed by robots.txt. Aborting.")
-                return None
+            connector=connector,
+            timeout=WebScraper.REQUEST_TIMEOUT,
+            trace_configs=[ScrapeProgress.create_trace_config()] + (traceConfigs or [])
+        )
+
+    """
+    Yields the session to send a scrapes requests through.
+    If a client session is given (such as the pooled session of the ScraperRuntime) it is used as is,
+    otherwise a session is created for the duration of the scrape and closed afterwards.
+    The scrape is given its own retry budget, unless it is part of a scrape that already has one
+    (or trackRetryBudget is False, for async generators which must not set context variables
+    in their callers context).
+    """
+    @staticmethod
+    @contextlib.asynccontextmanager
+    async def client_scope(
+        client: Optional[aiohttp.ClientSession] = None, 
+        trackRetryBudget: bool = True
+    ) -> AsyncIterator[aiohttp.ClientSession]:
+        with WebScraper.retry_budget_scope() if trackRetryBudget else contextlib.nullcontext():
+            if client is not None:
+                yield client
+                return
+            async with WebScraper.create_client_session() as session:
+                yield session
+
+    """
+    Gives the scrape running within the with block its own retry budget,
+    unless it is part of a scrape that already has one
+    """
+    @staticmethod
+    @contextlib.contextmanager
+    def retry_budget_scope() -> Iterator[RetryBudget]:
+        budget = RetryBudget.current()
+        if budget is not None:
+            yield budget
+            return
+        with RetryBudget.track(RetryBudget(**WebScraper.RETRY_BUDGET)) as budget:
+            yield budget
 
-            # Search for productName and gather all pages results
-            searchResultsData: Dict[str, Any] = await WebScraper.fetch_all_search_results(
-                retryClient, productName
+    """
+    Returns the shared HTTP cache, opening it on first use.
+    Returns None if the cache is disabled.
+    """
+    @staticmethod
+    def get_http_cache() -> Optional[HttpCache]:
+        if not WebScraper.USE_HTTP_CACHE:
+            return None
+        if WebScraper.http_cache is None:
+            WebScraper.http_cache = HttpCache(
+                WebScraper.HTTP_CACHE_PATH,
+                ttl=max(WebScraper.HTTP_CACHE_TTLS.values()),
+                max_size_bytes=WebScraper.HTTP_CACHE_MAX_SIZE
             )
-            if not searchResultsData:
-                print("No search results found")
+        return WebScraper.http_cache
+
+    """
+    Returns the product store, creating it on first use
+    """
+    @staticmethod
+    def get_product_store() -> Optional[ProductStore]:
+        if not WebScraper.USE_PRODUCT_STORE:
+            return None
+        with WebScraper.product_store_lock:
+            if WebScraper.product_store is None:
+                WebScraper.product_store = ProductStore(WebScraper.PRODUCT_STORE_PATH)
+            return WebScraper.product_store
+
+    """
+    Whether a products description was scraped successfully, only these products are stored
+    """
+    @staticmethod
+    def is_fully_scraped(product: Product) -> bool:
+        return WebScraper.is_hydrated(product) and not product.description.startswith("Description not found")
+
+    """
+    Returns the stored product with the given id if it was scraped within PRODUCT_STORE_MAX_AGE
+    """
+    @staticmethod
+    async def get_stored_product(productId: str) -> Optional[StoredProduct]:
+        def lookup() -> Optional[StoredProduct]:
+            store = WebScraper.get_product_store()
+            return store.get(productId, WebScraper.PRODUCT_STORE_MAX_AGE) if store else None
+        with ScrapeTracer.phase("product_store", "product store lookup"):
+            return await asyncio.to_thread(lookup)
+
+    @staticmethod
+    async def store_product(product: Product, scrapedAt: Optional[float] = None) -> None:
+        if not WebScraper.is_fully_scraped(product):
+            return
+        def store() -> None:
+            productStore = WebScraper.get_product_store()
+            if productStore:
+                productStore.put(product, scrapedAt)
+        with ScrapeTracer.phase("product_store", "product store write"):
+            await asyncio.to_thread(store)
+
+    """
+    Returns where the checkpoint of a product names scrape is saved. Product names are compared
+    the way scrape jobs compare them (ignoring case and surrounding spaces), the file is named after
+    the letters and digits of the name followed by a hash of it, so any search text gives a file
+    within CHECKPOINT_FOLDER. The name itself is kept within the checkpoint.
+    """
+    @staticmethod
+    def get_checkpoint_path(productName: str) -> str:
+        key = productName.strip().lower()
+        slug = re.sub(r"[^a-z0-9]+", "-", key).strip("-")[:40]
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(WebScraper.CHECKPOINT_FOLDER, f"{slug}-{digest}.json" if slug else f"{digest}.json")
+
+    """
+    Returns the checkpoint to continue an interrupted scrape of a product name from,
+    or a new checkpoint if there is none (or it is too old to be worth continuing)
+    """
+    @staticmethod
+    def open_checkpoint(productName: str) -> ScrapeCheckpoint:
+        path = WebScraper.get_checkpoint_path(productName)
+        checkpoint = ScrapeCheckpoint.load(path, WebScraper.CHECKPOINT_MAX_AGE)
+        return checkpoint if checkpoint is not None else ScrapeCheckpoint(path, productName)
+
+    """
+    Returns the product names of the scrapes that were interrupted and can be continued
+    """
+    @staticmethod
+    def list_interrupted_scrapes() -> List[str]:
+        if not os.path.isdir(WebScraper.CHECKPOINT_FOLDER):
+            return []
+        productNames = []
+        for file in sorted(os.listdir(WebScraper.CHECKPOINT_FOLDER)):
+            if file.endswith(".json"):
+                checkpoint = ScrapeCheckpoint.load(os.path.join(WebScraper.CHECKPOINT_FOLDER, file), WebScraper.CHECKPOINT_MAX_AGE)
+                if checkpoint is not None:
+                    productNames.append(checkpoint.product_name)
+        return productNames
+
+    """
+    Sends a GET request to one of the scrapers endpoints ("search", "product" or "reviews"),
+    going through the schedulers work queue, that endpoints limiter and the HTTP cache.
+    The owner is who the request is for (such as the product url), owners take turns in the work queue.
+    Fresh cached responses are returned without sending a request, stale ones are
+    revalidated with If-None-Match/If-Modified-Since when the server gave an ETag/Last-Modified.
+    Failed attempts (429s, 5xx responses, network errors and timeouts) are retried by the retry policy,
+    each retry waiting its turn in the work queue again, for as long as the scrapes retry budget allows.
+    Returns the response status and body (the body is None for unsuccessful responses).
+    Urls disallowed by robots.txt are not requested and return a 403 status,
+    and requests that never received a response return NO_RESPONSE_STATUS.
+    A bodyReader can be given to read a successful responses body in place of response.text(),
+    whatever it returns is used as the body (and cached).
+    """
+    @staticmethod
+    async def fetch(
+        client: aiohttp.ClientSession, 
+        endpoint: str, 
+        url: str, 
+        headers: Dict[str, str], 
+        params: Optional[Dict[str, Any]] = None, 
+        revalidate: bool = False,
+        bodyReader: Optional[Callable[[aiohttp.ClientResponse], Awaitable[str]]] = None,
+        owner: Optional[str] = None
+    ) -> Tuple[int, Optional[str]]:
+        await WebScraper.ensure_robots_rules(client)
+        if not WebScraper.is_url_allowed(url, params):
+            print(f"Access to {url} is disallowed by robots.txt")
+            return 403, None
+
+        progress = ScrapeProgress.current()
+        cache = WebScraper.get_http_cache()
+        cached = await asyncio.to_thread(cache.get, url, params) if cache else None
+        if cached:
+            if not revalidate and cache.is_fresh(cached, WebScraper.HTTP_CACHE_TTLS.get(endpoint)):
+                if progress:
+                    progress.record_cache_hit()
+                return 200, cached.body
+            headers = dict(headers)
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        policy = WebScraper.retry_policy
+        budget = RetryBudget.current()
+        if budget:
+            budget.record_request()
+        attempt = 0
+        while True:
+            status, body, retryAfter, outcome = None, None, None, None
+            queuedAt = ScrapeTracer.now()
+            async with WebScraper.scheduler.request(endpoint, owner or url):
+                # Time spent queued for a request slot and waiting for the rate limiter
+                ScrapeTracer.record_phase("rate_limit_wait", queuedAt, f"{endpoint} wait", endpoint=endpoint)
+                requestStartedAt = ScrapeTracer.now()
+                sentAt = time.monotonic()
+                try:
+                    async with client.get(url, params=params, headers=headers, timeout=WebScraper.REQUEST_TIMEOUT) as response:
+                        status = response.status
+                        # Time until the response headers arrived, which the adaptive concurrency follows
+                        latency = time.monotonic() - sentAt
+                        if status == 304 and cached:
+                            WebScraper.scheduler.record_success(endpoint, latency)
+                            await asyncio.to_thread(cache.touch, url, params)
+                            if progress:
+                                progress.record_cache_hit()
+                            status, body = 200, cached.body
+                        elif status == 200:
+                            WebScraper.scheduler.record_success(endpoint, latency)
+                            if bodyReader:
+                                body = await bodyReader(response)
+                            else:
+                                rawBody = await response.read()
+                                if progress:
+                                    progress.record_bytes(len(rawBody))
+                                body = await response.text()
+                            if cache:
+                                await asyncio.to_thread(
+                                    cache.put, url, params, body, 
+                                    response.headers.get("ETag"), response.headers.get("Last-Modified")
+                                )
+                        elif status == 429:
+                            retryAfter = RetryPolicy.parse_retry_after(response.headers.get("Retry-After"))
+                            WebScraper.scheduler.record_rate_limited(endpoint, retryAfter)
+                except asyncio.TimeoutError:
+                    status, outcome = None, RetryPolicy.TIMEOUT
+                    print(f"Request to {url} timed out")
+                except aiohttp.ClientError as e:
+                    status, outcome = None, RetryPolicy.CONNECTION_ERROR
+                    print(f"Request to {url} failed: {e!r}")
+                ScrapeTracer.record_phase(
+                    "request", requestStartedAt, f"{endpoint} request", 
+                    endpoint=endpoint, status=status or outcome, attempt=attempt
+                )
+
+            if status == 200:
+                policy.record(RetryPolicy.RECOVERED if attempt else RetryPolicy.SUCCEEDED)
+                return 200, body
+            if outcome:
+                policy.record(outcome)
+            elif not policy.is_retryable_status(status):
+                policy.record(RetryPolicy.NOT_RETRYABLE)
+                return status, None
+
+            delay = policy.retry_delay(attempt, retryAfter)
+            if delay is None:
+                policy.record(RetryPolicy.GAVE_UP)
+            elif budget and not budget.try_spend():
+                policy.record(RetryPolicy.BUDGET_EXHAUSTED)
+                delay = None
+            if delay is None:
+                if progress:
+                    progress.record_failed_request()
+                return (status or WebScraper.NO_RESPONSE_STATUS), None
+
+            policy.record(RetryPolicy.RETRIED)
+            if progress:
+                progress.record_retry()
+            with ScrapeTracer.phase("retry_backoff", f"{endpoint} backoff", endpoint=endpoint, delay=delay):
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    """
+    Main method to search for products and collect their data.
+    It orchestrates the entire scraping process for a given product search term.
+    When PIPELINE_SEARCH is enabled, product pages start being scraped as soon as
+    the search page containing them arrives, rather than after every search page is back.
+    """
+    @staticmethod
+    async def search_for_products(productName: str, client: Optional[aiohttp.ClientSession] = None) -> Collection:
+        async with WebScraper.client_scope(client) as session:
+            # Check if all required paths are allowed by robots.txt
+            if not await WebScraper.check_paths_allowed(session, WebScraper.SCRAPE_PATHS):
+                print("One or more required paths are not allowed by robots.txt. Aborting.")
                 return None
-            
-            # From the search results construct each products page URL 
-            # and save the total number of reviews each product has
-            productData: List[Dict[str, Any]] = WebScraper.extract_product_data_from_search(
-                searchResultsData["data"]["response"]["data"]
-            )
 
             # Extract product data from each page constructed, resulting in a list of Products collected
             extractedProductData: List[Product] = []
-            semaphore = asyncio.Semaphore(WebScraper.MAX_CONCURRENT_REQUESTS)
-            tasks = [
-                WebScraper.parse_product_page(
-                    retryClient, 
-                    product["url"], 
-                    product["numOfReviews"], 
-                    f"https://www.argos.co.uk/search/{productName}/", 
-                    semaphore,
-                    product
-                ) 
-                for product in productData
-            ]
-            extractedProductData = await asyncio.gather(*tasks)
+            semaphore = asyncio.Semaphore(WebScraper.MAX_PRODUCTS_IN_FLIGHT)
+            if WebScraper.PIPELINE_SEARCH:
+                extractedProductData = await WebScraper.scrape_search_results_pipelined(
+                    session, productName, semaphore
+                )
+            else:
+                # Search for productName and gather all pages results
+                searchResultsData: Dict[str, Any] = await WebScraper.fetch_all_search_results(
+                    session, productName
+                )
+                if not searchResultsData:
+                    print("No search results found")
+                    return None
+                
+                # From the search results construct each products page URL 
+                # and save the total number of reviews each product has
+                productData: List[Dict[str, Any]] = WebScraper.extract_product_data_from_search(
+                    searchResultsData["data"]["response"]["data"]
+                )
+                progress = ScrapeProgress.current()
+                if progress:
+                    progress.record_products_discovered(len(productData))
+
+                tasks = [
+                    WebScraper.parse_product_page(
+                        session, 
+                        product["url"], 
+                        product["numOfReviews"], 
+                        f"https://www.argos.co.uk/search/{productName}/", 
+                        semaphore,
+                        product
+                    ) 
+                    for product in productData
+                ]
+                extractedProductData = await asyncio.gather(*tasks)
             extractedProductData: List[Product] = [product for product in extractedProductData if product]
             
             if not extractedProductData:
@@ -226,40 +550,341 @@ class WebScraper:
             print(f"Successfully retrieved data for {len(extractedProductData)} products")
             return Collection(productName, extractedProductData)
 
+    """
+    Searches for a product name and yields each product as soon as it has been scraped
+    (in the order they finish rather than search result order), so that they can be saved
+    as the scrape goes instead of all being held until the end.
+    Only the products being scraped are held in memory, making it suitable for scraping
+    more products (maxProducts, MAX_NUMBER_OF_PRODUCTS by default) than a collection normally holds.
+    Stopping iteration early (and closing the generator) cancels the rest of the scrape.
+    When the scrape has a current ScrapeCheckpoint, the search pages, descriptions and review pages
+    it already holds are not fetched again and its completed products are skipped (not yielded),
+    the caller records each yielded product as completed once it has saved it.
+    """
+    @staticmethod
+    async def stream_products(
+        productName: str, 
+        client: Optional[aiohttp.ClientSession] = None,
+        maxProducts: Optional[int] = None
+    ) -> AsyncIterator[Product]:
+        async with WebScraper.client_scope(client, trackRetryBudget=False) as session:
+            if not await WebScraper.check_paths_allowed(session, WebScraper.SCRAPE_PATHS):
+                print("One or more required paths are not allowed by robots.txt. Aborting.")
+                return
+
+            semaphore = asyncio.Semaphore(WebScraper.MAX_PRODUCTS_IN_FLIGHT)
+            # Search and product tasks are put here once they are done
+            finishedTasks: asyncio.Queue = asyncio.Queue()
+            productTasks: Set[asyncio.Task] = set()
+            seenProductIds: Set[str] = set()
+
+            checkpoint = ScrapeCheckpoint.current()
+
+            async def discover_products() -> None:
+                # The budget is set within the search task, the product tasks it creates inherit it
+                with WebScraper.retry_budget_scope():
+                    await discover_products_within_budget()
+
+            async def discover_products_within_budget() -> None:
+                async for _, pageResults in WebScraper.stream_search_results(session, productName, maxProducts):
+                    newProducts = [
+                        product for product in WebScraper.extract_product_data_from_search(pageResults) 
+                        if product["id"] not in seenProductIds 
+                        and not (checkpoint and checkpoint.is_product_completed(product["id"]))
+                    ]
+                    progress = ScrapeProgress.current()
+                    if progress:
+                        progress.record_products_discovered(len(newProducts))
+                    for product in newProducts:
+                        seenProductIds.add(product["id"])
+                        task = asyncio.create_task(WebScraper.parse_product_page(
+                            session, 
+                            product["url"], 
+                            product["numOfReviews"], 
+                            f"https://www.argos.co.uk/search/{productName}/", 
+                            semaphore,
+                            product
+                        ))
+                        task.add_done_callback(finishedTasks.put_nowait)
+                        productTasks.add(task)
+
+            searchTask = asyncio.create_task(discover_products())
+            searchTask.add_done_callback(finishedTasks.put_nowait)
+            searching = True
+            try:
+                while searching or productTasks:
+                    task = await finishedTasks.get()
+                    if task is searchTask:
+                        searching = False
+                        task.result()
+                        continue
+                    productTasks.discard(task)
+                    product = task.result()
+                    if product:
+                        yield product
+            finally:
+                for task in [searchTask, *productTasks]:
+                    task.cancel()
+            if not seenProductIds:
+                print("No search results found")
+
+    """
+    Starts a parse_product_page task for every product as soon as the search page
+    listing it arrives, so product scraping overlaps with the remaining search pages.
+    The products are returned in the same order as the search results.
+    When tasks by product id are given (shared between the searches of a batch), a product that
+    already has a task is not scraped again, its existing task is used instead. taskUsers counts
+    the searches using each task, a search that fails or is cancelled only cancels the tasks
+    no other search is using.
+    """
+    @staticmethod
+    async def scrape_search_results_pipelined(
+        session: aiohttp.ClientSession, 
+        productName: str, 
+        semaphore: asyncio.Semaphore,
+        tasksByProductId: Optional[Dict[str, asyncio.Task]] = None,
+        taskUsers: Optional[Dict[str, int]] = None
+    ) -> List[Product]:
+        tasksByProductId = {} if tasksByProductId is None else tasksByProductId
+        taskUsers = {} if taskUsers is None else taskUsers
+        productTasks: Dict[Tuple[int, int], asyncio.Task] = {}
+        usedProductIds: Set[str] = set()
+        try:
+            async for page, pageResults in WebScraper.stream_search_results(session, productName):
+                pageProductData = WebScraper.extract_product_data_from_search(pageResults)
+                newProducts = [product for product in pageProductData if product["id"] not in tasksByProductId]
+                progress = ScrapeProgress.current()
+                if progress:
+                    progress.record_products_discovered(len(newProducts))
+                for product in newProducts:
+                    task = asyncio.create_task(WebScraper.parse_product_page(
+                        session, 
+                        product["url"], 
+                        product["numOfReviews"], 
+                        f"https://www.argos.co.uk/search/{productName}/", 
+                        semaphore,
+                        product
+                    ))
+                    tasksByProductId[product["id"]] = task
+                for index, product in enumerate(pageProductData):
+                    productTasks[(page, index)] = tasksByProductId[product["id"]]
+                    if product["id"] not in usedProductIds:
+                        usedProductIds.add(product["id"])
+                        taskUsers[product["id"]] = taskUsers.get(product["id"], 0) + 1
+
+            if not productTasks:
+                print("No search results found")
+                return []
+            # Shielded, so that this search stopping does not cancel the tasks other searches are waiting on
+            return await asyncio.gather(*(asyncio.shield(productTasks[key]) for key in sorted(productTasks)))
+        except BaseException:
+            for productId in usedProductIds:
+                taskUsers[productId] -= 1
+                if taskUsers[productId] == 0:
+                    # Forgotten as well, so a search that lists the product later starts a new task
+                    del taskUsers[productId]
+                    tasksByProductId.pop(productId).cancel()
+            raise
+
+    """
+    Searches for several product names in one go, returning a collection for each name
+    (None for names with no products found, or whose search failed). Products listed by more than one search are
+    only scraped once, every collection they are in gets a copy of their description and reviews.
+    The searches always use the pipelined scrape.
+    """
+    @staticmethod
+    async def search_for_products_batch(
+        productNames: List[str], 
+        client: Optional[aiohttp.ClientSession] = None
+    ) -> Dict[str, Optional[Collection]]:
+        # Search terms differing only in case or surrounding spaces are the same search
+        uniqueNames: Dict[str, str] = {}
+        for productName in productNames:
+            if productName.strip():
+                uniqueNames.setdefault(productName.strip().lower(), productName.strip())
+
+        async with WebScraper.client_scope(client) as session:
+            if not await WebScraper.check_paths_allowed(session, WebScraper.SCRAPE_PATHS):
+                print("One or more required paths are not allowed by robots.txt. Aborting.")
+                return {productName: None for productName in uniqueNames.values()}
+
+            semaphore = asyncio.Semaphore(WebScraper.MAX_PRODUCTS_IN_FLIGHT)
+            tasksByProductId: Dict[str, asyncio.Task] = {}
+            taskUsers: Dict[str, int] = {}
+            # A search that fails does not stop the others, it is left without a collection
+            results = await asyncio.gather(*(
+                WebScraper.scrape_search_results_pipelined(session, productName, semaphore, tasksByProductId, taskUsers)
+                for productName in uniqueNames.values()
+            ), return_exceptions=True)
+            print(f"Scraped {len(tasksByProductId)} unique products for {len(uniqueNames)} searches")
+
+            collections: Dict[str, Optional[Collection]] = {}
+            for productName, products in zip(uniqueNames.values(), results):
+                if isinstance(products, BaseException):
+                    print(f"Search for {productName} failed: {products!r}")
+                    collections[productName] = None
+                    continue
+                # Each collection gets its own copy of the products it shares with the others
+                products = [product.copy() for product in products if product]
+                collections[productName] = Collection(productName, products) if products else None
+            return collections
+
+    """
+    Searches for a product name, only fetching the search pages, and returns the search data of each
+    product found (its id, url, name, price, rating and number of reviews) in search result order.
+    This is enough to create a metadata only collection within seconds, see create_metadata_product.
+    """
+    @staticmethod
+    async def search_for_product_metadata(
+        productName: str, 
+        client: Optional[aiohttp.ClientSession] = None
+    ) -> List[Dict[str, Any]]:
+        async with WebScraper.client_scope(client) as session:
+            if not await WebScraper.check_paths_allowed(session, WebScraper.SCRAPE_PATHS):
+                print("One or more required paths are not allowed by robots.txt. Aborting.")
+                return []
+            pages: Dict[int, List[Dict[str, Any]]] = {}
+            async for page, pageResults in WebScraper.stream_search_results(session, productName):
+                pages[page] = WebScraper.extract_product_data_from_search(pageResults)
+            productData: Dict[str, Dict[str, Any]] = {}
+            for page in sorted(pages):
+                for product in pages[page]:
+                    productData.setdefault(product["id"], product)
+            return list(productData.values())
+
+    """
+    Creates a product from its search data alone. Its description is PENDING_DESCRIPTION
+    and it has no reviews until it is hydrated, unless the product store already holds it
+    """
+    @staticmethod
+    async def create_metadata_product(productData: Dict[str, Any]) -> Product:
+        storedProduct = await WebScraper.get_stored_product(productData['id'])
+        if storedProduct and len(storedProduct.product.reviews) >= min(WebScraper.MAX_NUMBER_OF_REVIEWS, productData['numOfReviews']):
+            description, reviews = storedProduct.product.description, storedProduct.product.reviews
+        else:
+            description, reviews = WebScraper.PENDING_DESCRIPTION, []
+        return Product(
+            productData['id'], 
+            productData['name'], 
+            productData['price'], 
+            productData['url'], 
+            productData['rating'], 
+            description, 
+            reviews
+        )
+
+    """
+    Whether a products description and reviews have been scraped, rather than it only holding its search data
+    """
+    @staticmethod
+    def is_hydrated(product: Product) -> bool:
+        return product.description != WebScraper.PENDING_DESCRIPTION
+
+    """
+    Scrapes the description and reviews of a metadata only product, updating the product in place.
+    Without its number of reviews (known from the search data), up to MAX_NUMBER_OF_REVIEWS are requested.
+    The search term the product was found by (such as its collections name) is used as the referer when known.
+    Products that are already hydrated are returned as they are.
+    """
+    @staticmethod
+    async def hydrate_product(
+        product: Product, 
+        client: Optional[aiohttp.ClientSession] = None, 
+        numOfReviews: Optional[int] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        searchTerm: Optional[str] = None
+    ) -> Product:
+        if WebScraper.is_hydrated(product):
+            return product
+        async with WebScraper.client_scope(client) as session:
+            scrapedProduct = await WebScraper.parse_product_page(
+                session,
+                product.url,
+                WebScraper.MAX_NUMBER_OF_REVIEWS if numOfReviews is None else numOfReviews,
+                f"https://www.argos.co.uk/search/{searchTerm}/" if searchTerm else "https://www.argos.co.uk/",
+                semaphore or asyncio.Semaphore(1),
+                {"id": product.productID, "name": product.name, "price": product.price, "rating": product.rating}
+            )
+        product.description = scrapedProduct.description
+        product.reviews = scrapedProduct.reviews
+        return product
+
+    """
+    Hydrates every metadata only product of a collection, at most MAX_PRODUCTS_IN_FLIGHT at once.
+    The number of reviews of each product can be given by product id (from the search data).
+    Returns the number of products that were hydrated.
+    """
+    @staticmethod
+    async def hydrate_collection(
+        collection: Collection, 
+        client: Optional[aiohttp.ClientSession] = None, 
+        reviewCounts: Optional[Dict[str, int]] = None
+    ) -> int:
+        pendingProducts = [product for product in collection.products if not WebScraper.is_hydrated(product)]
+        if not pendingProducts:
+            return 0
+        progress = ScrapeProgress.current()
+        if progress:
+            progress.record_products_discovered(len(pendingProducts))
+        reviewCounts = reviewCounts or {}
+        async with WebScraper.client_scope(client) as session:
+            semaphore = asyncio.Semaphore(WebScraper.MAX_PRODUCTS_IN_FLIGHT)
+            await asyncio.gather(*(
+                WebScraper.hydrate_product(product, session, reviewCounts.get(product.productID), semaphore, collection.name)
+                for product in pendingProducts
+            ))
+        return len(pendingProducts)
+
+    """
+    Retrieves a single page of search results for a given product name.
+    Returns the products listed on that page and the total number of pages,
+    or (None, None) if the page could not be retrieved.
+    """
+    @staticmethod
+    async def fetch_search_page(
+        session: aiohttp.ClientSession, 
+        productName: str, 
+        page: int
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        base_url = f"{WebScraper.BASE_URL}/finder-api/product"
+        url = f"{base_url};isSearch=true;searchTerm={productName};queryParams={{\"page\":\"{page}\"}};payloadPath=/search/{productName}?returnMeta=true"
+        headers = WebScraper.get_headers()
+        
+        checkpoint = ScrapeCheckpoint.current()
+        if checkpoint and checkpoint.is_for(productName):
+            results, totalPages = checkpoint.get_search_page(page)
+            if results is not None:
+                return results, totalPages
+        
+        with ScrapeTracer.phase("search_page", f"search page {page}", page=page):
+            status, body = await WebScraper.fetch(session, "search", url, headers, owner=f"search:{productName}")
+        if status == 200:
+            data = json.loads(body)
+            results, totalPages = data["data"]["response"]["data"], data["data"]["response"]["meta"]["totalPages"]
+            if checkpoint and checkpoint.is_for(productName):
+                checkpoint.record_search_page(page, results, totalPages)
+            return results, totalPages
+        elif status == 429:
+            print(f"Rate limited while retrieving search results for page {page}")
+            return None, None
+        else:
+            print(f"Failed to retrieve search results for page {page}. Status: {status}")
+            return None, None
+
     """
     Retrieves all search result pages for a given product name.
     """
     @staticmethod
     async def fetch_all_search_results(
-        retryClient: RetryClient, 
+        session: aiohttp.ClientSession, 
         productName : str
     ) -> Dict[str, Any]:
-        base_url = f"{WebScraper.BASE_URL}/finder-api/product"
         all_results = []
         current_page = 1
         total_pages = 1
 
-        async def fetch_page(page):
-            url = f"{base_url};isSearch=true;searchTerm={productName};queryParams={{\"page\":\"{page}\"}};payloadPath=/search/{productName}?returnMeta=true"
-            headers = WebScraper.get_headers()
-            
-            await WebScraper.rate_limiter.wait()
-            
-            async with retryClient.get(url, headers=headers) as response:
-                if response.status == 200:
-                    WebScraper.rate_limiter.increase_rate()
-                    data = await response.json()
-                    return data["data"]["response"]["data"], data["data"]["response"]["meta"]["totalPages"]
-                elif response.status == 429:
-                    WebScraper.rate_limiter.decrease_rate()
-                    await WebScraper.exponential_backoff(page)
-                    return None, None
-                else:
-                    print(f"Failed to retrieve search results for page {page}. Status: {response.status}")
-                    return None, None
-
         while current_page <= min(total_pages, math.ceil(WebScraper.MAX_NUMBER_OF_PRODUCTS / 60)):
-            results, pages = await fetch_page(current_page)
+            results, pages = await WebScraper.fetch_search_page(session, productName, current_page)
             if results:
                 all_results.extend(results)
                 total_pages = pages
@@ -269,6 +894,48 @@ class WebScraper:
 
         return {"data": {"response": {"meta": {"totalData": WebScraper.MAX_NUMBER_OF_PRODUCTS}, "data": all_results[:WebScraper.MAX_NUMBER_OF_PRODUCTS]}}}
 
+    """
+    Yields (page number, products on that page) for a given product name as each page arrives.
+    The first page is fetched on its own to learn the total number of pages,
+    after which all remaining pages are fetched concurrently.
+    Products beyond maxProducts (MAX_NUMBER_OF_PRODUCTS by default, in search result order) are dropped.
+    """
+    @staticmethod
+    async def stream_search_results(
+        session: aiohttp.ClientSession, 
+        productName: str,
+        maxProducts: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        maxProducts = WebScraper.MAX_NUMBER_OF_PRODUCTS if maxProducts is None else maxProducts
+        firstPageResults, totalPages = await WebScraper.fetch_search_page(session, productName, 1)
+        if not firstPageResults:
+            return
+        pageSize = len(firstPageResults)
+        yield 1, firstPageResults[:maxProducts]
+
+        lastPage = min(totalPages, math.ceil(maxProducts / pageSize))
+
+        async def fetch_numbered_page(page):
+            results, _ = await WebScraper.fetch_search_page(session, productName, page)
+            return page, results
+
+        pageTasks = [
+            asyncio.create_task(fetch_numbered_page(page)) 
+            for page in range(2, lastPage + 1)
+        ]
+        try:
+            for completedTask in asyncio.as_completed(pageTasks):
+                page, results = await completedTask
+                if not results:
+                    continue
+                # Number of products that still fit within maxProducts before this page
+                remaining = maxProducts - (page - 1) * pageSize
+                if remaining > 0:
+                    yield page, results[:remaining]
+        finally:
+            for task in pageTasks:
+                task.cancel()
+
     """
     Extracts relevant product data from the search results.
     """
@@ -287,72 +954,221 @@ class WebScraper:
 
     """
     Extracts detailed information from a single product page.
+    A product recently scraped (and kept in the product store) is not scraped again,
+    its stored description and reviews are used, only fetching any reviews it is missing.
     """
     @staticmethod
     async def parse_product_page(
-        client: RetryClient, 
+        client: aiohttp.ClientSession, 
         productUrl: str, 
         numOfReviews : int, 
         referer : str, 
         semaphore: asyncio.Semaphore,
         productData: Dict[str, Any]
     ) -> Product:
-        async with semaphore:
-            await WebScraper.rate_limiter.wait()
-            # Extract the description from the HTML content
-            description = await WebScraper.fetch_description(client, productUrl, referer)
-            
-            # Retrieve all the reviews for the product
-            allReviews: List[str] = await WebScraper.get_reviews(
-                client, productData['id'], productUrl, min(WebScraper.MAX_NUMBER_OF_REVIEWS, numOfReviews)
-            )
+        startedAt = ScrapeTracer.now()
+        numOfReviews = min(WebScraper.MAX_NUMBER_OF_REVIEWS, numOfReviews)
+        storedProduct = await WebScraper.get_stored_product(productData['id'])
+        progress = ScrapeProgress.current()
 
+        if storedProduct and len(storedProduct.product.reviews) >= numOfReviews:
+            description, allReviews = storedProduct.product.description, storedProduct.product.reviews[:numOfReviews]
+            print(f"Using stored data for product {productData['id']}")
+        else:
+            async with semaphore:
+                if storedProduct:
+                    # The product has new reviews (or some failed to be retrieved last time)
+                    description = storedProduct.product.description
+                    newReviews = await WebScraper.get_new_reviews(
+                        client, productData['id'], productUrl, storedProduct.product.reviews, numOfReviews
+                    )
+                    allReviews = (newReviews + storedProduct.product.reviews)[:numOfReviews]
+                    if len(allReviews) < numOfReviews:
+                        # Older reviews are missing rather than only newer ones, so every review is retrieved again
+                        backfilledReviews = await WebScraper.get_reviews(client, productData['id'], productUrl, numOfReviews)
+                        if len(backfilledReviews) > len(allReviews):
+                            allReviews = backfilledReviews
+                else:
+                    # Extract the description from the HTML content
+                    checkpoint = ScrapeCheckpoint.current()
+                    description = checkpoint.get_description(productData['id']) if checkpoint else None
+                    if description is None:
+                        description = await WebScraper.fetch_description(client, productUrl, referer)
+                        if checkpoint and not description.startswith("Description not found"):
+                            checkpoint.record_description(productData['id'], description)
+                    
+                    # Retrieve all the reviews for the product
+                    allReviews: List[str] = await WebScraper.get_reviews(
+                        client, productData['id'], productUrl, numOfReviews
+                    )
             print(f"Successfully retrieved data for product {productData['id']}")
-            return Product(
-                productData['id'], 
-                productData['name'], 
-                productData['price'], 
-                productUrl, 
-                productData['rating'], 
-                description, 
-                allReviews
-            )
+
+        product = Product(
+            productData['id'], 
+            productData['name'], 
+            productData['price'], 
+            productUrl, 
+            productData['rating'], 
+            description, 
+            allReviews
+        )
+        if storedProduct is None:
+            await WebScraper.store_product(product)
+        elif allReviews != storedProduct.product.reviews:
+            # The description was not scraped again, so the product keeps its original scrape time
+            await WebScraper.store_product(product, storedProduct.scraped_at)
+        if progress:
+            progress.record_product_scraped()
+            if storedProduct:
+                progress.record_product_from_store()
+        ScrapeTracer.record_phase("product", startedAt, f"product {productData['id']}", stored=storedProduct is not None)
+        return product
     
     """
     Retrieves and extracts the product description from the product page.
     """
     @staticmethod
-    async def fetch_description(client: RetryClient, url: str, referer: str) -> str:
+    async def fetch_description(client: aiohttp.ClientSession, url: str, referer: str) -> str:
         headers = WebScraper.get_headers()
         headers["Referer"] = referer
         
-        await WebScraper.rate_limiter.wait()
-        
-        async with client.get(url, headers=headers) as response:
-            if response.status == 200:
-                WebScraper.rate_limiter.increase_rate()
-                html_content = await response.text()
-                soup = BeautifulSoup(html_content, 'html.parser')
-                description_element = soup.select_one('div.product-description-content-text')
-                return description_element.get_text(strip=True) if description_element else "Description not found"
-            elif response.status == 429:
-                WebScraper.rate_limiter.decrease_rate()
-                await WebScraper.exponential_backoff(1)
-                return "Description not found (Rate limited)"
+        # Each attempt streams into a parser of its own, the body read whole is kept along with its parser
+        # so that a parser left part way through a failed attempt is never used
+        streamedBody : Optional[Tuple[str, DescriptionStreamParser]] = None
+
+        async def readDescription(response: aiohttp.ClientResponse) -> str:
+            nonlocal streamedBody
+            streamParser = DescriptionStreamParser()
+            body = await WebScraper.read_until_description(response, streamParser)
+            streamedBody = (body, streamParser)
+            return body
+
+        with ScrapeTracer.phase("description", url=url):
+            status, html_content = await WebScraper.fetch(
+                client, "product", url, headers, 
+                bodyReader=readDescription if WebScraper.STREAM_DESCRIPTIONS else None,
+                owner=url
+            )
+        if status == 200:
+            progress = ScrapeProgress.current()
+            if progress:
+                progress.record_description()
+            if streamedBody and streamedBody[0] is html_content and streamedBody[1].complete:
+                description = streamedBody[1].description
+            else:
+                # The page came from the cache, or the description was not found while streaming
+                description = await WebScraper.parse_description_off_loop(html_content)
+            return description if description is not None else "Description not found"
+        elif status == 429:
+            return "Description not found (Rate limited)"
+        else:
+            print(f"Failed to retrieve HTML content. Status: {status}")
+            return "Description not found"
+
+    """
+    Reads a product pages body a chunk at a time, feeding each chunk to the stream parser.
+    As soon as the description element is complete the connection is closed rather than
+    downloading the rest of the page. Returns the part of the page that was read.
+    """
+    @staticmethod
+    async def read_until_description(response: aiohttp.ClientResponse, streamParser: DescriptionStreamParser) -> str:
+        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+        progress = ScrapeProgress.current()
+        chunks: List[str] = []
+        async for chunk in response.content.iter_chunked(WebScraper.STREAM_CHUNK_SIZE):
+            if progress:
+                progress.record_bytes(len(chunk))
+            text = decoder.decode(chunk)
+            chunks.append(text)
+            streamParser.feed_text(text)
+            if streamParser.complete:
+                if not response.content.at_eof():
+                    response.close()
+                break
+        else:
+            chunks.append(decoder.decode(b"", final=True))
+        return "".join(chunks)
+
+    """
+    Returns the pool that product pages are parsed on, creating it on first use
+    """
+    @staticmethod
+    def get_parser_executor() -> concurrent.futures.Executor:
+        if WebScraper.parser_executor is None:
+            if WebScraper.PARSER_EXECUTOR == "process":
+                WebScraper.parser_executor = concurrent.futures.ProcessPoolExecutor(max_workers=WebScraper.PARSER_WORKERS)
+            elif WebScraper.PARSER_EXECUTOR == "thread":
+                WebScraper.parser_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=WebScraper.PARSER_WORKERS, thread_name_prefix="description-parser"
+                )
             else:
-                print(f"Failed to retrieve HTML content. Status: {response.status}")
-                return "Description not found"
+                raise ValueError(f"Unknown parser executor: {WebScraper.PARSER_EXECUTOR}")
+        return WebScraper.parser_executor
+
+    """
+    Extracts the description from a product pages HTML on the parser pool,
+    so that parsing a large page does not block other in-flight requests
+    """
+    @staticmethod
+    async def parse_description_off_loop(html_content: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        with ScrapeTracer.phase("parse", "parse description"):
+            return await loop.run_in_executor(
+                WebScraper.get_parser_executor(), 
+                parse_description, 
+                resolve_parser_name(WebScraper.DESCRIPTION_PARSER), 
+                html_content
+            )
 
     """
     Retrieves the reviews for a product by sending a GET requests 
     with parameters for how many reviews to get and the offset from the first review
     You can only retrieve a maximum of 100 reviews at a time.
+    Every page is requested at once, they wait their turn in the schedulers work queue
+    alongside the requests of the other products. Pages held by the current checkpoint are not requested again.
     """
     @staticmethod
-    async def get_reviews(client: RetryClient, productId : str, productUrl: str, numOfReviews : int = 10) -> List[str]:
+    async def get_reviews(client: aiohttp.ClientSession, productId : str, productUrl: str, numOfReviews : int = 10) -> List[str]:
         if numOfReviews < 1:
             return []
 
+        checkpoint = ScrapeCheckpoint.current()
+
+        async def fetch_page(offset: int, limit: int) -> List[str]:
+            reviews = checkpoint.get_review_page(productId, offset) if checkpoint else None
+            if reviews is None:
+                reviews = await WebScraper.fetch_reviews_page(client, productId, productUrl, offset, limit)
+                if checkpoint and reviews:
+                    checkpoint.record_review_page(productId, offset, reviews)
+            return reviews
+
+        allReviews : List[str] = []
+        tasks = []
+        for i in range(0, numOfReviews, 100):
+            tasks.append(fetch_page(i, min(100, numOfReviews - i)))
+
+        results = await asyncio.gather(*tasks)
+        for result in results:
+            allReviews.extend(result)
+            if len(allReviews) >= numOfReviews:
+                break
+
+        return allReviews[:numOfReviews]
+
+    """
+    Retrieves a single page of reviews (newest first) for a product, 
+    starting at the given offset from the newest review.
+    When revalidate is True a cached page is always checked with the server before being used.
+    """
+    @staticmethod
+    async def fetch_reviews_page(
+        client: aiohttp.ClientSession, 
+        productId : str, 
+        productUrl: str, 
+        offset : int, 
+        limit : int, 
+        revalidate : bool = False
+    ) -> List[str]:
         apiUrl : str = f"{WebScraper.BASE_URL}/product-api/bazaar-voice-reviews/partNumber/{productId}"
         headers : Dict[str, str] = WebScraper.get_headers()
         headers.update({
@@ -364,45 +1180,104 @@ class WebScraper:
             "Sec-Fetch-Site": "same-origin",
             "x-newrelic-id": "VQEPU15SARAGV1hVDgMBUVY="
         })
+        params = {
+            "Limit": limit,
+            "Offset": offset,
+            "Sort": "SubmissionTime:Desc",
+            "returnMeta": "true"
+        }
         
-        allReviews : List[str] = []
-        offset : int = 0
-        
-        async def fetch_reviews(offset):
-            params = {
-                "Limit": min(100, numOfReviews - offset),
-                "Offset": offset,
-                "Sort": "SubmissionTime:Desc",
-                "returnMeta": "true"
-            }
-            
-            await WebScraper.rate_limiter.wait()
-            
-            async with client.get(apiUrl, params=params, headers=headers) as response:
-                if response.status == 200:
-                    WebScraper.rate_limiter.increase_rate()
-                    try:
-                        reviewsResponse = await response.json()
-                        return [review["ReviewText"] for review in reviewsResponse["data"]["Results"]]
-                    except aiohttp.ContentTypeError:
-                        print(f"Unexpected content type: {response.headers.get('Content-Type')}")
-                        return []
-                elif response.status == 429:
-                    WebScraper.rate_limiter.decrease_rate()
-                    await WebScraper.exponential_backoff(1)
-                    return []
-                else:
-                    print(f"Failed to retrieve reviews. Status: {response.status}")
-                    return []
-
-        tasks = []
-        for i in range(0, numOfReviews, 100):
-            tasks.append(fetch_reviews(i))
+        with ScrapeTracer.phase("reviews", f"reviews {productId} offset {offset}", offset=offset, limit=limit):
+            status, body = await WebScraper.fetch(client, "reviews", apiUrl, headers, params, revalidate, owner=productUrl)
+        if status == 200:
+            progress = ScrapeProgress.current()
+            if progress:
+                progress.record_review_page()
+            try:
+                reviewsResponse = json.loads(body)
+                return [review["ReviewText"] for review in reviewsResponse["data"]["Results"]]
+            except ValueError:
+                print(f"Unexpected reviews response content for product {productId}")
+                return []
+        elif status == 429:
+            return []
+        else:
+            print(f"Failed to retrieve reviews. Status: {status}")
+            return []
 
-        results = await asyncio.gather(*tasks)
-        for result in results:
-            allReviews.extend(result)
-            if len(allReviews) >= numOfReviews:
+    """
+    Retrieves only the reviews that are newer than the reviews already stored for a product.
+    Reviews are requested newest first one page at a time, stopping once the newest stored review
+    is found followed by the next stored reviews (up to REVIEW_MATCH_LENGTH in all), so a new review
+    with the same text as an older one is not mistaken for it. Stored products only keep the review
+    text, so the stored review texts are used to recognise where the new reviews end.
+    """
+    @staticmethod
+    async def get_new_reviews(
+        client: aiohttp.ClientSession, 
+        productId : str, 
+        productUrl: str, 
+        storedReviews : List[str], 
+        numOfReviews : int
+    ) -> List[str]:
+        newestStoredReviews = storedReviews[:WebScraper.REVIEW_MATCH_LENGTH]
+        newReviews : List[str] = []
+        for offset in range(0, numOfReviews, WebScraper.REVIEW_REFRESH_PAGE_SIZE):
+            limit = min(WebScraper.REVIEW_REFRESH_PAGE_SIZE, numOfReviews - offset)
+            # Always check with the server, a cached page would hide any new reviews
+            page = await WebScraper.fetch_reviews_page(client, productId, productUrl, offset, limit, revalidate=True)
+            newReviews.extend(page)
+            lastPage = len(page) < limit or offset + limit >= numOfReviews
+            storedStart = WebScraper.find_stored_reviews(newReviews, newestStoredReviews, lastPage)
+            if storedStart is not None:
+                return newReviews[:storedStart]
+            if lastPage:
                 break
+        return newReviews
 
-        return allReviews[:numOfReviews]
+    """
+    Returns the index within reviews that the newest stored reviews start at, or None if they are not found.
+    The newest stored reviews may be cut short by the end of reviews, which is only accepted
+    once there are no more reviews to fetch (lastPage), otherwise the next page is needed to be sure.
+    """
+    @staticmethod
+    def find_stored_reviews(reviews: List[str], newestStoredReviews: List[str], lastPage: bool) -> Optional[int]:
+        if not newestStoredReviews:
+            return None
+        for index, review in enumerate(reviews):
+            if review != newestStoredReviews[0]:
+                continue
+            following = reviews[index:index + len(newestStoredReviews)]
+            if following == newestStoredReviews:
+                return index
+            if len(following) < len(newestStoredReviews) and following == newestStoredReviews[:len(following)]:
+                return index if lastPage else None
+        return None
+
+    """
+    Incrementally refreshes the reviews of every product within an existing collection,
+    fetching only the reviews added since the collection was scraped and merging them in
+    (newest first, keeping at most MAX_NUMBER_OF_REVIEWS per product).
+    Returns the number of new reviews that were found.
+    """
+    @staticmethod
+    async def refresh_collection_reviews(collection: Collection, client: Optional[aiohttp.ClientSession] = None) -> int:
+        async with WebScraper.client_scope(client) as session:
+            if not await WebScraper.check_paths_allowed(session, ["/product-api/bazaar-voice-reviews/partNumber/"]):
+                print("Reviews path is not allowed by robots.txt. Aborting.")
+                return 0
+
+            semaphore = asyncio.Semaphore(WebScraper.MAX_PRODUCTS_IN_FLIGHT)
+
+            async def refresh_product(product: Product) -> int:
+                async with semaphore:
+                    newReviews = await WebScraper.get_new_reviews(
+                        session, product.productID, product.url, product.reviews, WebScraper.MAX_NUMBER_OF_REVIEWS
+                    )
+                if newReviews:
+                    product.reviews = (newReviews + product.reviews)[:WebScraper.MAX_NUMBER_OF_REVIEWS]
+                return len(newReviews)
+
+            newReviewCounts = await asyncio.gather(*(refresh_product(product) for product in collection.products))
+            print(f"Found {sum(newReviewCounts)} new reviews for collection {collection.name}")
+            return sum(newReviewCounts)
@@ -0,0 +1,72 @@
+import os
+import json
+import html
+from typing import List, Dict, Any
+
+"""
+Builds Argos-like responses from the data saved within ArgosDataDumps,
+so that the scraper can be benchmarked and tested without sending requests to Argos.
+"""
+
+DUMPS_FOLDER : str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "ArgosDataDumps")
+
+def load_dump(fileName : str) -> Dict[str, Any]:
+    with open(os.path.join(DUMPS_FOLDER, fileName), "r") as file:
+        return json.load(file)
+
+"""
+Returns the products saved from an Argos search results page,
+in the same format as the finder-api returns them
+"""
+def load_search_products() -> List[Dict[str, Any]]:
+    return load_dump("SearchResultsData.json")["redux"]["product"]["products"]
+
+"""
+Returns the saved page state of an Argos product page
+"""
+def load_product_state() -> Dict[str, Any]:
+    return load_dump("productDataDump.json")
+
+"""
+Builds the HTML of a product page for a given search result product.
+The page mirrors the layout of an Argos product page: a large head, navigation,
+the inlined page state script, the description section part way down the page
+and then the reviews and footer sections.
+"""
+def build_product_page(product : Dict[str, Any], productState : Dict[str, Any]) -> str:
+    attributes = product["attributes"]
+    state = json.loads(json.dumps(productState))
+    state["productStore"]["data"]["productId"] = product["id"]
+    state["productStore"]["data"]["productName"] = attributes["name"]
+    description = state["productStore"]["data"]["attributes"]["description"]
+
+    head = "".join(
+        f'<link rel="preload" href="/assets/chunk-{i}.js" as="script"><meta name="meta-{i}" content="{i}">'
+        for i in range(150)
+    )
+    navigation = "".join(
+        f'<li class="nav-item"><a href="/browse/category-{i}/" class="nav-link"><span>Category {i}</span></a></li>'
+        for i in range(400)
+    )
+    footer = "".join(
+        f'<div class="footer-column"><a href="/help/topic-{i}/">Help topic {i}</a><p>{"Footer text. " * 5}</p></div>'
+        for i in range(200)
+    )
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><title>{html.escape(attributes["name"])} | Argos</title>{head}</head>'
+        f'<body><header><nav><ul class="nav-list">{navigation}</ul></nav></header>'
+        f'<script>window.App={json.dumps(state)};</script>'
+        f'<main><h1 class="product-name">{html.escape(attributes["name"])}</h1>'
+        f'<section class="product-description">'
+        f'<div class="product-description-content-text" itemprop="description">{description}</div>'
+        f'</section>'
+        f'<section class="product-reviews"><div class="reviews-placeholder"></div></section></main>'
+        f'<footer>{footer}</footer></body></html>'
+    )
+
+"""
+Builds the product page of every product saved from the search results page
+"""
+def build_product_pages() -> Dict[str, str]:
+    productState = load_product_state()
+    return {product["id"]: build_product_page(product, productState) for product in load_search_products()}
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import random
+import re
+import urllib.parse
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+from src.benchmarks.argos_fixtures import load_dump, load_search_products, load_product_state, build_product_page
+
+"""
+A local stand-in for the Argos endpoints the WebScraper uses (search, product pages,
+bazaar-voice reviews and robots.txt), serving responses built from ArgosDataDumps.
+Every response can be delayed by a fixed latency plus random jitter, and a fraction of
+responses can be replaced with 429 (with a Retry-After header) or 5xx errors,
+so the scraper can be measured offline under realistic conditions.
+Every search term lists all of the products, unless searchResults maps the term
+to the indexes of the products it should list.
+
+Usage:
+    async with ArgosStandInServer(latency=0.05, rateLimitRate=0.02) as server:
+        WebScraper.BASE_URL = server.url
+"""
+class ArgosStandInServer:
+    SEARCH_PAGE_SIZE : int = 60
+    SEARCH_PAGE_PATTERN : re.Pattern = re.compile(r'"page"\s*:\s*"(\d+)"')
+    SEARCH_TERM_PATTERN : re.Pattern = re.compile(r'searchTerm=([^;]*)')
+
+    def __init__(
+        self,
+        totalProducts : int = 150,
+        reviewsPerProduct : int = 200,
+        latency : float = 0.0,
+        jitter : float = 0.0,
+        rateLimitRate : float = 0.0,
+        serverErrorRate : float = 0.0,
+        retryAfter : int = 1,
+        searchResults : Optional[Dict[str, List[int]]] = None,
+        host : str = "127.0.0.1",
+        port : int = 0,
+        seed : Optional[int] = None
+    ) -> None:
+        self.total_products : int = totalProducts
+        self.reviews_per_product : int = reviewsPerProduct
+        self.latency : float = latency
+        self.jitter : float = jitter
+        self.rate_limit_rate : float = rateLimitRate
+        self.server_error_rate : float = serverErrorRate
+        self.retry_after : int = retryAfter
+        self.search_results : Dict[str, List[int]] = {term.lower(): indexes for term, indexes in (searchResults or {}).items()}
+        self.host : str = host
+        self.port : int = port
+        self.random : random.Random = random.Random(seed)
+        # Number of requests served and errors injected for each endpoint
+        self.request_counts : Dict[str, int] = {"search": 0, "product": 0, "reviews": 0, "robots": 0}
+        self.injected_errors : Dict[int, int] = {}
+
+        self.products : List[Dict[str, Any]] = self._build_products()
+        self.product_state : Dict[str, Any] = load_product_state()
+        self.review_results : List[Dict[str, Any]] = load_dump("ReviewDataDump.json")["data"]["Results"]
+        self._pages : Dict[str, str] = {}
+        self._runner : Optional[web.AppRunner] = None
+
+    """
+    Repeats the saved search results products until there are totalProducts,
+    giving each repeat its own product id
+    """
+    def _build_products(self) -> List[Dict[str, Any]]:
+        savedProducts = load_search_products()
+        products = []
+        for i in range(self.total_products):
+            product = json.loads(json.dumps(savedProducts[i % len(savedProducts)]))
+            if i >= len(savedProducts):
+                product["id"] = f"{product['id']}{i // len(savedProducts)}"
+            product["attributes"]["reviewsCount"] = self.reviews_per_product
+            products.append(product)
+        return products
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/robots.txt", self.handle_robots)
+        app.router.add_get("/finder-api/{tail:.*}", self.handle_search)
+        app.router.add_get("/product/{productId}", self.handle_product)
+        app.router.add_get("/product-api/bazaar-voice-reviews/partNumber/{productId}", self.handle_reviews)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Port 0 lets the OS choose a free port
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "ArgosStandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    """
+    Waits for the configured latency and returns an injected error response, if one is due
+    """
+    async def simulate_network(self, endpoint : str) -> Optional[web.Response]:
+        self.request_counts[endpoint] += 1
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            self.injected_errors[429] = self.injected_errors.get(429, 0) + 1
+            return web.Response(status=429, headers={"Retry-After": str(self.retry_after)})
+        if roll < self.rate_limit_rate + self.server_error_rate:
+            status = self.random.choice([500, 502, 503])
+            self.injected_errors[status] = self.injected_errors.get(status, 0) + 1
+            return web.Response(status=status)
+        return None
+
+    async def handle_robots(self, request : web.Request) -> web.Response:
+        self.request_counts["robots"] += 1
+        return web.Response(text="User-agent: *\nDisallow: /basket\nDisallow: /account\n")
+
+    async def handle_search(self, request : web.Request) -> web.Response:
+        error = await self.simulate_network("search")
+        if error:
+            return error
+        path = urllib.parse.unquote(request.raw_path)
+        match = ArgosStandInServer.SEARCH_PAGE_PATTERN.search(path)
+        page = int(match.group(1)) if match else 1
+        match = ArgosStandInServer.SEARCH_TERM_PATTERN.search(path)
+        term = match.group(1).lower() if match else ""
+        products = self.products
+        if term in self.search_results:
+            products = [self.products[index] for index in self.search_results[term]]
+        pageSize = ArgosStandInServer.SEARCH_PAGE_SIZE
+        totalPages = max(1, -(-len(products) // pageSize))
+        return web.json_response({"data": {"response": {
+            "data": products[(page - 1) * pageSize:page * pageSize],
+            "meta": {"totalData": len(products), "totalPages": totalPages, "currentPage": page}
+        }}})
+
+    async def handle_product(self, request : web.Request) -> web.Response:
+        error = await self.simulate_network("product")
+        if error:
+            return error
+        productId = request.match_info["productId"]
+        if productId not in self._pages:
+            product = next((product for product in self.products if product["id"] == productId), None)
+            if product is None:
+                return web.Response(status=404)
+            self._pages[productId] = build_product_page(product, self.product_state)
+        return web.Response(text=self._pages[productId], content_type="text/html")
+
+    async def handle_reviews(self, request : web.Request) -> web.Response:
+        error = await self.simulate_network("reviews")
+        if error:
+            return error
+        productId = request.match_info["productId"]
+        limit = int(request.query.get("Limit", 10))
+        offset = int(request.query.get("Offset", 0))
+        results = []
+        for i in range(offset, min(offset + limit, self.reviews_per_product)):
+            review = dict(self.review_results[i % len(self.review_results)])
+            review["Id"] = f"{productId}-{i}"
+            review["ProductId"] = productId
+            review["ReviewText"] = f"Review {i} of {productId}. {review['ReviewText']}"
+            results.append(review)
+        return web.json_response({"data": {
+            "Limit": limit,
+            "Offset": offset,
+            "TotalResults": self.reviews_per_product,
+            "Results": results
+        }})
@@ -0,0 +1,60 @@
+import os, sys
+import time
+import statistics
+from typing import Dict, List
+
+# Get the path to the project root directory
+# Allows importing of modules
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root.replace(os.path.join("src", "benchmarks"), ""))
+
+from src.benchmarks.argos_fixtures import build_product_pages
+from src.backend.DescriptionParser import DESCRIPTION_PARSERS, available_parsers
+
+"""
+Benchmarks every available description parser against product pages built from ArgosDataDumps,
+reporting the parse time per product for each parser.
+
+Run with: python -m src.benchmarks.parser_benchmark [repeats]
+"""
+def benchmark_parsers(repeats : int = 5) -> Dict[str, List[float]]:
+    pages = build_product_pages()
+    parsers = {name: parserClass() for name, parserClass in available_parsers().items()}
+    baseline = parsers["html.parser"]
+
+    # Every parser must extract exactly the same description as the baseline
+    for productId, page in pages.items():
+        expected = baseline.parse(page)
+        for name, parser in parsers.items():
+            if parser.parse(page) != expected:
+                raise AssertionError(f"{name} parsed a different description for product {productId}")
+
+    timings : Dict[str, List[float]] = {}
+    for name, parser in parsers.items():
+        timings[name] = []
+        for _ in range(repeats):
+            for page in pages.values():
+                start = time.perf_counter()
+                parser.parse(page)
+                timings[name].append(time.perf_counter() - start)
+    return timings
+
+""" - MAIN - """
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    pages = build_product_pages()
+    averagePageSize = sum(len(page) for page in pages.values()) / len(pages)
+    print(f"Parsing {len(pages)} product pages ({averagePageSize / 1024:.0f} KB on average) {repeats} times each")
+    missing = [name for name in DESCRIPTION_PARSERS if name not in available_parsers()]
+    if missing:
+        print(f"Skipping parsers that are not installed: {', '.join(missing)}")
+
+    timings = benchmark_parsers(repeats)
+    baselineMean = statistics.mean(timings["html.parser"])
+    print(f"{'parser':<14}{'mean ms/product':>18}{'p50 ms':>10}{'p99 ms':>10}{'speedup':>10}")
+    for name, samples in timings.items():
+        samples = sorted(samples)
+        mean = statistics.mean(samples)
+        p50 = samples[len(samples) // 2]
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"{name:<14}{mean * 1000:>18.2f}{p50 * 1000:>10.2f}{p99 * 1000:>10.2f}{baselineMean / mean:>9.1f}x")
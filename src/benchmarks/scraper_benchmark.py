@@ -0,0 +1,166 @@
+import os, sys
+import argparse
+import asyncio
+import time
+import urllib.parse
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# Get the path to the project root directory
+# Allows importing of modules
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root.replace(os.path.join("src", "benchmarks"), ""))
+
+import aiohttp
+from src.benchmarks.argos_server import ArgosStandInServer
+from src.backend.WebScraper import WebScraper
+from src.backend.RequestScheduler import RequestScheduler
+from src.backend.ScrapeProgress import ScrapeProgress
+
+"""
+Benchmarks a full WebScraper.search_for_products scrape against the local Argos stand-in server,
+reporting products/sec, requests/sec and the p50/p99 response latency of each endpoint.
+The HTTP cache and product store are disabled so that every request reaches the server.
+
+Run with: python -m src.benchmarks.scraper_benchmark [--products 150] [--latency 0.05] [--jitter 0.05]
+              [--rate-limit-rate 0.0] [--server-error-rate 0.0] [--no-rate-limits] [--fixed-concurrency]
+"""
+
+"""
+Returns which endpoint a request url belongs to
+"""
+def endpoint_of(url : str) -> str:
+    path = urllib.parse.urlsplit(url).path
+    if path.startswith("/finder-api/"):
+        return "search"
+    if path.startswith("/product-api/bazaar-voice-reviews/"):
+        return "reviews"
+    if path.startswith("/product/"):
+        return "product"
+    if path == "/robots.txt":
+        return "robots"
+    return "other"
+
+"""
+Creates a trace config that records the time taken for each request to receive its response,
+grouped by endpoint
+"""
+def create_latency_trace_config(latencies : Dict[str, List[float]]) -> aiohttp.TraceConfig:
+    async def on_request_start(session : aiohttp.ClientSession, context : SimpleNamespace, params : aiohttp.TraceRequestStartParams) -> None:
+        context.start = time.perf_counter()
+
+    async def on_request_end(session : aiohttp.ClientSession, context : SimpleNamespace, params : aiohttp.TraceRequestEndParams) -> None:
+        latencies.setdefault(endpoint_of(str(params.url)), []).append(time.perf_counter() - context.start)
+
+    traceConfig = aiohttp.TraceConfig()
+    traceConfig.on_request_start.append(on_request_start)
+    traceConfig.on_request_end.append(on_request_end)
+    return traceConfig
+
+def percentile(samples : List[float], fraction : float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+"""
+Runs a single scrape against a stand-in server and returns its measurements.
+When rateLimits is False the WebScrapers per endpoint request limits are lifted,
+measuring how fast the scraper itself can go. When adaptiveConcurrency is False
+MAX_CONCURRENT_REQUESTS requests are allowed in flight throughout.
+"""
+async def benchmark_scrape(
+    server : ArgosStandInServer, 
+    productName : str = "laptop", 
+    rateLimits : bool = True, 
+    adaptiveConcurrency : bool = True
+) -> Dict[str, Any]:
+    savedSettings = (WebScraper.BASE_URL, WebScraper.USE_HTTP_CACHE, WebScraper.USE_PRODUCT_STORE, WebScraper.scheduler, WebScraper.robots_rules)
+    limits = WebScraper.ENDPOINT_LIMITS if rateLimits else {
+        name: {"rate": 10000.0, "burst": 10000, "max_concurrency": WebScraper.CONNECTION_LIMIT_PER_HOST}
+        for name in WebScraper.ENDPOINT_LIMITS
+    }
+    WebScraper.BASE_URL = server.url
+    WebScraper.USE_HTTP_CACHE = False
+    WebScraper.USE_PRODUCT_STORE = False
+    WebScraper.scheduler = RequestScheduler(
+        limits, WebScraper.MAX_CONCURRENT_REQUESTS, WebScraper.ADAPTIVE_CONCURRENCY if adaptiveConcurrency else None
+    )
+    WebScraper.robots_rules = None
+
+    scheduler = WebScraper.scheduler
+    latencies : Dict[str, List[float]] = {}
+    progress = ScrapeProgress()
+    session = WebScraper.create_client_session([create_latency_trace_config(latencies)])
+    try:
+        async with WebScraper.client_scope(session) as client:
+            with ScrapeProgress.track(progress):
+                start = time.perf_counter()
+                collection = await WebScraper.search_for_products(productName, client=client)
+                elapsed = time.perf_counter() - start
+    finally:
+        await session.close()
+        WebScraper.BASE_URL, WebScraper.USE_HTTP_CACHE, WebScraper.USE_PRODUCT_STORE, WebScraper.scheduler, WebScraper.robots_rules = savedSettings
+
+    productsScraped = len(collection.products) if collection else 0
+    return {
+        "elapsed": elapsed,
+        "products": productsScraped,
+        "products_per_second": productsScraped / elapsed,
+        "seconds_per_product": elapsed / productsScraped if productsScraped else 0.0,
+        "requests": progress.requests_sent,
+        "requests_per_second": progress.requests_sent / elapsed,
+        "rate_limited": progress.rate_limited,
+        "retries": progress.retries,
+        "failed_requests": progress.failed_requests,
+        "bytes_downloaded": progress.bytes_downloaded,
+        "concurrency": scheduler.stats().get("concurrency"),
+        "latencies": {
+            endpoint: {"count": len(samples), "p50": percentile(samples, 0.5), "p99": percentile(samples, 0.99)}
+            for endpoint, samples in latencies.items()
+        }
+    }
+
+async def run_benchmark(arguments : argparse.Namespace) -> Dict[str, Any]:
+    async with ArgosStandInServer(
+        totalProducts=arguments.products,
+        reviewsPerProduct=arguments.reviews,
+        latency=arguments.latency,
+        jitter=arguments.jitter,
+        rateLimitRate=arguments.rate_limit_rate,
+        serverErrorRate=arguments.server_error_rate,
+        seed=arguments.seed
+    ) as server:
+        return await benchmark_scrape(
+            server, rateLimits=not arguments.no_rate_limits, adaptiveConcurrency=not arguments.fixed_concurrency
+        )
+
+""" - MAIN - """
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the WebScraper against a local Argos stand-in server")
+    parser.add_argument("--products", type=int, default=WebScraper.MAX_NUMBER_OF_PRODUCTS)
+    parser.add_argument("--reviews", type=int, default=200, help="reviews per product")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.05, help="maximum random seconds added on top of the latency")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of responses replaced with a 429")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="fraction of responses replaced with a 5xx")
+    parser.add_argument("--no-rate-limits", action="store_true", help="lift the scrapers per endpoint request limits")
+    parser.add_argument("--fixed-concurrency", action="store_true", help="disable adaptive concurrency")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    print(f"Scraping {arguments.products} products ({arguments.reviews} reviews each) with "
+          f"{arguments.latency * 1000:.0f}ms + up to {arguments.jitter * 1000:.0f}ms latency")
+    result = asyncio.run(run_benchmark(arguments))
+    print(f"Scraped {result['products']} products in {result['elapsed']:.2f} seconds "
+          f"({result['seconds_per_product']:.3f} seconds per product)")
+    print(f"{result['products_per_second']:.2f} products/sec, {result['requests_per_second']:.2f} requests/sec, "
+          f"{result['requests']} requests, {result['rate_limited']} rate limited, "
+          f"{result['retries']} retried, {result['failed_requests']} failed, "
+          f"{result['bytes_downloaded'] / (1024 * 1024):.1f} MB downloaded")
+    if result["concurrency"]:
+        concurrency = result["concurrency"]
+        print(f"Adaptive concurrency finished at a window of {concurrency['window']:.1f} requests "
+              f"({concurrency['increases']} increases, {concurrency['decreases']} decreases, "
+              f"smoothed RTT {(concurrency['smoothedRtt'] or 0) * 1000:.0f}ms)")
+    print(f"{'endpoint':<10}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for endpoint, latency in sorted(result["latencies"].items()):
+        print(f"{endpoint:<10}{latency['count']:>10}{latency['p50'] * 1000:>10.1f}{latency['p99'] * 1000:>10.1f}")
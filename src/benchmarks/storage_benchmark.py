@@ -0,0 +1,87 @@
+import os, sys
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+# Get the path to the project root directory
+# Allows importing of modules
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root.replace(os.path.join("src", "benchmarks"), ""))
+
+import pandas as pd
+from src.backend.DataManager import DataManager
+from src.backend.CsvCodec import CsvCodec
+
+"""
+Benchmarks loading the collections saved in a CSV folder (CsvFolder by default) written in each CSV version
+(the legacy version 1, whose reviews are read with ast.literal_eval, and the JSON reviews of version 2),
+against loading the same collections from Parquet files: in full, and only the columns the analytics graphs need.
+Loading version 2 CSV is also timed through to the DataFrame the graphs are drawn from.
+Parquet requires the optional pyarrow package.
+
+Run with: python -m src.benchmarks.storage_benchmark [csv folder] [repeats]
+"""
+def benchmark_loading(csvFolderName : str = "CsvFolder", repeats : int = 5) -> Dict[str, List[float]]:
+    collections = DataManager.load_collections_from_csv_folder(csvFolderName)
+
+    def graph_dataframes(loaded):
+        return [pd.DataFrame([
+            {'Name': product.name, 'Price': product.price, 'Rating': product.rating, 'Reviews-Count': len(product.reviews)}
+            for product in collection.products
+        ]) for collection in loaded]
+
+    cases : Dict[str, Callable[[], object]] = {}
+    benchmarkFolder = tempfile.mkdtemp(prefix="storage_benchmark_")
+    try:
+        for version in CsvCodec.HEADERS:
+            versionFolder = os.path.join(benchmarkFolder, f"csv_v{version}")
+            os.mkdir(versionFolder)
+            paths = [os.path.join(versionFolder, collection.name + ".csv") for collection in collections]
+            for collection, path in zip(collections, paths):
+                with open(path, "w") as file:
+                    DataManager.write_collection_csv(file, collection, CsvCodec(version))
+                if DataManager.load_collection_from_csv(path) != collection:
+                    raise AssertionError(f"{collection.name} loaded from CSV version {version} differently than it was saved")
+            cases[f"csv v{version}"] = lambda paths=paths: [DataManager.load_collection_from_csv(path) for path in paths]
+        cases[f"csv v{CsvCodec.VERSION} + dataframe"] = lambda: graph_dataframes(cases[f"csv v{CsvCodec.VERSION}"]())
+
+        if DataManager.is_parquet_available():
+            for collection in collections:
+                DataManager.save_collection_to_parquet(benchmarkFolder, collection)
+            parquetPaths = [os.path.join(benchmarkFolder, collection.name + ".parquet") for collection in collections]
+            # Every collection must load back exactly as it was saved
+            for collection, path in zip(collections, parquetPaths):
+                if DataManager.load_collection_from_parquet(path) != collection:
+                    raise AssertionError(f"{collection.name} loaded from Parquet differently than it was saved")
+            cases["parquet"] = lambda: [DataManager.load_collection_from_parquet(path) for path in parquetPaths]
+            cases["parquet analytics columns"] = lambda: [DataManager.load_collection_dataframe_from_parquet(path) for path in parquetPaths]
+
+        timings : Dict[str, List[float]] = {}
+        for name, load in cases.items():
+            timings[name] = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                load()
+                timings[name].append(time.perf_counter() - start)
+        return timings
+    finally:
+        shutil.rmtree(benchmarkFolder, ignore_errors=True)
+
+""" - MAIN - """
+if __name__ == "__main__":
+    csvFolderName = sys.argv[1] if len(sys.argv) > 1 else "CsvFolder"
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    csvFiles = [file for file in os.listdir(csvFolderName) if file.endswith(".csv")]
+    totalSize = sum(os.path.getsize(os.path.join(csvFolderName, file)) for file in csvFiles)
+    print(f"Loading the {len(csvFiles)} collections ({totalSize / 1024 / 1024:.1f} MB of CSV) of {csvFolderName} {repeats} times")
+    if not DataManager.is_parquet_available():
+        print("Skipping Parquet as pyarrow is not installed (pip install pyarrow)")
+
+    timings = benchmark_loading(csvFolderName, repeats)
+    baselineMean = statistics.mean(timings[f"csv v{CsvCodec.LEGACY_VERSION}"])
+    print(f"{'format':<28}{'mean ms':>10}{'min ms':>10}{'speedup':>10}")
+    for name, samples in timings.items():
+        mean = statistics.mean(samples)
+        print(f"{name:<28}{mean * 1000:>10.1f}{min(samples) * 1000:>10.1f}{baselineMean / mean:>9.1f}x")
@@ -8,14 +8,149 @@ import plotly.graph_objects as go
 import re
 import random
 from collections import Counter
-from typing import List
-from src.callbacks.common_funcs import load_collections, create_notification, verify_pathname_and_get_trigger
+from typing import Dict, List, Tuple
+import asyncio
+import concurrent.futures
+import threading
+import aiohttp
+from src.callbacks.common_funcs import load_collection_summaries, load_collection, create_notification, verify_pathname_and_get_trigger
 from src.backend.Product import Product
-from src.backend.DataManager import DataManager
 from src.backend.Collection import Collection
+from src.backend.CollectionRepository import CollectionRepository
+from src.backend.WebScraper import WebScraper
+from src.backend.ScraperRuntime import ScraperRuntime
 
 # Global variables
-collections : List[Collection] = []
+# Names of the collections in the order they are listed, the collections themselves are kept by the CollectionRepository
+listed_collection_names : List[str] = []
+HYDRATE_TIMEOUT : float = 60.0 # Seconds before giving up on loading a products description and reviews when it is opened
+# Products whose description and reviews are being loaded, by collection name and product id
+pending_hydrations : Dict[Tuple[str, str], concurrent.futures.Future] = {}
+pending_hydrations_lock : threading.Lock = threading.Lock()
+
+"""
+Scrapes the description and reviews of a product that so far only holds its search data
+(from a quick search) and saves them over the saved product
+"""
+async def hydrate_and_save_product(collection_name : str, product : Product, client : aiohttp.ClientSession) -> None:
+    try:
+        await asyncio.wait_for(WebScraper.hydrate_product(product, client, searchTerm=collection_name), HYDRATE_TIMEOUT)
+        await asyncio.to_thread(CollectionRepository.get().update_products, collection_name, [product], ["description", "reviews"])
+    except Exception as e:
+        print(f"Error loading the details of product {product.productID}: {str(e)}")
+        raise
+
+"""
+Starts loading the description and reviews of a product in the background, when it only holds its search data,
+returning whether they are being loaded. The product is saved once they have loaded.
+"""
+def start_product_hydration(collection_name : str, product : Product) -> bool:
+    if WebScraper.is_hydrated(product):
+        return False
+    key = (collection_name, product.productID)
+    with pending_hydrations_lock:
+        future = pending_hydrations.get(key)
+        if future is None or future.done():
+            future = ScraperRuntime.get().submit(hydrate_and_save_product, collection_name, product)
+            pending_hydrations[key] = future
+            future.add_done_callback(lambda done: forget_hydration(key, done))
+    return True
+
+def forget_hydration(key : Tuple[str, str], future : concurrent.futures.Future) -> None:
+    with pending_hydrations_lock:
+        if pending_hydrations.get(key) is future:
+            del pending_hydrations[key]
+
+def has_pending_hydrations() -> bool:
+    with pending_hydrations_lock:
+        return any(not future.done() for future in pending_hydrations.values())
+
+"""
+Returns the form showing and editing the details of a product,
+while its description and reviews are being loaded a note is shown above the form.
+The products index and whether it is loading are kept in the editing-product-index and editing-product-loading stores
+"""
+def create_product_details(product : Product, loading : bool = False):
+    return [
+        html.H3("Edit Product Details"),
+        *([html.Div("Loading the description and reviews...", className="product-loading")] if loading else []),
+        html.Div([
+            html.Label("Name:"),
+            dcc.Input(
+                id='edit-product-name',
+                type='text',
+                value=product.name,
+                className='edit-input'
+            ),
+            html.Label("Price (£):"),
+            dcc.Input(
+                id='edit-product-price',
+                type='number',
+                value=product.price,
+                step=0.01,
+                className='edit-input'
+            ),
+            html.Label("URL:"),
+            dcc.Input(
+                id='edit-product-url',
+                type='text',
+                value=product.url,
+                className='edit-input'
+            ),
+            html.Label("Rating (0-5):"),
+            dcc.Input(
+                id='edit-product-rating',
+                type='number',
+                value=product.rating,
+                min=0,
+                max=5,
+                step=0.1,
+                className='edit-input'
+            ),
+            html.Label("Description:"),
+            dcc.Textarea(
+                id='edit-product-description',
+                value=product.description,
+                className='edit-textarea'
+            ),
+            html.Label("Reviews:"),
+            html.Div([
+                dcc.Input(
+                    id={'type': 'edit-product-review', 'index': i},
+                    type='text',
+                    value=review,
+                    className='edit-input review-input'
+                ) for i, review in enumerate(product.reviews)
+            ] + [
+                dcc.Input(
+                    id={'type': 'edit-product-review', 'index': len(product.reviews)},
+                    type='text',
+                    placeholder='Add new review',
+                    className='edit-input review-input'
+                )
+            ], id='reviews-container', className='reviews-container'),
+        ], className="edit-form"),
+        html.Div([
+            html.Button(
+                "Back to Products", 
+                id="back-to-products", 
+                n_clicks=0,
+                className="button"
+            ),
+            html.Button(
+                "Save Changes",
+                id="save-product-changes",
+                n_clicks=0,
+                className="button"
+            ),
+            html.Button(
+                "Delete Product", 
+                id="delete-product",
+                className="button",
+                n_clicks=0
+            )
+        ], className="product-actions")
+    ]
 
 """
 Using regex to find all of the words within a given text,
@@ -46,17 +181,17 @@ def register_collections_callbacks(app) -> None:
         prevent_initial_call=True
     )
     def update_collections_grid(pathname, refresh_clicks, initial_refresh):
-        global collections
+        global listed_collection_names
         trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/collections')
         if trigger is None:
             raise PreventUpdate
         
-        collections = load_collections()
+        listed_collection_names = [summary.name for summary in load_collection_summaries()]
         collections_grid = [
-            html.Div(collection.name, 
+            html.Div(name, 
                     className="grid-item",
                     id={'type': 'collection-item', 'index': i})
-            for i, collection in enumerate(collections)
+            for i, name in enumerate(listed_collection_names)
         ]
         return collections_grid, create_notification("Collections refreshed")
     
@@ -81,8 +216,10 @@ def register_collections_callbacks(app) -> None:
         
         if 'index' in trigger:
             clicked_index = json.loads(trigger)['index']
-            if clicked_index < len(collections):
-                selected_collection = collections[clicked_index]
+            selected_collection = None
+            if clicked_index < len(listed_collection_names):
+                selected_collection = load_collection(listed_collection_names[clicked_index])
+            if selected_collection is not None:
                 products = selected_collection.products
                 return [
                     html.Div(
@@ -106,6 +243,8 @@ def register_collections_callbacks(app) -> None:
         Output('product-details', 'children', allow_duplicate=True),
         Output('product-details', 'style', allow_duplicate=True),
         Output('products-grid', 'style', allow_duplicate=True),
+        Output('editing-product-index', 'data', allow_duplicate=True),
+        Output('editing-product-loading', 'data', allow_duplicate=True),
         Input('add-product-button', 'n_clicks'),
         State('selected-collection', 'data'),
         State('url', 'pathname'),
@@ -117,8 +256,7 @@ def register_collections_callbacks(app) -> None:
             raise PreventUpdate
 
         try:
-            global collections
-            selected_collection = next((c for c in collections if c.name == selected_collection_name), None)
+            selected_collection = load_collection(selected_collection_name)
             if selected_collection:
                 # Create a new product with temporary values
                 new_product = Product(
@@ -130,10 +268,8 @@ def register_collections_callbacks(app) -> None:
                     description="Product description",
                     reviews=[]
                 )
-                selected_collection.add_product(new_product)
-                
-                # Get the index of the new product
-                new_product_index = len(selected_collection.products) - 1
+                # The new product is only added to the collection once it is saved, it takes the index after the last product
+                new_product_index = len(selected_collection.products)
 
                 # Return the product details form for the new product
                 return [
@@ -206,13 +342,11 @@ def register_collections_callbacks(app) -> None:
                             className="button",
                             n_clicks=0
                         )
-                    ], className="product-actions"),
-                    # Hidden store for product index
-                    dcc.Store(id='editing-product-index', data=new_product_index)
-                ], {'display': 'block'}, {'display': 'none'}
+                    ], className="product-actions")
+                ], {'display': 'block'}, {'display': 'none'}, new_product_index, False
 
         except Exception as e:
-            return no_update, no_update, no_update
+            return no_update, no_update, no_update, no_update, no_update
 
         raise PreventUpdate
     
@@ -224,6 +358,9 @@ def register_collections_callbacks(app) -> None:
         Output('products-grid', 'style', allow_duplicate=True),
         Output('product-details', 'style', allow_duplicate=True),
         Output('product-details', 'children'),
+        Output('hydration-progress', 'disabled', allow_duplicate=True),
+        Output('editing-product-index', 'data', allow_duplicate=True),
+        Output('editing-product-loading', 'data', allow_duplicate=True),
         Input({'type': 'product-item', 'product-index': ALL}, 'n_clicks'),
         State({'type': 'product-item', 'product-index': ALL}, 'id'),
         State('selected-collection', 'data'),
@@ -238,92 +375,51 @@ def register_collections_callbacks(app) -> None:
         if 'product-index' in trigger:
             clicked_index = json.loads(trigger)['product-index']
             if (n_clicks[clicked_index]):
-                selected_collection = next((c for c in collections if c.name == selected_collection_name), None)
+                selected_collection = load_collection(selected_collection_name)
                 if selected_collection and clicked_index < len(selected_collection.products):
                     product = selected_collection.products[clicked_index]
-                    return {'display': 'none'}, {'display': 'block'}, [
-                        html.H3("Edit Product Details"),
-                        html.Div([
-                            html.Label("Name:"),
-                            dcc.Input(
-                                id='edit-product-name',
-                                type='text',
-                                value=product.name,
-                                className='edit-input'
-                            ),
-                            html.Label("Price (£):"),
-                            dcc.Input(
-                                id='edit-product-price',
-                                type='number',
-                                value=product.price,
-                                step=0.01,
-                                className='edit-input'
-                            ),
-                            html.Label("URL:"),
-                            dcc.Input(
-                                id='edit-product-url',
-                                type='text',
-                                value=product.url,
-                                className='edit-input'
-                            ),
-                            html.Label("Rating (0-5):"),
-                            dcc.Input(
-                                id='edit-product-rating',
-                                type='number',
-                                value=product.rating,
-                                min=0,
-                                max=5,
-                                step=0.1,
-                                className='edit-input'
-                            ),
-                            html.Label("Description:"),
-                            dcc.Textarea(
-                                id='edit-product-description',
-                                value=product.description,
-                                className='edit-textarea'
-                            ),
-                            html.Label("Reviews:"),
-                            html.Div([
-                                dcc.Input(
-                                    id={'type': 'edit-product-review', 'index': i},
-                                    type='text',
-                                    value=review,
-                                    className='edit-input review-input'
-                                ) for i, review in enumerate(product.reviews)
-                            ] + [
-                                dcc.Input(
-                                    id={'type': 'edit-product-review', 'index': len(product.reviews)},
-                                    type='text',
-                                    placeholder='Add new review',
-                                    className='edit-input review-input'
-                                )
-                            ], id='reviews-container', className='reviews-container'),
-                        ], className="edit-form"),
-                        html.Div([
-                            html.Button(
-                                "Back to Products", 
-                                id="back-to-products", 
-                                n_clicks=0,
-                                className="button"
-                            ),
-                            html.Button(
-                                "Save Changes",
-                                id="save-product-changes",
-                                n_clicks=0,
-                                className="button"
-                            ),
-                            html.Button(
-                                "Delete Product", 
-                                id="delete-product",
-                                className="button",
-                                n_clicks=0
-                            )
-                        ], className="product-actions"),
-                        # Hidden store for product index
-                        dcc.Store(id='editing-product-index', data=clicked_index)
-                    ]
+                    loading = start_product_hydration(selected_collection.name, product)
+                    return {'display': 'none'}, {'display': 'block'}, create_product_details(product, loading), not loading, clicked_index, loading
         
-        return no_update, no_update, no_update
+        return no_update, no_update, no_update, no_update, no_update, no_update
+
+    """
+    Checks on the products whose description and reviews are being loaded, showing the opened products
+    details again once they have loaded
+    """
+    @app.callback(
+        Output('product-details', 'children', allow_duplicate=True),
+        Output('hydration-progress', 'disabled', allow_duplicate=True),
+        Output('notification-container', 'children', allow_duplicate=True),
+        Output('editing-product-loading', 'data', allow_duplicate=True),
+        Input('hydration-progress', 'n_intervals'),
+        State('editing-product-index', 'data'),
+        State('editing-product-loading', 'data'),
+        State('selected-collection', 'data'),
+        State('url', 'pathname'),
+        prevent_initial_call=True
+    )
+    def update_hydrated_product_details(n_intervals, product_index, loading, selected_collection_name, pathname):
+        trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/collections')
+        if trigger is None:
+            raise PreventUpdate
+
+        # Only the details of a product opened before its description and reviews loaded are shown again
+        selected_collection = load_collection(selected_collection_name) if loading else None
+        if selected_collection is None or product_index is None or product_index >= len(selected_collection.products):
+            return no_update, not has_pending_hydrations(), no_update, no_update
+        product = selected_collection.products[product_index]
+        future = pending_hydrations.get((selected_collection.name, product.productID))
+        if future is not None and not future.done():
+            return no_update, False, no_update, no_update
+        if WebScraper.is_hydrated(product):
+            return create_product_details(product), not has_pending_hydrations(), create_notification("Product details loaded"), False
+        return (
+            create_product_details(product),
+            not has_pending_hydrations(),
+            create_notification(f"Could not load the details of '{product.name}'"),
+            False
+        )
     
     """
     When pressed this will save the current product details within the currently selected collection
@@ -352,10 +448,14 @@ def register_collections_callbacks(app) -> None:
             raise PreventUpdate
         
         try:
-            global collections
-            selected_collection = next((c for c in collections if c.name == selected_collection_name), None)
-            if selected_collection and product_index < len(selected_collection.products):
-                product = selected_collection.products[product_index]
+            selected_collection = load_collection(selected_collection_name)
+            if selected_collection and product_index <= len(selected_collection.products):
+                if product_index == len(selected_collection.products):
+                    # A product added with the add product button, which is not in the collection until now
+                    product = Product(f"temp_{int(time.time())}", "New Product", 0.0, "https://example.com", 0.0, "Product description", [])
+                    selected_collection.add_product(product)
+                else:
+                    product = selected_collection.products[product_index]
                 
                 # Update product attributes with new values
                 product.name = name
@@ -369,11 +469,8 @@ def register_collections_callbacks(app) -> None:
                 if product.productID.startswith('temp_'):
                     product.productID = f"PROD_{int(time.time())}"
                 
-                # Save the modified collection
-                DataManager.save_collections_to_csv_folder("CsvFolder", [selected_collection])
-                
-                # Refresh collections list
-                collections = load_collections()
+                # Save the modified product
+                CollectionRepository.get().save_product(selected_collection.name, product)
                 
                 # Update the products grid
                 products_grid = [
@@ -426,18 +523,14 @@ def register_collections_callbacks(app) -> None:
             raise PreventUpdate
 
         try:
-            global collections
-            selected_collection = next((c for c in collections if c.name == selected_collection_name), None)
+            selected_collection = load_collection(selected_collection_name)
             if selected_collection and product_index < len(selected_collection.products):
                 # Remove the product
                 product = selected_collection.products[product_index]
                 selected_collection.remove_product(product)
                 
-                # Save the modified collection
-                DataManager.save_collections_to_csv_folder("CsvFolder", [selected_collection])
-                
-                # Refresh collections list
-                collections = load_collections()
+                # Remove the product from the saved collection
+                CollectionRepository.get().delete_product(selected_collection.name, product.productID)
                 
                 # Update the products grid
                 products_grid = [
@@ -470,9 +563,9 @@ def register_collections_callbacks(app) -> None:
         if 'index' in trigger:
             clicked_index = json.loads(trigger)['index']
             print(f"Collection clicked, index: {clicked_index}")
-            if clicked_index < len(collections):
-                print(f"Selected collection: {collections[clicked_index].name}")
-                return collections[clicked_index].name
+            if clicked_index < len(listed_collection_names):
+                print(f"Selected collection: {listed_collection_names[clicked_index]}")
+                return listed_collection_names[clicked_index]
         
         return no_update
     
@@ -498,7 +591,7 @@ def register_collections_callbacks(app) -> None:
         selected_collection = None
         if selected_collection_data is not None:
             print(f"Using stored collection: {selected_collection_data}")
-            selected_collection = next((c for c in collections if c.name == selected_collection_data), None)
+            selected_collection = load_collection(selected_collection_data)
         else:
             print("No collection selected, cannot update graph")
             return px.bar(title="Select a collection to view product data"), [], []
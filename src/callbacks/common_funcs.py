@@ -1,19 +1,31 @@
 from dash import html
 import time
-from typing import List
-from src.backend.DataManager import DataManager
+from typing import List, Optional
 from src.backend.Collection import Collection
+from src.backend.CollectionSummary import CollectionSummary
+from src.backend.CollectionRepository import CollectionRepository
 
-def load_collections() -> List[Collection]:
-    collections = []
+"""
+Loads the summaries of the saved collections, which is all that is needed to list them.
+A collections products are only loaded once it is opened (see load_collection).
+Both are kept by the shared collection repository until the saved collections change
+"""
+def load_collection_summaries() -> List[CollectionSummary]:
+    summaries = []
+    try:
+        summaries = CollectionRepository.get().list_summaries()
+    except Exception as e:
+        print(f"Error loading collection summaries: {str(e)}")
+    return summaries
+
+def load_collection(name : Optional[str]) -> Optional[Collection]:
+    if name is None:
+        return None
     try:
-        collections = DataManager.load_collections_from_csv_folder("CsvFolder")
-        print(f"Loaded {len(collections)} collections from CsvFolder")
-    except FileNotFoundError:
-        print("CsvFolder not found. Starting with empty collections.")
+        return CollectionRepository.get().get_collection(name)
     except Exception as e:
-        print(f"Error loading collections: {str(e)}")
-    return collections
+        print(f"Error loading collection {name}: {str(e)}")
+    return None
 
 def create_notification(message : str):
     return html.Div([
@@ -1,38 +1,148 @@
-from dash import Input, Output, State, ALL, MATCH, callback_context, no_update, html
+from dash import Input, Output, State, ALL, MATCH, callback_context, no_update, html, dcc
 from dash.exceptions import PreventUpdate
-import time
-import threading
 import asyncio
+import functools
 import json
-from typing import List
-from src.callbacks.common_funcs import load_collections, create_notification, verify_pathname_and_get_trigger
+import os
+import time
+from typing import List, Optional, Tuple
+import aiohttp
+from src.callbacks.common_funcs import load_collection_summaries, load_collection, create_notification, verify_pathname_and_get_trigger
 from src.backend.WebScraper import WebScraper
+from src.backend.ScrapeCheckpoint import ScrapeCheckpoint
+from src.backend.ScrapeTracer import ScrapeTracer
+from src.backend.ScrapeJobManager import ScrapeJobManager, ScrapeJob
 from src.backend.DataManager import DataManager
+from src.backend.CollectionRepository import CollectionRepository
 from src.backend.Collection import Collection
+from src.backend.CollectionSummary import CollectionSummary
 
 # Global variables
-collections : List[Collection] = []
-search_result : Collection = None
-is_searching : bool = False
-search_start_time : float = 0.0
-last_scrape_duration : float = 0.0
+# Names of the collections in the order they are listed, the collections themselves are kept by the CollectionRepository
+listed_collection_names : List[str] = []
+HYDRATION_SAVE_INTERVAL : float = 3.0 # Seconds between saves of a quick search collection while it is being hydrated
+
+
+"""
+Scrape job body that searches for a product and scrapes its collection,
+using the pooled client of the shared scraper runtime.
+Each product is appended to the collections partial CSV as soon as it has been scraped,
+which becomes the collections CSV once the scrape is finished.
+The scrape is checkpointed as it goes. When resume is set (by the resume button) and an earlier scrape
+of the same product was interrupted, it carries on from its checkpoint (and partial CSV) instead of starting again,
+otherwise any earlier checkpoint is discarded
+"""
+async def search_job(product_name : str, client : aiohttp.ClientSession, resume : bool = False) -> Tuple[Optional[Collection], str]:
+    checkpoint = await asyncio.to_thread(open_search_checkpoint, product_name, resume)
+    products_saved = len(checkpoint.completed_products)
+    with ScrapeCheckpoint.track(checkpoint):
+        async for product in WebScraper.stream_products(product_name, client=client):
+            with ScrapeTracer.phase("csv_write", "append to partial CSV"):
+                await asyncio.to_thread(DataManager.append_products_to_partial_csv, "CsvFolder", product_name, [product])
+            checkpoint.record_product_completed(product.productID)
+            products_saved += 1
+    if products_saved == 0:
+        await asyncio.to_thread(DataManager.discard_partial_csv, "CsvFolder", product_name)
+        await asyncio.to_thread(checkpoint.delete)
+        return None, f"No products found for '{product_name}'."
+    with ScrapeTracer.phase("csv_write", "commit partial CSV"):
+        collection = await asyncio.to_thread(CollectionRepository.get().commit_partial_csv, "CsvFolder", product_name)
+    await asyncio.to_thread(checkpoint.delete)
+    return collection, f"Search for '{product_name}' completed. New collection added."
 
 """
-This method should be called by a seperate thread.
-It will ensure that execution does not continue until the webscraper 
-has finished scraping all of the products for the collection.
-After scraping is finished it will save the collection as a CSV
+Scrape job body that saves a collection of the products search data (name, price and rating) 
+as soon as the search pages are back, so it can be viewed and graphed within seconds.
+The descriptions and reviews are then scraped in the background, saving those of the products
+hydrated since the last save every few seconds. Only the descriptions and reviews are saved,
+over the products as they are saved now, so products edited or deleted in the meantime stay as they are
 """
-def background_search(product_name) -> None:
-    global search_result, is_searching, search_start_time, last_scrape_duration
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    search_start_time = time.time()
-    search_result = loop.run_until_complete(WebScraper.search_for_products(product_name))
-    last_scrape_duration = time.time() - search_start_time
-    is_searching = False
-    if search_result:
-        DataManager.save_collections_to_csv_folder("CsvFolder", [search_result])
+async def quick_search_job(product_name : str, client : aiohttp.ClientSession) -> Tuple[Optional[Collection], str]:
+    product_data = await WebScraper.search_for_product_metadata(product_name, client=client)
+    if not product_data:
+        return None, f"No products found for '{product_name}'."
+    products = await asyncio.gather(*(WebScraper.create_metadata_product(data) for data in product_data))
+    collection = Collection(product_name, list(products))
+    with ScrapeTracer.phase("csv_write", "save metadata CSV"):
+        await asyncio.to_thread(CollectionRepository.get().save_collections, [collection])
+
+    # Products already hydrated from the product store were saved along with the search data
+    saved_ids = {product.productID for product in collection.products if WebScraper.is_hydrated(product)}
+    hydration = asyncio.create_task(WebScraper.hydrate_collection(
+        collection, client, {data["id"]: data["numOfReviews"] for data in product_data}
+    ))
+    try:
+        while not hydration.done():
+            await asyncio.wait([hydration], timeout=HYDRATION_SAVE_INTERVAL)
+            hydrated_products = [
+                product for product in collection.products
+                if product.productID not in saved_ids and WebScraper.is_hydrated(product)
+            ]
+            if hydrated_products:
+                with ScrapeTracer.phase("csv_write", "save hydrated products"):
+                    await asyncio.to_thread(
+                        CollectionRepository.get().update_products, product_name, hydrated_products, ["description", "reviews"]
+                    )
+                saved_ids.update(product.productID for product in hydrated_products)
+        hydrated = hydration.result()
+    finally:
+        hydration.cancel()
+    return collection, f"Quick search for '{product_name}' completed. {hydrated} products loaded after the collection was saved."
+
+"""
+Returns the checkpoint for a search. When resuming, it continues from an interrupted scrape if there is one,
+the products in its partial CSV are completed, including any saved after the checkpoint was last written.
+Otherwise (or without a checkpoint to continue from) any leftover checkpoint and partial CSV are discarded
+"""
+def open_search_checkpoint(product_name : str, resume : bool = False) -> ScrapeCheckpoint:
+    if resume:
+        checkpoint = WebScraper.open_checkpoint(product_name)
+    else:
+        checkpoint = ScrapeCheckpoint(WebScraper.get_checkpoint_path(product_name), product_name)
+        checkpoint.delete()
+    partial_path = DataManager.get_partial_csv_path("CsvFolder", product_name)
+    if not checkpoint.is_empty and os.path.exists(partial_path):
+        saved_products = DataManager.load_collection_from_csv(partial_path).products
+        checkpoint.completed_products = {product.productID for product in saved_products}
+    else:
+        DataManager.discard_partial_csv("CsvFolder", product_name)
+        checkpoint.completed_products = set()
+    return checkpoint
+
+"""
+Scrape job body that searches for several products at once, scraping products
+that more than one of the searches find only once.
+After scraping is finished it will save a CSV for each search that found products
+"""
+async def batch_search_job(product_names : List[str], client : aiohttp.ClientSession) -> Tuple[List[Collection], str]:
+    results = await WebScraper.search_for_products_batch(product_names, client=client)
+    found = [collection for collection in results.values() if collection is not None]
+    if found:
+        with ScrapeTracer.phase("csv_write", "save batch CSVs"):
+            await asyncio.to_thread(CollectionRepository.get().save_collections, found)
+    unique_products = len({product.productID for collection in found for product in collection.products})
+    message = f"Batch search completed. {len(found)} of {len(results)} searches added new collections ({unique_products} unique products)."
+    missing = [name for name, collection in results.items() if collection is None]
+    if missing:
+        message += f" No products found for: {', '.join(missing)}."
+    return found, message
+
+"""
+Splits the search bar input into the search terms of a batch search
+"""
+def split_search_terms(product_input : str) -> List[str]:
+    return [term.strip() for term in (product_input or "").split(",") if term.strip()]
+
+"""
+Scrape job body that incrementally refreshes the reviews of an already saved collection,
+fetching only the reviews added since it was scraped,
+and then saves the refreshed reviews over the saved products (leaving any changes made to them since alone)
+"""
+async def review_refresh_job(collection : Collection, client : aiohttp.ClientSession) -> Tuple[Collection, str]:
+    new_reviews = await WebScraper.refresh_collection_reviews(collection, client=client)
+    with ScrapeTracer.phase("csv_write", "save refreshed CSV"):
+        await asyncio.to_thread(CollectionRepository.get().update_products, collection.name, collection.products, ["reviews"])
+    return collection, f"Reviews refreshed. {new_reviews} new reviews added to '{collection.name}'."
 
 """
 This method returns the HTML data of a collection 
@@ -54,6 +164,10 @@ def create_collection_item(name : str, total_products : int, index : int):
                 html.Div([
                     html.Button("Export Collection", className="export-button", id={"type": "export-collection", "index": index}),
                     html.Button("Download CSV", className="download-csv-button", id={"type": "download-csv", "index": index}),
+                    # Parquet downloads need the optional pyarrow package
+                    *([html.Button("Download Parquet", className="download-csv-button", id={"type": "download-parquet", "index": index})]
+                      if DataManager.is_parquet_available() else []),
+                    html.Button("Refresh Reviews", className="refresh-reviews-button", id={"type": "refresh-reviews", "index": index}),
                 ]),
                 html.Button("Delete Collection", className="delete-collection-button", id={"type": "delete-collection", "index": index})
             ], className="collection-actions"),
@@ -62,10 +176,22 @@ def create_collection_item(name : str, total_products : int, index : int):
 
 """
 Iterates through all of the collections and creates a list 
-of collection items to be stored within the collection-list
+of collection items to be stored within the collection-list,
+remembering the order they are listed in
+"""
+def display_collections(summaries: List[CollectionSummary]):
+    global listed_collection_names
+    listed_collection_names = [summary.name for summary in summaries]
+    return [create_collection_item(summary.name, summary.product_count, i) for i, summary in enumerate(summaries)]
+
+"""
+Loads the collection listed at the given index of the collections list,
+returning None if there is no such collection
 """
-def display_collections(collections: List[Collection]):
-    return [create_collection_item(collection.name, len(collection.products), i) for i, collection in enumerate(collections)]
+def get_listed_collection(index : int) -> Optional[Collection]:
+    if index >= len(listed_collection_names):
+        return None
+    return load_collection(listed_collection_names[index])
 
 """
 Formats a float value to 2dp as a string
@@ -73,6 +199,73 @@ Formats a float value to 2dp as a string
 def format_time(seconds : float) -> str:
     return f"{seconds:.2f}" if seconds is not None else "0.00"
 
+"""
+Creates a status line, along with the live progress of the scrape, for each of the 
+given scrape jobs to be shown within the Analytics section
+"""
+def display_jobs(jobs : List[ScrapeJob]):
+    return [
+        html.Div([
+            html.Div(f"{job.name} ({job.kind}): {job.status}, {format_time(job.elapsed)} seconds"),
+            html.Div(
+                f"{job.progress.products_scraped}/{job.progress.products_discovered} products "
+                f"({job.progress.products_from_store} already stored), "
+                f"{job.progress.descriptions_fetched} descriptions, "
+                f"{job.progress.review_pages_fetched} review pages, "
+                f"{job.progress.bytes_downloaded / 1024:.0f} KB downloaded, "
+                f"{job.progress.rate_limited} rate limited, "
+                f"{job.progress.retries} retries, "
+                f"{job.progress.failed_requests} failed, "
+                f"{job.progress.request_rate:.1f} requests/s",
+                className="scrape-job-progress"
+            )
+        ], className="scrape-job-status")
+        for job in jobs
+    ]
+
+"""
+Creates a breakdown of where the time of each of the given finished scrape jobs went,
+one line for each phase of the scrape (longest first), along with where its Chrome trace was saved.
+Phases overlap (the products are scraped concurrently), so their totals can add up to more than the jobs duration
+"""
+def display_trace_summaries(jobs : List[ScrapeJob]):
+    return [
+        html.Div([
+            html.Div(f"{job.name} ({job.kind}) took {format_time(job.elapsed)} seconds, trace saved to {job.trace_path}"),
+            *[
+                html.Div(
+                    f"{phase}: {totals['count']} spans, {format_time(totals['total'])} seconds total, "
+                    f"{totals['max'] * 1000:.0f} ms longest",
+                    className="scrape-job-progress"
+                )
+                for phase, totals in job.trace_summary.items() if phase != "job"
+            ]
+        ], className="scrape-job-status")
+        for job in jobs if job.trace_summary
+    ]
+
+"""
+Creates a line showing how many requests the adaptive concurrency currently allows in flight,
+the request rate that allows and the smoothed round trip time of Argos responses
+"""
+def display_concurrency():
+    concurrency = WebScraper.scheduler.stats().get("concurrency")
+    if not concurrency:
+        return []
+    return [html.Div(
+        f"Request window: {concurrency['window']:.1f} in flight, "
+        f"{concurrency['rate']:.1f} requests/s, "
+        f"RTT {(concurrency['smoothedRtt'] or 0) * 1000:.0f} ms",
+        className="scrape-job-progress"
+    )]
+
+"""
+Returns the duration of the most recently finished scrape job
+"""
+def last_job_duration() -> float:
+    last_job = ScrapeJobManager.get().last_finished_job
+    return last_job.elapsed if last_job else 0.0
+
 """
 This method allows the main app file (app.py) to only need 
 to call one method to register all callbacks for the home page
@@ -84,27 +277,51 @@ def register_home_callbacks(app) -> None:
     @app.callback(
         Output('search-progress', 'disabled', allow_duplicate=True),
         Output('notification-container', 'children', allow_duplicate=True),
+        Output('active-job-ids', 'data', allow_duplicate=True),
         Input('url', 'pathname'),
         Input('search-button', 'n_clicks'),
+        Input('batch-search-button', 'n_clicks'),
+        Input('quick-search-button', 'n_clicks'),
+        Input('resume-button', 'n_clicks'),
         State('product-input', 'value'),
+        State('active-job-ids', 'data'),
         prevent_initial_call=True
     )
-    def handle_search(pathname, search_clicks, product_name):
+    def handle_search(pathname, search_clicks, batch_search_clicks, quick_search_clicks, resume_clicks, product_name, active_job_ids):
         trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/')
         if trigger is None:
             raise PreventUpdate
         
         # Initialize outputs
-        outputs = [no_update] * 2
+        outputs = [no_update] * 3
         
         if trigger == 'search-button' and product_name:
-            global is_searching, search_result
-            is_searching = True
-            search_result = None
-            # Calling background search in asynchronous thread to 
-            # not block application process while its searching/scraping
-            threading.Thread(target=lambda: background_search(product_name)).start()
-            outputs = [False, create_notification("Searching...")]
+            # Scraping runs as a job on the shared scraper runtime so it does not
+            # block the application process, other searches can run alongside it
+            job = ScrapeJobManager.get().submit("search", product_name, functools.partial(search_job, product_name))
+            active_job_ids = [jobId for jobId in (active_job_ids or []) if jobId != job.jobId] + [job.jobId]
+            outputs = [False, create_notification(f"Searching for '{product_name}'..."), active_job_ids]
+        elif trigger == 'batch-search-button' and split_search_terms(product_name):
+            # Each comma separated term gets its own collection, products found by several terms are scraped once
+            product_names = split_search_terms(product_name)
+            job = ScrapeJobManager.get().submit("batch", ", ".join(product_names), functools.partial(batch_search_job, product_names))
+            active_job_ids = [jobId for jobId in (active_job_ids or []) if jobId != job.jobId] + [job.jobId]
+            outputs = [False, create_notification(f"Searching for {len(product_names)} products: {', '.join(product_names)}..."), active_job_ids]
+        elif trigger == 'quick-search-button' and product_name:
+            # The collection is saved with only the search data first, its descriptions and reviews follow
+            job = ScrapeJobManager.get().submit("quick", product_name, functools.partial(quick_search_job, product_name))
+            active_job_ids = [jobId for jobId in (active_job_ids or []) if jobId != job.jobId] + [job.jobId]
+            outputs = [False, create_notification(f"Quick searching for '{product_name}'..."), active_job_ids]
+        elif trigger == 'resume-button':
+            # Scrapes interrupted by the app stopping carry on from their checkpoints
+            product_names = WebScraper.list_interrupted_scrapes()
+            if not product_names:
+                return False, create_notification("There are no interrupted scrapes to resume"), no_update
+            active_job_ids = list(active_job_ids or [])
+            for name in product_names:
+                job = ScrapeJobManager.get().submit("search", name, functools.partial(search_job, name, resume=True))
+                active_job_ids = [jobId for jobId in active_job_ids if jobId != job.jobId] + [job.jobId]
+            outputs = [False, create_notification(f"Resuming scrapes for: {', '.join(product_names)}..."), active_job_ids]
                 
         return tuple(outputs)
     
@@ -118,56 +335,76 @@ def register_home_callbacks(app) -> None:
         Output('last-scrape-duration', 'children'),
         Output('total-collections', 'children'),
         Output('current-scrape-products', 'children'),
+        Output('scrape-jobs', 'children'),
+        Output('active-job-ids', 'data', allow_duplicate=True),
         Input('url', 'pathname'),
         Input('initial-refresh', 'n_intervals'),
         Input('search-progress', 'n_intervals'),
         Input('collections-list', 'children'),
+        State('active-job-ids', 'data'),
         prevent_initial_call=True
     )
-    def handle_analytics_update(pathname, refresh_interval, search_interval, collections_children):
-        global collections
+    def handle_analytics_update(pathname, refresh_interval, search_interval, collections_children, active_job_ids):
         trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/')
         if trigger is None:
             raise PreventUpdate
         
         # Initialize outputs
-        outputs = [no_update] * 6
+        outputs = [no_update] * 8
         
-        # Updating the Analytics information with the progress and history of searches
+        # Updating the Analytics information with the progress and history of this tabs scrape jobs
         if trigger == 'search-progress':
-            if is_searching:
-                elapsed_time = time.time() - search_start_time if search_start_time else 0
-                outputs = [
-                    False,
-                    no_update,
-                    f"Current scrape time elapsed: {format_time(elapsed_time)} seconds",
-                    f"Last scrape duration: {format_time(last_scrape_duration)} seconds",
-                    f"Total Collections: {len(collections)}",
-                    f"Current scrape products collected: {sum(len(c.products) for c in collections)} products"
-                ]
-            elif search_result:
-                collections = load_collections()
-                outputs = [
-                    True,
-                    create_notification("Search completed. New collection added."),
-                    f"Current scrape time elapsed: {format_time(last_scrape_duration)} seconds",
-                    f"Last scrape duration: {format_time(last_scrape_duration)} seconds",
-                    f"Total Collections: {len(collections)}",
-                    f"Current scrape products collected: {sum(len(c.products) for c in collections)} products"
-                ]
+            manager = ScrapeJobManager.get()
+            jobs = [job for job in (manager.get_job(jobId) for jobId in (active_job_ids or [])) if job is not None]
+            running_jobs = [job for job in jobs if not job.is_finished]
+            finished_jobs = [job for job in jobs if job.is_finished]
+            finished_messages = [job.message for job in finished_jobs]
+            elapsed_time = max((job.elapsed for job in running_jobs), default=last_job_duration())
+            outputs = [
+                not running_jobs,
+                create_notification(" ".join(finished_messages)) if finished_messages else no_update,
+                f"Current scrape time elapsed: {format_time(elapsed_time)} seconds",
+                f"Last scrape duration: {format_time(last_job_duration())} seconds",
+                f"Total Collections: {len(load_collection_summaries())}",
+                f"Current scrape products collected: {sum(job.progress.products_scraped for job in running_jobs)} products",
+                (display_concurrency() + display_jobs(running_jobs) if running_jobs else []) + display_trace_summaries(finished_jobs),
+                [job.jobId for job in running_jobs]
+            ]
         elif trigger == "initial-refresh" or trigger == 'collections-list':
-            collections = load_collections()
             outputs = [
-                True,
+                not active_job_ids,
                 create_notification("Collections refreshed"),
-                f"Current scrape time elapsed: {format_time(last_scrape_duration)} seconds",
-                f"Last scrape duration: {format_time(last_scrape_duration)} seconds",
-                f"Total Collections: {len(collections)}",
-                f"Current scrape products collected: {sum(len(c.products) for c in collections)} products"
+                f"Current scrape time elapsed: {format_time(last_job_duration())} seconds",
+                f"Last scrape duration: {format_time(last_job_duration())} seconds",
+                f"Total Collections: {len(load_collection_summaries())}",
+                f"Current scrape products collected: 0 products",
+                no_update,
+                no_update
             ]
             
         return tuple(outputs)
     
+    """
+    Cancels all of the scrape jobs started from this tab
+    """
+    @app.callback(
+        Output('notification-container', 'children', allow_duplicate=True),
+        Input('url', 'pathname'),
+        Input('cancel-button', 'n_clicks'),
+        State('active-job-ids', 'data'),
+        prevent_initial_call=True
+    )
+    def cancel_jobs(pathname, cancel_clicks, active_job_ids):
+        trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/')
+        if trigger != 'cancel-button':
+            raise PreventUpdate
+        
+        manager = ScrapeJobManager.get()
+        cancelled = sum(manager.cancel(jobId) for jobId in (active_job_ids or []))
+        if cancelled == 0:
+            return create_notification("No scrapes are running.")
+        return create_notification(f"Cancelling {cancelled} scrape(s)...")
+    
     """
     Handles all updates of the collections list,
     ensuring that the list is always up-to-date 
@@ -183,18 +420,14 @@ def register_home_callbacks(app) -> None:
         prevent_initial_call=True
     )
     def update_collections_grid(pathname, refresh_clicks, refresh_interval, search_disabled):
-        global collections
         trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/')
         if trigger is None:
             raise PreventUpdate
         
-        if trigger == 'search-progress' and is_searching:
-            raise PreventUpdate
-        elif trigger == 'search-progress' and not search_disabled:
+        if trigger == 'search-progress' and not search_disabled:
             raise PreventUpdate
 
-        collections = load_collections()
-        return tuple([display_collections(collections), create_notification("Collections refreshed")])
+        return tuple([display_collections(load_collection_summaries()), create_notification("Collections refreshed")])
     
     """
     Updates selected collection from collection-list to show product details 
@@ -215,9 +448,8 @@ def register_home_callbacks(app) -> None:
             raise PreventUpdate
         if n_clicks:
             try:
-                collection_index = item_id['index']
-                if collection_index < len(collections):
-                    collection = collections[collection_index]
+                collection = get_listed_collection(item_id['index'])
+                if collection is not None:
                     products = [
                         html.Div([
                             html.Div(f"{product.name} - £{product.price}", className="product-name"),
@@ -254,8 +486,8 @@ def register_home_callbacks(app) -> None:
         if n_clicks[button_index] is None or n_clicks[button_index] == 0:
             raise PreventUpdate
         
-        if button_index < len(collections):
-            collection = collections[button_index]
+        collection = get_listed_collection(button_index)
+        if collection is not None:
             collection_dict = DataManager.convert_collection_to_dictionary(collection)
             return dict(content=json.dumps(collection_dict, indent=2), filename=f"{collection.name}.json")
         
@@ -284,13 +516,42 @@ def register_home_callbacks(app) -> None:
         if n_clicks[button_index] is None or n_clicks[button_index] == 0:
             raise PreventUpdate
         
-        if button_index < len(collections):
-            collection = collections[button_index]
+        collection = get_listed_collection(button_index)
+        if collection is not None:
             csv_string = DataManager.convert_collection_to_csv_string(collection)
             return dict(content=csv_string, filename=f"{collection.name}.csv")
         
         raise PreventUpdate
     
+    """
+    Converts a given collection into Parquet format,
+    this Parquet file is then downloaded
+    """
+    @app.callback(
+        Output("download-parquet", "data"),
+        Input({"type": "download-parquet", "index": ALL}, "n_clicks"),
+        State({"type": "download-parquet", "index": ALL}, "id"),
+        State('url', 'pathname'),
+        prevent_initial_call=True
+    )
+    def download_parquet(n_clicks, ids, pathname):
+        trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/')
+        if trigger is None:
+            raise PreventUpdate
+        
+        button_index = json.loads(trigger)['index']
+        
+        # Check if the button was actually clicked
+        if n_clicks[button_index] is None or n_clicks[button_index] == 0:
+            raise PreventUpdate
+        
+        collection = get_listed_collection(button_index)
+        if collection is not None:
+            parquet_bytes = DataManager.convert_collection_to_parquet_bytes(collection)
+            return dcc.send_bytes(parquet_bytes, f"{collection.name}.parquet")
+        
+        raise PreventUpdate
+    
     """
     Deletes a given collection from the memory store and the local CSV file store
     """
@@ -303,7 +564,6 @@ def register_home_callbacks(app) -> None:
         prevent_initial_call=True
     )
     def delete_collection(n_clicks, ids, pathname):
-        global collections
         trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/')
         if trigger is None:
             raise PreventUpdate
@@ -315,10 +575,41 @@ def register_home_callbacks(app) -> None:
         if n_clicks[button_index] is None or n_clicks[button_index] == 0:
             raise PreventUpdate
         
-        if button_index < len(collections):
-            collection_name = collections[button_index].name
+        if button_index < len(listed_collection_names):
+            collection_name = listed_collection_names[button_index]
             DataManager.delete_collection(collection_name)
-            collections = load_collections()
-            return display_collections(collections), create_notification(f"Collection '{collection_name}' deleted.")
+            return display_collections(load_collection_summaries()), create_notification(f"Collection '{collection_name}' deleted.")
+        
+        raise PreventUpdate
+    
+    """
+    Starts an incremental refresh of a given collections reviews in the background
+    """
+    @app.callback(
+        Output('search-progress', 'disabled', allow_duplicate=True),
+        Output('notification-container', 'children', allow_duplicate=True),
+        Output('active-job-ids', 'data', allow_duplicate=True),
+        Input({"type": "refresh-reviews", "index": ALL}, "n_clicks"),
+        State({"type": "refresh-reviews", "index": ALL}, "id"),
+        State('active-job-ids', 'data'),
+        State('url', 'pathname'),
+        prevent_initial_call=True
+    )
+    def refresh_reviews(n_clicks, ids, active_job_ids, pathname):
+        trigger = verify_pathname_and_get_trigger(callback_context, pathname, '/')
+        if trigger is None:
+            raise PreventUpdate
+        
+        button_index = json.loads(trigger)['index']
         
-        raise PreventUpdate
\ No newline at end of file
+        # Check if the button was actually clicked
+        if n_clicks[button_index] is None or n_clicks[button_index] == 0:
+            raise PreventUpdate
+        
+        collection = get_listed_collection(button_index)
+        if collection is not None:
+            job = ScrapeJobManager.get().submit("refresh", collection.name, functools.partial(review_refresh_job, collection))
+            active_job_ids = [jobId for jobId in (active_job_ids or []) if jobId != job.jobId] + [job.jobId]
+            return False, create_notification(f"Refreshing reviews for '{collection.name}'..."), active_job_ids
+        
+        raise PreventUpdate
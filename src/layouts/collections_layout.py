@@ -80,7 +80,12 @@ def create_hidden_stores_and_intervals():
             dcc.Store(id='selected-collection', data=None),
             dcc.Store(id='product-clicked', data=None),
             dcc.Store(id='view-state', data='grid'),
+            # Index of the product shown in the product details form, and whether its description and reviews are loading
+            dcc.Store(id='editing-product-index', data=None),
+            dcc.Store(id='editing-product-loading', data=False),
             dcc.Interval(id='notification-interval', interval=1000, n_intervals=0),
+            # Enabled while the description and reviews of opened products are being loaded
+            dcc.Interval(id='hydration-progress', interval=1000, n_intervals=0, disabled=True),
             dcc.Interval(id='initial-refresh', interval=1, max_intervals=1)
         ], style={'display': 'none'})
     
@@ -13,11 +13,19 @@ def create_home_layout():
             dcc.Input(
                 id="product-input",
                 type="text",
-                placeholder="Search for a collection",
+                placeholder="Search for a collection (separate searches with commas for a batch)",
                 className="search-bar"
             ),
             # Search button
             html.Button("Scrape", id="search-button", className="button"),
+            # Batch button, scrapes each comma separated search as its own collection in one go
+            html.Button("Scrape Batch", id="batch-search-button", className="button"),
+            # Quick button, saves the collection from the search results first and loads descriptions and reviews after
+            html.Button("Quick Scrape", id="quick-search-button", className="button"),
+            # Cancel button, cancels the scrapes started from this tab
+            html.Button("Cancel", id="cancel-button", className="button"),
+            # Resume button, carries on any scrapes that were interrupted by the app stopping
+            html.Button("Resume", id="resume-button", className="button"),
         ], className="search-container"),
 
         # Analytics section
@@ -26,7 +34,8 @@ def create_home_layout():
             html.Div(id="current-scrape-time", style={"color": "white", "fontSize": "13px", "fontWeight": "400", "marginBottom": "10px"}),
             html.Div(id="last-scrape-duration", style={"color": "white", "fontSize": "13px", "fontWeight": "400", "marginBottom": "10px"}),
             html.Div(id="total-collections", style={"color": "white", "fontSize": "13px", "fontWeight": "400", "marginBottom": "10px"}),
-            html.Div(id="current-scrape-products", style={"color": "white", "fontSize": "13px", "fontWeight": "400"}),
+            html.Div(id="current-scrape-products", style={"color": "white", "fontSize": "13px", "fontWeight": "400", "marginBottom": "10px"}),
+            html.Div(id="scrape-jobs", style={"color": "white", "fontSize": "13px", "fontWeight": "400"}),
         ], className="analytics-section"),
 
         # Divider
@@ -58,8 +67,10 @@ def create_callback_triggers():
     return html.Div([
             dcc.Store(id='selected-collection', data=None),
             dcc.Store(id='notifications', data=[]),
+            dcc.Store(id='active-job-ids', data=[]),
             dcc.Download(id="download-json"),
             dcc.Download(id="download-csv"),
+            dcc.Download(id="download-parquet"),
             dcc.Interval(id='search-progress', interval=500, n_intervals=0, disabled=True),
             dcc.Interval(id='notification-interval', interval=1000, n_intervals=0),
             dcc.Interval(id='initial-refresh', interval=1, max_intervals=1)
@@ -0,0 +1,33 @@
+import unittest
+import asyncio
+from src.benchmarks.argos_server import ArgosStandInServer
+from src.benchmarks.scraper_benchmark import benchmark_scrape
+
+class ArgosStandInServerTest(unittest.TestCase):
+    def test_scrape_against_stand_in_server(self) -> None:
+        async def run():
+            async with ArgosStandInServer(totalProducts=70, reviewsPerProduct=120, seed=0) as server:
+                result = await benchmark_scrape(server, rateLimits=False)
+                return result, dict(server.request_counts)
+
+        result, requestCounts = asyncio.run(run())
+        self.assertEqual(result["products"], 70)
+        # 70 products span two search pages, and 120 reviews span two review pages per product
+        self.assertEqual(requestCounts["search"], 2)
+        self.assertEqual(requestCounts["product"], 70)
+        self.assertEqual(requestCounts["reviews"], 140)
+        self.assertEqual(result["latencies"]["product"]["count"], 70)
+
+    def test_injected_errors_are_retried(self) -> None:
+        async def run():
+            async with ArgosStandInServer(totalProducts=20, reviewsPerProduct=10, rateLimitRate=0.1, serverErrorRate=0.05, retryAfter=0, seed=1) as server:
+                result = await benchmark_scrape(server, rateLimits=False)
+                return result, sum(server.injected_errors.values())
+
+        result, injectedErrors = asyncio.run(run())
+        self.assertGreater(injectedErrors, 0)
+        self.assertGreater(result["requests"], 20 + 20 + 1)
+        self.assertGreater(result["products"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
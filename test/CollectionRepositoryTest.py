@@ -0,0 +1,142 @@
+import unittest
+import os
+import shutil
+from src.backend.Collection import Collection
+from src.backend.CollectionRepository import CollectionRepository
+from src.backend.CollectionSummary import CollectionSummary
+from src.backend.DataManager import DataManager
+from src.backend.Product import Product
+from src.backend.StorageBackend import CsvStorageBackend
+from src.backend.SqliteStorageBackend import SqliteStorageBackend
+
+class CollectionRepositoryTest(unittest.TestCase):
+    folder : str = "RepositoryTestFolder"
+
+    def setUp(self) -> None:
+        self.backend : CsvStorageBackend = CsvStorageBackend(self.folder)
+        self.repository : CollectionRepository = CollectionRepository(self.backend)
+        self.laptop : Product = Product("1", "Laptop", 499.99, "https://www.test.co.uk/product/1", 4.5, "A laptop", ["Great"])
+        self.tablet : Product = Product("2", "Tablet", 199.99, "https://www.test.co.uk/product/2", 4.0, "A tablet", [])
+        self.repository.save_collections([Collection("computers", [self.laptop, self.tablet])])
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_collections_are_kept(self) -> None:
+        collection = self.repository.get_collection("computers")
+        self.assertEqual(self.repository.misses, 1)
+        self.assertEqual(self.repository.get_collection("computers"), collection)
+        self.assertEqual(self.repository.hits, 1)
+        self.assertIsNone(self.repository.get_collection("missing"))
+
+    def test_changes_to_a_returned_collection_are_not_kept_until_saved(self) -> None:
+        collection = self.repository.get_collection("computers")
+        collection.products[0].name = "Laptop Pro"
+        collection.products[0].reviews.append("Fast")
+        collection.remove_product(collection.products[1])
+        kept = self.repository.get_collection("computers")
+        self.assertEqual([product.productID for product in kept.products], ["1", "2"])
+        self.assertEqual((kept.products[0].name, kept.products[0].reviews), ("Laptop", ["Great"]))
+
+        self.repository.save_product("computers", collection.products[0])
+        collection.products[0].name = "Laptop Max"
+        self.assertEqual(self.repository.get_collection("computers").products[0].name, "Laptop Pro")
+
+    def test_summaries_are_kept(self) -> None:
+        summaries = self.repository.list_summaries()
+        self.assertEqual([summary.name for summary in summaries], ["computers"])
+        self.assertEqual(self.repository.list_summaries(), summaries)
+        self.assertEqual((self.repository.hits, self.repository.misses), (1, 1))
+
+    def test_collections_changed_outside_the_repository_are_loaded_again(self) -> None:
+        collection = self.repository.get_collection("computers")
+        DataManager.save_collections_to_csv_folder(self.folder, [Collection("computers", [self.tablet])])
+        reloaded = self.repository.get_collection("computers")
+        self.assertIsNot(reloaded, collection)
+        self.assertEqual([product.productID for product in reloaded.products], ["2"])
+        self.assertEqual(self.repository.list_summaries()[0].product_count, 1)
+
+    def test_saving_collections_replaces_the_kept_collections(self) -> None:
+        self.repository.get_collection("computers")
+        self.repository.list_summaries()
+        self.repository.save_collections([Collection("computers", [self.laptop]), Collection("laptops", [self.laptop])])
+        self.assertEqual([product.productID for product in self.repository.get_collection("computers").products], ["1"])
+        self.assertEqual([summary.name for summary in self.repository.list_summaries()], ["computers", "laptops"])
+
+    def test_saving_a_product_updates_the_kept_collection(self) -> None:
+        collection = self.repository.get_collection("computers")
+        monitor = Product("3", "Monitor", 99.99, "https://www.test.co.uk/product/3", 3.5, "A monitor", [])
+        self.repository.save_product("computers", monitor)
+        self.laptop.name = "Laptop Pro"
+        self.repository.save_product("computers", self.laptop)
+
+        hits = self.repository.hits
+        collection = self.repository.get_collection("computers")
+        self.assertEqual(self.repository.hits, hits + 1)
+        self.assertEqual([product.productID for product in collection.products], ["1", "2", "3"])
+        self.assertEqual(collection.products[0].name, "Laptop Pro")
+        self.assertEqual(self.backend.load_collection("computers"), collection)
+        self.assertEqual(self.repository.list_summaries(), [CollectionSummary.from_collection(collection)])
+
+    def test_deleting_a_product_updates_the_kept_collection(self) -> None:
+        self.repository.get_collection("computers")
+        self.assertTrue(self.repository.delete_product("computers", "1"))
+        hits = self.repository.hits
+        collection = self.repository.get_collection("computers")
+        self.assertEqual(self.repository.hits, hits + 1)
+        self.assertEqual([product.productID for product in collection.products], ["2"])
+        self.assertEqual([product.productID for product in self.backend.load_collection("computers").products], ["2"])
+
+    def test_updating_products_keeps_changes_saved_since_they_were_loaded(self) -> None:
+        stale = self.backend.load_collection("computers")
+        self.repository.delete_product("computers", "2")
+        edited = self.repository.backend.get_product("computers", "1")
+        edited.name = "Laptop Pro"
+        self.repository.save_product("computers", edited)
+
+        for product in stale.products:
+            product.description = "Scraped description"
+            product.reviews = ["Scraped review"]
+        self.assertEqual(self.repository.update_products("computers", stale.products, ["description", "reviews"]), 1)
+        saved = self.backend.load_collection("computers")
+        self.assertEqual([product.productID for product in saved.products], ["1"])
+        self.assertEqual(saved.products[0].name, "Laptop Pro")
+        self.assertEqual(saved.products[0].reviews, ["Scraped review"])
+        self.assertEqual(self.repository.get_collection("computers"), saved)
+        self.assertEqual(self.repository.update_products("missing", stale.products), 0)
+
+    def test_delete_collection(self) -> None:
+        self.repository.get_collection("computers")
+        self.repository.delete_collection("computers")
+        self.assertIsNone(self.repository.get_collection("computers"))
+        self.assertEqual(self.repository.list_summaries(), [])
+
+    def test_commit_partial_csv(self) -> None:
+        self.repository.get_collection("computers")
+        DataManager.append_products_to_partial_csv(self.folder, "computers", [self.tablet])
+        self.repository.commit_partial_csv(self.folder, "computers")
+        self.assertEqual([product.productID for product in self.repository.get_collection("computers").products], ["2"])
+
+    def test_replacing_the_backend_forgets_the_kept_collections(self) -> None:
+        self.repository.get_collection("computers")
+        self.repository._backend = CsvStorageBackend(os.path.join(self.folder, "other"))
+        self.assertIsNone(self.repository.get_collection("computers"))
+
+    def test_sqlite_changes_from_another_connection_are_loaded(self) -> None:
+        path = os.path.join(self.folder, "collections.sqlite")
+        backend = SqliteStorageBackend(path)
+        other = SqliteStorageBackend(path)
+        try:
+            repository = CollectionRepository(backend)
+            repository.save_collections([Collection("computers", [self.laptop])])
+            repository.get_collection("computers")
+            repository.get_collection("computers")
+            self.assertEqual((repository.hits, repository.misses), (1, 1))
+            other.save_product("computers", self.tablet)
+            self.assertEqual([product.productID for product in repository.get_collection("computers").products], ["1", "2"])
+        finally:
+            backend.close()
+            other.close()
+
+if __name__ == '__main__':
+    unittest.main()
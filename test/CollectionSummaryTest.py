@@ -0,0 +1,34 @@
+import unittest
+from src.backend.Collection import Collection
+from src.backend.CollectionSummary import CollectionSummary
+from src.backend.Product import Product
+
+class CollectionSummaryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.collection : Collection = Collection("computers", [
+            Product("1", "Laptop", 500.0, "https://www.test.co.uk/product/1", 4.5, "A laptop", ["Great"]),
+            Product("2", "Tablet", 200.0, "https://www.test.co.uk/product/2", 3.5, "A tablet", [])
+        ])
+
+    def test_from_collection(self) -> None:
+        summary = CollectionSummary.from_collection(self.collection)
+        self.assertEqual(summary.name, "computers")
+        self.assertEqual(summary.product_count, 2)
+        self.assertEqual(summary.average_price, 350.0)
+        self.assertEqual(summary.min_price, 200.0)
+        self.assertEqual(summary.max_price, 500.0)
+        self.assertEqual(summary.average_rating, 4.0)
+
+    def test_empty_collection(self) -> None:
+        summary = CollectionSummary.from_collection(Collection("empty", []))
+        self.assertEqual(summary.product_count, 0)
+        self.assertIsNone(summary.average_price)
+        self.assertIsNone(summary.average_rating)
+
+    def test_dictionary_round_trip(self) -> None:
+        summary = CollectionSummary.from_collection(self.collection)
+        self.assertEqual(CollectionSummary.from_dict(summary.to_dict()), summary)
+        self.assertNotEqual(CollectionSummary("computers", 1), summary)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from src.backend.CsvCodec import CsvCodec
+from src.backend.Product import Product
+
+class CsvCodecTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.product : Product = Product("1", "Laptop", 499.99, "https://www.test.co.uk/product/1", 4.5, "A laptop",
+                                         ["Great, \"fast\"", "It's light", "Ünïcode\nand a new line", "Back\\slash"])
+
+    def test_versions_are_recognised_from_the_header(self) -> None:
+        self.assertEqual(CsvCodec.for_header(CsvCodec.HEADERS[1]).version, 1)
+        self.assertEqual(CsvCodec.for_header(CsvCodec.HEADERS[2]).version, 2)
+        with self.assertRaises(ValueError):
+            CsvCodec.for_header(["productID", "name"])
+        with self.assertRaises(ValueError):
+            CsvCodec(3)
+
+    def test_new_files_use_json_reviews(self) -> None:
+        codec = CsvCodec()
+        self.assertEqual(codec.version, CsvCodec.VERSION)
+        self.assertEqual(codec.header[-1], "reviews_json")
+        self.assertEqual(codec.encode_reviews(["a", "b"]), '["a", "b"]')
+
+    def test_round_trip(self) -> None:
+        for version in CsvCodec.HEADERS:
+            codec = CsvCodec(version)
+            row = [str(cell) for cell in codec.encode_product(self.product)]
+            self.assertEqual(codec.decode_product(row), self.product)
+
+    def test_legacy_reviews(self) -> None:
+        legacy = CsvCodec(CsvCodec.LEGACY_VERSION)
+        self.assertEqual(legacy.decode_reviews(str(self.product.reviews)), self.product.reviews)
+        # Older CSV exports wrote JSON under the legacy header
+        self.assertEqual(legacy.decode_reviews('["Great", "It\'s light"]'), ["Great", "It's light"])
+        self.assertEqual(legacy.decode_reviews("[]"), [])
+
+if __name__ == '__main__':
+    unittest.main()
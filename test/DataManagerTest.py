@@ -1,6 +1,8 @@
 import unittest
 import os
+import shutil
 from src.backend.DataManager import DataManager
+from src.backend.CsvCodec import CsvCodec
 from src.backend.Collection import Collection
 from src.backend.Product import Product
 from typing import List
@@ -18,13 +20,17 @@ class DataManagerTest(unittest.TestCase):
                 reviews=["review1", "review2"]
             )])
     
+    def tearDown(self) -> None:
+        shutil.rmtree("ParquetTestFolder", ignore_errors=True)
+        shutil.rmtree("LegacyCsvTestFolder", ignore_errors=True)
+
     def test_save_collection_as_csv(self) -> None:
         DataManager.save_collections_to_csv_folder("CsvTestFolder", [self.testCollection])
         self.assertTrue(os.path.exists(os.path.join("CsvTestFolder", self.testCollection.name + ".csv")))
         with open(os.path.join("CsvTestFolder", self.testCollection.name + ".csv"), "r") as f:
             csvLines: List[str] = f.readlines()
-            self.assertEqual(csvLines[0], "productID,name,price,url,rating,description,reviews\n")
-            self.assertEqual(csvLines[1], "productID,productName,10.0,https://www.test.co.uk/,3.5,description,\"['review1', 'review2']\"\n")
+            self.assertEqual(csvLines[0], "productID,name,price,url,rating,description,reviews_json\n")
+            self.assertEqual(csvLines[1], "productID,productName,10.0,https://www.test.co.uk/,3.5,description,\"[\"\"review1\"\", \"\"review2\"\"]\"\n")
             
     def test_load_collections_from_csv_folder(self) -> None:
         DataManager.save_collections_to_csv_folder("CsvTestFolder", [self.testCollection])
@@ -32,6 +38,48 @@ class DataManagerTest(unittest.TestCase):
         self.assertEqual(len(collections), 1)
         self.assertEqual(collections[0], self.testCollection)
     
+    def test_load_legacy_csv(self) -> None:
+        os.makedirs("LegacyCsvTestFolder", exist_ok=True)
+        with open(os.path.join("LegacyCsvTestFolder", "test.csv"), "w") as f:
+            DataManager.write_collection_csv(f, self.testCollection, CsvCodec(CsvCodec.LEGACY_VERSION))
+        collections: List[Collection] = DataManager.load_collections_from_csv_folder("LegacyCsvTestFolder")
+        self.assertEqual(collections, [self.testCollection])
+
+    def test_legacy_partial_csv_is_appended_in_its_version(self) -> None:
+        DataManager.discard_partial_csv("LegacyCsvTestFolder", "legacy")
+        os.makedirs("LegacyCsvTestFolder", exist_ok=True)
+        partialPath = DataManager.get_partial_csv_path("LegacyCsvTestFolder", "legacy")
+        with open(partialPath, "w") as f:
+            DataManager.write_collection_csv(f, self.testCollection, CsvCodec(CsvCodec.LEGACY_VERSION))
+        otherProduct = Product("otherID", "otherName", 5.0, "https://www.test.co.uk/other", 4.0, "other", ["it's \"quoted\""])
+        DataManager.append_products_to_partial_csv("LegacyCsvTestFolder", "legacy", [otherProduct])
+        collection = DataManager.commit_partial_csv("LegacyCsvTestFolder", "legacy")
+        self.assertEqual(collection.products, self.testCollection.products + [otherProduct])
+
+    def test_partial_csv_is_appended_and_committed(self) -> None:
+        DataManager.discard_partial_csv("CsvTestFolder", "partial")
+        otherProduct = Product("otherID", "otherName", 5.0, "https://www.test.co.uk/other", 4.0, "other", [])
+        DataManager.append_products_to_partial_csv("CsvTestFolder", "partial", self.testCollection.products)
+        DataManager.append_products_to_partial_csv("CsvTestFolder", "partial", [otherProduct])
+        partialPath = DataManager.get_partial_csv_path("CsvTestFolder", "partial")
+        with open(partialPath, "r") as f:
+            self.assertEqual(f.readlines()[0], "productID,name,price,url,rating,description,reviews_json\n")
+        # Partial CSVs are not loaded as collections until they are committed
+        self.assertNotIn("partial", [collection.name for collection in DataManager.load_collections_from_csv_folder("CsvTestFolder")])
+
+        collection: Collection = DataManager.commit_partial_csv("CsvTestFolder", "partial")
+        self.assertFalse(os.path.exists(partialPath))
+        self.assertEqual(collection, Collection("partial", self.testCollection.products + [otherProduct]))
+        self.assertIn(collection, DataManager.load_collections_from_csv_folder("CsvTestFolder"))
+        os.remove(os.path.join("CsvTestFolder", "partial.csv"))
+
+    def test_discard_partial_csv(self) -> None:
+        DataManager.append_products_to_partial_csv("CsvTestFolder", "discarded", self.testCollection.products)
+        DataManager.discard_partial_csv("CsvTestFolder", "discarded")
+        self.assertFalse(os.path.exists(DataManager.get_partial_csv_path("CsvTestFolder", "discarded")))
+        with self.assertRaises(FileNotFoundError):
+            DataManager.commit_partial_csv("CsvTestFolder", "discarded")
+
     def test_save_collection_as_json(self) -> None:
         DataManager.save_collection_to_json("JsonTestFolder", self.testCollection)
         self.assertTrue(os.path.exists(os.path.join("JsonTestFolder", self.testCollection.name + ".json")))
@@ -52,5 +100,27 @@ class DataManagerTest(unittest.TestCase):
         collection: Collection = DataManager.load_collection_from_json(os.path.join("JsonTestFolder", self.testCollection.name + ".json"))
         self.assertEqual(collection, self.testCollection)
 
+    @unittest.skipUnless(DataManager.is_parquet_available(), "pyarrow is not installed")
+    def test_save_and_load_collection_as_parquet(self) -> None:
+        DataManager.save_collection_to_parquet("ParquetTestFolder", self.testCollection)
+        path = os.path.join("ParquetTestFolder", self.testCollection.name + ".parquet")
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(DataManager.load_collection_from_parquet(path), self.testCollection)
+
+    @unittest.skipUnless(DataManager.is_parquet_available(), "pyarrow is not installed")
+    def test_load_parquet_analytics_columns(self) -> None:
+        DataManager.save_collection_to_parquet("ParquetTestFolder", self.testCollection)
+        dataframe = DataManager.load_collection_dataframe_from_parquet(os.path.join("ParquetTestFolder", "test.parquet"))
+        self.assertEqual(list(dataframe.columns), DataManager.PARQUET_ANALYTICS_COLUMNS)
+        self.assertEqual(dataframe["price"].tolist(), [10.0])
+        self.assertEqual(dataframe["reviewsCount"].tolist(), [2])
+
+    @unittest.skipUnless(DataManager.is_parquet_available(), "pyarrow is not installed")
+    def test_convert_collection_to_parquet_bytes(self) -> None:
+        import pyarrow
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(pyarrow.BufferReader(DataManager.convert_collection_to_parquet_bytes(self.testCollection)))
+        self.assertEqual(DataManager.convert_arrow_table_to_collection("test", table), self.testCollection)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
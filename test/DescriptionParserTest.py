@@ -0,0 +1,81 @@
+import unittest
+from src.backend.DescriptionParser import available_parsers, parse_description, resolve_parser_name, DescriptionStreamParser
+
+class DescriptionParserTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.page : str = (
+            '<html><head><title>Product</title></head><body>'
+            '<div class="product-summary">Not the description</div>'
+            '<div class="product-description-content-text extra-class">'
+            '<p>First paragraph.</p>\n  <p>Second <b>bold</b> paragraph.</p>'
+            '</div></body></html>'
+        )
+
+    def test_all_parsers_extract_the_same_description(self) -> None:
+        for name, parserClass in available_parsers().items():
+            with self.subTest(parser=name):
+                self.assertEqual(parserClass().parse(self.page), "First paragraph.Secondboldparagraph.")
+
+    def test_script_and_style_text_is_left_out(self) -> None:
+        page = (
+            '<html><body><div class="product-description-content-text">'
+            'a<b>b</b><script>x = "</div>"</script>c<style>p { color: red }</style>&amp;d<!-- note -->e'
+            '</div></body></html>'
+        )
+        expected = parse_description("html.parser", page)
+        self.assertEqual(expected, "abc&de")
+        for name, parserClass in available_parsers().items():
+            with self.subTest(parser=name):
+                self.assertEqual(parserClass().parse(page), expected)
+        for chunkSize in [1, 7, len(page)]:
+            with self.subTest(chunkSize=chunkSize):
+                self.assertEqual(self.feed_in_chunks(page, chunkSize).description, expected)
+
+    def test_missing_description(self) -> None:
+        for name, parserClass in available_parsers().items():
+            with self.subTest(parser=name):
+                self.assertIsNone(parserClass().parse("<html><body><div>No description</div></body></html>"))
+
+    def test_parse_description_by_name(self) -> None:
+        self.assertEqual(parse_description("strainer", self.page), "First paragraph.Secondboldparagraph.")
+
+    def test_auto_resolves_to_an_available_parser(self) -> None:
+        self.assertIn(resolve_parser_name("auto"), available_parsers())
+
+    def test_unknown_parser(self) -> None:
+        with self.assertRaises(ValueError):
+            resolve_parser_name("unknown")
+
+    # Stream Parser Tests
+    def feed_in_chunks(self, page : str, chunkSize : int) -> DescriptionStreamParser:
+        parser = DescriptionStreamParser()
+        for i in range(0, len(page), chunkSize):
+            parser.feed_text(page[i:i + chunkSize])
+            if parser.complete:
+                break
+        return parser
+
+    def test_stream_parser_matches_full_parse(self) -> None:
+        expected = parse_description("html.parser", self.page)
+        for chunkSize in [1, 5, 64, len(self.page)]:
+            with self.subTest(chunkSize=chunkSize):
+                self.assertEqual(self.feed_in_chunks(self.page, chunkSize).description, expected)
+
+    def test_stream_parser_completes_before_end_of_page(self) -> None:
+        page = self.page.replace("</body>", "<div>" + "<p>rest of the page</p>" * 100 + "</div></body>")
+        parser = DescriptionStreamParser()
+        parser.feed_text(page[:len(self.page) - len("</body></html>")])
+        self.assertTrue(parser.complete)
+        self.assertEqual(parser.description, "First paragraph.Secondboldparagraph.")
+
+    def test_stream_parser_ignores_similar_class_names(self) -> None:
+        page = '<div class="product-description-content-text-wrapper">Wrong</div>' + self.page
+        self.assertEqual(self.feed_in_chunks(page, 16).description, "First paragraph.Secondboldparagraph.")
+
+    def test_stream_parser_incomplete_description(self) -> None:
+        parser = self.feed_in_chunks(self.page[:self.page.index("Second")], 10)
+        self.assertFalse(parser.complete)
+        self.assertIsNone(parser.description)
+
+if __name__ == '__main__':
+    unittest.main()
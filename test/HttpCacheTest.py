@@ -0,0 +1,58 @@
+import unittest
+import os
+import shutil
+import time
+from src.backend.HttpCache import HttpCache
+
+class HttpCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache : HttpCache = HttpCache(os.path.join("HttpCacheTestFolder", "cache.sqlite"), ttl=60)
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        shutil.rmtree("HttpCacheTestFolder", ignore_errors=True)
+
+    def test_missing_response(self) -> None:
+        self.assertIsNone(self.cache.get("https://www.test.co.uk/product/1"))
+
+    def test_put_and_get(self) -> None:
+        self.cache.put("https://www.test.co.uk/product/1", None, "<html></html>", etag='"abc"')
+        response = self.cache.get("https://www.test.co.uk/product/1")
+        self.assertEqual(response.body, "<html></html>")
+        self.assertEqual(response.etag, '"abc"')
+        self.assertTrue(response.can_revalidate)
+        self.assertTrue(self.cache.is_fresh(response))
+
+    def test_params_order_does_not_matter(self) -> None:
+        self.cache.put("https://www.test.co.uk/reviews", {"Limit": 100, "Offset": 0}, "[]")
+        self.assertIsNotNone(self.cache.get("https://www.test.co.uk/reviews", {"Offset": 0, "Limit": 100}))
+        self.assertIsNone(self.cache.get("https://www.test.co.uk/reviews", {"Offset": 100, "Limit": 100}))
+
+    def test_stale_response(self) -> None:
+        self.cache.put("https://www.test.co.uk/product/1", None, "body", last_modified="Mon, 13 Jan 2025 10:00:00 GMT")
+        response = self.cache.get("https://www.test.co.uk/product/1")
+        response.stored_at = time.time() - 120
+        self.assertFalse(self.cache.is_fresh(response))
+        self.assertTrue(self.cache.is_fresh(response, ttl=600))
+
+    def test_touch_refreshes_response(self) -> None:
+        self.cache.put("https://www.test.co.uk/product/1", None, "body")
+        before = self.cache.get("https://www.test.co.uk/product/1").stored_at
+        time.sleep(0.01)
+        self.cache.touch("https://www.test.co.uk/product/1")
+        self.assertGreater(self.cache.get("https://www.test.co.uk/product/1").stored_at, before)
+
+    def test_least_recently_used_evicted_when_full(self) -> None:
+        self.cache.put("https://www.test.co.uk/product/1", None, "body 1")
+        self.cache.max_size_bytes = self.cache.size()
+        self.cache.put("https://www.test.co.uk/product/2", None, "body 2")
+        self.assertIsNone(self.cache.get("https://www.test.co.uk/product/1"))
+        self.assertIsNotNone(self.cache.get("https://www.test.co.uk/product/2"))
+
+    def test_clear(self) -> None:
+        self.cache.put("https://www.test.co.uk/product/1", None, "body")
+        self.cache.clear()
+        self.assertEqual(self.cache.size(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import shutil
+import time
+from src.backend.Product import Product
+from src.backend.ProductStore import ProductStore
+
+class ProductStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store : ProductStore = ProductStore(os.path.join("ProductStoreTestFolder", "products.sqlite"))
+        self.product : Product = Product("1", "Laptop", 499.99, "https://www.test.co.uk/product/1", 4.5,
+                                         "A laptop", ["Great, \"fast\"", "Too heavy"])
+
+    def tearDown(self) -> None:
+        self.store.close()
+        shutil.rmtree("ProductStoreTestFolder", ignore_errors=True)
+
+    def test_missing_product(self) -> None:
+        self.assertIsNone(self.store.get("1"))
+
+    def test_put_and_get(self) -> None:
+        self.store.put(self.product)
+        stored = self.store.get("1")
+        self.assertEqual(stored.product.name, "Laptop")
+        self.assertEqual(stored.product.price, 499.99)
+        self.assertEqual(stored.product.description, "A laptop")
+        self.assertEqual(stored.product.reviews, ["Great, \"fast\"", "Too heavy"])
+        self.assertLess(stored.age, 60)
+
+    def test_max_age(self) -> None:
+        self.store.put(self.product, time.time() - 120)
+        self.assertIsNone(self.store.get("1", maxAge=60))
+        self.assertIsNotNone(self.store.get("1", maxAge=600))
+        self.assertIsNotNone(self.store.get("1"))
+
+    def test_older_scrape_does_not_replace_newer(self) -> None:
+        self.store.put(self.product)
+        older = Product("1", "Old Laptop", 599.99, self.product.url, 4.0, "An old laptop", [])
+        self.store.put(older, time.time() - 120)
+        self.assertEqual(self.store.get("1").product.name, "Laptop")
+
+        newer = Product("1", "New Laptop", 399.99, self.product.url, 4.8, "A new laptop", ["New"])
+        self.store.put(newer)
+        self.assertEqual(self.store.get("1").product.name, "New Laptop")
+        self.assertEqual(self.store.count(), 1)
+
+    def test_count_and_clear(self) -> None:
+        self.store.put_many([self.product, Product("2", "Tablet", 199.99, "https://www.test.co.uk/product/2", 4.0, "A tablet", [])])
+        self.assertEqual(self.store.count(), 2)
+        self.store.clear()
+        self.assertEqual(self.store.count(), 0)
+
+    def test_path_must_be_string(self) -> None:
+        with self.assertRaises(TypeError):
+            ProductStore(None)
+
+if __name__ == '__main__':
+    unittest.main()
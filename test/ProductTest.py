@@ -120,5 +120,15 @@ class ProductTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.testProduct.removeReview("")
 
+    # Copy Tests
+    def test_copy_is_equal_and_separate(self) -> None:
+        self.testProduct.addReview("review1")
+        copy = self.testProduct.copy()
+        self.assertEqual(copy, self.testProduct)
+        copy.addReview("review2")
+        copy.name = "Copy"
+        self.assertEqual(self.testProduct.reviews, ["review1"])
+        self.assertEqual(self.testProduct.name, "TestName")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,280 @@
+import unittest
+import asyncio
+from src.backend.RequestScheduler import TokenBucket, EndpointLimiter, FairWorkQueue, AimdConcurrencyController, RequestScheduler
+
+class RequestSchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler : RequestScheduler = RequestScheduler({
+            "search": {"rate": 2.0, "burst": 2, "max_concurrency": 1},
+            "product": {"rate": 4.0, "burst": 4, "max_concurrency": 2}
+        })
+
+    # Token Bucket Tests
+    def test_burst_is_available_immediately(self) -> None:
+        bucket = TokenBucket(rate=1.0, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+
+    def test_empty_bucket_queues_at_refill_rate(self) -> None:
+        bucket = TokenBucket(rate=10.0, burst=1)
+        bucket.reserve()
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_invalid_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, burst=1)
+
+    # Endpoint Limiter Tests
+    def test_rate_limited_halves_rate_and_drains_bucket(self) -> None:
+        limiter = EndpointLimiter("reviews", rate=4.0, burst=4, max_concurrency=2)
+        limiter.record_rate_limited()
+        self.assertEqual(limiter.rate, 2.0)
+        self.assertEqual(limiter.rate_limited_count, 1)
+        self.assertGreater(limiter.bucket.reserve(), 0.0)
+
+    def test_retry_after_pauses_endpoint(self) -> None:
+        limiter = EndpointLimiter("reviews", rate=4.0, burst=4, max_concurrency=2)
+        limiter.record_rate_limited(retryAfter=5.0)
+        self.assertEqual(limiter.rate, 2.0)
+        self.assertAlmostEqual(limiter.bucket.reserve(), 5.5, places=1)
+
+    def test_success_recovers_up_to_configured_rate(self) -> None:
+        limiter = EndpointLimiter("reviews", rate=1.0, burst=1, max_concurrency=1, recovery_step=0.3)
+        limiter.record_rate_limited()
+        for _ in range(5):
+            limiter.record_success()
+        self.assertEqual(limiter.rate, 1.0)
+
+    def test_concurrency_limit_is_respected(self) -> None:
+        limiter = EndpointLimiter("product", rate=1000.0, burst=100, max_concurrency=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(*[request() for _ in range(10)])
+
+        asyncio.run(run())
+        self.assertEqual(peak, 2)
+        # Limiter can be reused on a new event loop
+        asyncio.run(run())
+        self.assertEqual(limiter.in_flight, 0)
+
+    # Fair Work Queue Tests
+    def test_queue_concurrency_ceiling(self) -> None:
+        queue = FairWorkQueue(3)
+        peak = 0
+
+        async def request(owner):
+            nonlocal peak
+            async with queue.slot(owner):
+                peak = max(peak, queue.in_flight)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(*[request(f"product-{i % 4}") for i in range(20)])
+
+        asyncio.run(run())
+        self.assertEqual(peak, 3)
+        self.assertEqual(queue.in_flight, 0)
+        self.assertEqual(queue.granted_count, 20)
+
+    def test_owners_take_turns(self) -> None:
+        queue = FairWorkQueue(1)
+        order = []
+
+        async def request(owner):
+            async with queue.slot(owner):
+                order.append(owner)
+                await asyncio.sleep(0)
+
+        async def run():
+            # The heavy product queues all of its requests before the others queue theirs
+            await asyncio.gather(*[request("heavy") for _ in range(4)], request("light-1"), request("light-2"))
+
+        asyncio.run(run())
+        self.assertEqual(order, ["heavy", "heavy", "light-1", "light-2", "heavy", "heavy"])
+
+    def test_cancelled_request_gives_up_its_place(self) -> None:
+        queue = FairWorkQueue(1)
+
+        async def run():
+            await queue.acquire("first")
+            waiting = asyncio.create_task(queue.acquire("second"))
+            await asyncio.sleep(0)
+            self.assertEqual(queue.waiting_count, 1)
+            waiting.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting
+            self.assertEqual(queue.waiting_count, 0)
+            queue.release()
+            self.assertEqual(queue.in_flight, 0)
+
+        asyncio.run(run())
+
+    def test_raising_ceiling_starts_waiting_requests(self) -> None:
+        queue = FairWorkQueue(1)
+
+        async def run():
+            await queue.acquire("a")
+            waiting = asyncio.create_task(queue.acquire("b"))
+            await asyncio.sleep(0)
+            queue.set_max_concurrency(2)
+            await asyncio.wait_for(waiting, 1)
+            self.assertEqual(queue.in_flight, 2)
+
+        asyncio.run(run())
+
+    # AIMD Concurrency Controller Tests
+    def test_window_grows_additively_while_latency_is_stable(self) -> None:
+        queue = FairWorkQueue(1)
+        controller = AimdConcurrencyController(queue, minWindow=1, maxWindow=10, initialWindow=2)
+        for _ in range(2):
+            controller.record_latency(0.1)
+        # A full windows worth of responses grows the window by about one
+        self.assertAlmostEqual(controller.window, 2.9, places=1)
+        for _ in range(200):
+            controller.record_latency(0.1)
+        self.assertEqual(controller.window, 10)
+        self.assertEqual(queue.max_concurrency, 10)
+
+    def test_rate_limited_halves_window_once_per_round_trip(self) -> None:
+        queue = FairWorkQueue(1)
+        controller = AimdConcurrencyController(queue, minWindow=1, maxWindow=16, initialWindow=8)
+        controller.record_latency(10.0)
+        window = controller.window
+        controller.record_rate_limited()
+        controller.record_rate_limited()
+        self.assertEqual(controller.window, window / 2)
+        self.assertEqual(controller.decreases, 1)
+        self.assertEqual(queue.max_concurrency, 4)
+
+    def test_latency_spike_cuts_window(self) -> None:
+        queue = FairWorkQueue(1)
+        controller = AimdConcurrencyController(queue, minWindow=2, maxWindow=16, initialWindow=10, smoothing=1.0)
+        controller.record_latency(0.01)
+        window = controller.window
+        controller.record_latency(0.05)
+        self.assertAlmostEqual(controller.window, window * controller.latency_decrease_factor)
+        self.assertEqual(controller.decreases, 1)
+        # The window never drops below its minimum
+        for _ in range(20):
+            controller.last_decrease = float("-inf")
+            controller.record_rate_limited()
+        self.assertEqual(controller.window, 2)
+
+    def test_latency_cut_keeps_the_fastest_round_trip(self) -> None:
+        controller = AimdConcurrencyController(FairWorkQueue(1), minWindow=1, maxWindow=16, initialWindow=10, smoothing=1.0)
+        controller.record_latency(0.01)
+        controller.record_latency(0.05)
+        self.assertEqual(controller.decreases, 1)
+        self.assertEqual(controller.round_trips[""].min_rtt, 0.01)
+        # Response times that are still slow keep cutting the window, once per round trip
+        controller.last_decrease = float("-inf")
+        controller.record_latency(0.05)
+        self.assertEqual(controller.decreases, 2)
+
+    def test_fastest_round_trip_is_forgotten_once_old(self) -> None:
+        controller = AimdConcurrencyController(FairWorkQueue(1), minWindow=1, maxWindow=16, initialWindow=4, smoothing=1.0)
+        controller.record_latency(0.01)
+        controller.round_trips[""].min_rtt_expires_at = float("-inf")
+        controller.record_latency(0.05)
+        self.assertEqual(controller.round_trips[""].min_rtt, 0.05)
+        # Response times close to the new baseline grow the window again
+        window = controller.window
+        controller.record_latency(0.06)
+        self.assertGreater(controller.window, window)
+
+    def test_endpoints_with_different_steady_latencies_grow_the_window(self) -> None:
+        controller = AimdConcurrencyController(FairWorkQueue(1), minWindow=1, maxWindow=16, initialWindow=2)
+        for _ in range(100):
+            controller.record_latency(0.01, "search")
+            controller.record_latency(0.2, "reviews")
+        self.assertEqual(controller.decreases, 0)
+        self.assertEqual(controller.window, 16)
+        self.assertEqual(controller.stats()["roundTrips"]["search"]["minRtt"], 0.01)
+        # A slowdown is still seen against the endpoints own baseline
+        controller.last_decrease = float("-inf")
+        for _ in range(10):
+            controller.record_latency(0.05, "search")
+        self.assertGreater(controller.decreases, 0)
+
+    def test_controller_stats(self) -> None:
+        controller = AimdConcurrencyController(FairWorkQueue(1), initialWindow=4)
+        controller.record_latency(0.5)
+        stats = controller.stats()
+        self.assertEqual(stats["smoothedRtt"], 0.5)
+        self.assertAlmostEqual(stats["rate"], stats["window"] / 0.5)
+
+    def test_invalid_window_limits(self) -> None:
+        with self.assertRaises(ValueError):
+            AimdConcurrencyController(FairWorkQueue(1), minWindow=4, maxWindow=2)
+
+    # Request Scheduler Tests
+    def test_scheduler_feeds_adaptive_concurrency(self) -> None:
+        scheduler = RequestScheduler(
+            {"product": {"rate": 4.0, "burst": 4, "max_concurrency": 2}},
+            adaptiveConcurrency={"minWindow": 1, "maxWindow": 8, "initialWindow": 4}
+        )
+        scheduler.record_success("product", 0.1)
+        scheduler.record_rate_limited("product")
+        self.assertEqual(scheduler.stats()["concurrency"]["decreases"], 1)
+        self.assertEqual(scheduler.stats()["concurrency"]["roundTrips"]["product"]["smoothedRtt"], 0.1)
+        self.assertEqual(scheduler.queue.max_concurrency, 2)
+
+    def test_request_uses_queue_and_endpoint_limiter(self) -> None:
+        scheduler = RequestScheduler({"product": {"rate": 1000.0, "burst": 100, "max_concurrency": 5}}, maxConcurrency=2)
+
+        async def run():
+            async with scheduler.request("product", "product-1") as limiter:
+                self.assertEqual(limiter.in_flight, 1)
+                self.assertEqual(scheduler.queue.in_flight, 1)
+
+        asyncio.run(run())
+        self.assertEqual(scheduler.stats()["queue"]["maxConcurrency"], 2)
+
+    def test_paused_endpoint_does_not_hold_queue_slots(self) -> None:
+        scheduler = RequestScheduler({
+            "reviews": {"rate": 100.0, "burst": 1, "max_concurrency": 16},
+            "product": {"rate": 100.0, "burst": 1, "max_concurrency": 1}
+        }, maxConcurrency=4)
+        scheduler.record_rate_limited("reviews", 5.0)
+
+        async def request(name, owner):
+            async with scheduler.request(name, owner):
+                pass
+
+        async def run():
+            reviews = [asyncio.create_task(request("reviews", f"product-{i}")) for i in range(16)]
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.queue.in_flight, 0)
+            await asyncio.wait_for(request("product", "product-other"), timeout=1.0)
+            for task in reviews:
+                task.cancel()
+            await asyncio.gather(*reviews, return_exceptions=True)
+
+        asyncio.run(run())
+        self.assertEqual(scheduler.queue.in_flight, 0)
+        self.assertEqual(scheduler.limit("reviews").in_flight, 0)
+
+    def test_endpoints_are_independent(self) -> None:
+        self.scheduler.record_rate_limited("search")
+        self.assertEqual(self.scheduler.limit("search").rate, 1.0)
+        self.assertEqual(self.scheduler.limit("product").rate, 4.0)
+
+    def test_unknown_endpoint(self) -> None:
+        with self.assertRaises(KeyError):
+            self.scheduler.limit("unknown")
+
+    def test_stats(self) -> None:
+        self.scheduler.record_rate_limited("product")
+        stats = self.scheduler.stats()
+        self.assertEqual(stats["product"]["rateLimited"], 1)
+        self.assertEqual(stats["search"]["maxConcurrency"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
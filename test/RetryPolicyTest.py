@@ -0,0 +1,90 @@
+import unittest
+import asyncio
+import email.utils
+import time
+from src.backend.RetryPolicy import RetryPolicy, RetryBudget
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_invalid_attempts(self) -> None:
+        with self.assertRaises(ValueError):
+            RetryPolicy(attempts=0)
+
+    def test_retryable_statuses(self) -> None:
+        policy = RetryPolicy()
+        for status in [429, 500, 502, 503, 504]:
+            self.assertTrue(policy.is_retryable_status(status))
+        for status in [200, 304, 404]:
+            self.assertFalse(policy.is_retryable_status(status))
+        self.assertFalse(RetryPolicy(statuses={503}).is_retryable_status(429))
+
+    def test_parse_retry_after(self) -> None:
+        self.assertEqual(RetryPolicy.parse_retry_after("5"), 5.0)
+        self.assertEqual(RetryPolicy.parse_retry_after(" 0 "), 0.0)
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+        self.assertIsNone(RetryPolicy.parse_retry_after("soon"))
+        inTenSeconds = email.utils.formatdate(time.time() + 10, usegmt=True)
+        self.assertAlmostEqual(RetryPolicy.parse_retry_after(inTenSeconds), 10.0, delta=1.5)
+        self.assertEqual(RetryPolicy.parse_retry_after("Mon, 13 Jan 2020 10:00:00 GMT"), 0.0)
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = RetryPolicy(attempts=10, baseDelay=1.0, maxDelay=5.0, seed=0)
+        delays = [policy.retry_delay(0) for _ in range(50)]
+        self.assertTrue(all(0 <= delay <= 1.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+        self.assertTrue(all(0 <= policy.retry_delay(8) <= 5.0 for _ in range(50)))
+
+    def test_retry_after_is_honoured(self) -> None:
+        policy = RetryPolicy(baseDelay=0.5, maxRetryAfter=60.0, seed=0)
+        delay = policy.retry_delay(0, retryAfter=10.0)
+        self.assertGreaterEqual(delay, 10.0)
+        self.assertLessEqual(delay, 10.5)
+        # Too long to wait, give up instead
+        self.assertIsNone(policy.retry_delay(0, retryAfter=120.0))
+
+    def test_gives_up_after_attempts(self) -> None:
+        policy = RetryPolicy(attempts=3)
+        self.assertIsNotNone(policy.retry_delay(0))
+        self.assertIsNotNone(policy.retry_delay(1))
+        self.assertIsNone(policy.retry_delay(2))
+        self.assertIsNone(RetryPolicy(attempts=1).retry_delay(0))
+
+    def test_counters(self) -> None:
+        policy = RetryPolicy()
+        policy.record(RetryPolicy.RETRIED)
+        policy.record(RetryPolicy.RETRIED)
+        policy.record(RetryPolicy.RECOVERED)
+        self.assertEqual(policy.stats(), {"retried": 2, "recovered": 1})
+
+class RetryBudgetTest(unittest.TestCase):
+    def test_budget_grows_with_requests(self) -> None:
+        budget = RetryBudget(minRetries=1, retryRatio=0.5)
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        budget.record_request()
+        budget.record_request()
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        self.assertEqual(budget.retries, 2)
+        self.assertEqual(budget.exhausted, 2)
+
+    def test_each_scrape_has_its_own_budget(self) -> None:
+        self.assertIsNone(RetryBudget.current())
+
+        async def scrape(budget):
+            with RetryBudget.track(budget):
+                await asyncio.sleep(0)
+                await asyncio.create_task(spend())
+
+        async def spend():
+            RetryBudget.current().try_spend()
+
+        first, second = RetryBudget(), RetryBudget()
+        async def scrape_both():
+            await asyncio.gather(scrape(first), scrape(second), scrape(first))
+        asyncio.run(scrape_both())
+        self.assertEqual(first.retries, 2)
+        self.assertEqual(second.retries, 1)
+        self.assertIsNone(RetryBudget.current())
+
+if __name__ == '__main__':
+    unittest.main()
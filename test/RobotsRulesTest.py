@@ -0,0 +1,59 @@
+import unittest
+from src.backend.RobotsRules import RobotsRules
+
+class RobotsRulesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rules : RobotsRules = RobotsRules.parse(
+            "# Example robots.txt\n"
+            "User-agent: *\n"
+            "Disallow: /basket\n"
+            "Disallow: /product/*/compare\n"
+            "Disallow: /*.pdf$\n"
+            "Disallow: /search/\n"
+            "Allow: /search/tablet\n"
+            "\n"
+            "User-agent: badbot\n"
+            "User-agent: otherbot\n"
+            "Disallow: /\n"
+            "\n"
+            "User-agent: badbot\n"
+            "Allow: /product/\n"
+        )
+
+    def test_prefix_rules(self) -> None:
+        self.assertFalse(self.rules.is_allowed("/basket/items"))
+        self.assertTrue(self.rules.is_allowed("/product/123"))
+
+    def test_wildcard_rules(self) -> None:
+        self.assertFalse(self.rules.is_allowed("/product/123/compare"))
+        self.assertFalse(self.rules.is_allowed("/help/manual.pdf"))
+        self.assertTrue(self.rules.is_allowed("/help/manual.pdf?download=true"))
+
+    def test_longest_match_wins(self) -> None:
+        self.assertFalse(self.rules.is_allowed("/search/computer/"))
+        self.assertTrue(self.rules.is_allowed("/search/tablet/"))
+
+    def test_allow_wins_when_equally_specific(self) -> None:
+        rules = RobotsRules.parse("User-agent: *\nDisallow: /page\nAllow: /page\n")
+        self.assertTrue(rules.is_allowed("/page"))
+
+    def test_user_agent_groups(self) -> None:
+        self.assertFalse(self.rules.is_allowed("/help", "otherbot"))
+        # Groups for the same user agent are merged
+        self.assertFalse(self.rules.is_allowed("/help", "BadBot"))
+        self.assertTrue(self.rules.is_allowed("/product/123", "badbot"))
+        # Unknown user agents fall back to the * group
+        self.assertTrue(self.rules.is_allowed("/help", "goodbot"))
+
+    def test_empty_disallow_allows_everything(self) -> None:
+        rules = RobotsRules.parse("User-agent: *\nDisallow:\n")
+        self.assertTrue(rules.is_allowed("/anything"))
+
+    def test_empty_robots_txt(self) -> None:
+        self.assertTrue(RobotsRules.parse("").is_allowed("/product/123"))
+
+    def test_robots_txt_always_allowed(self) -> None:
+        self.assertTrue(RobotsRules.parse("User-agent: *\nDisallow: /\n").is_allowed("/robots.txt"))
+
+if __name__ == '__main__':
+    unittest.main()
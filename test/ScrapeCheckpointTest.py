@@ -0,0 +1,76 @@
+import unittest
+import os
+import shutil
+import time
+from src.backend.ScrapeCheckpoint import ScrapeCheckpoint
+
+class ScrapeCheckpointTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path : str = os.path.join("CheckpointTestFolder", "laptop.json")
+        self.checkpoint : ScrapeCheckpoint = ScrapeCheckpoint(self.path, "laptop")
+
+    def tearDown(self) -> None:
+        shutil.rmtree("CheckpointTestFolder", ignore_errors=True)
+
+    def test_missing_checkpoint(self) -> None:
+        self.assertIsNone(ScrapeCheckpoint.load(self.path))
+
+    def test_save_and_load(self) -> None:
+        self.checkpoint.record_search_page(1, [{"id": "1"}, {"id": "2"}], 3)
+        self.checkpoint.record_description("2", "A laptop")
+        self.checkpoint.record_review_page("2", 100, ["Great", "Too heavy"])
+        self.checkpoint.record_product_completed("1")
+        self.checkpoint.save()
+
+        loaded = ScrapeCheckpoint.load(self.path)
+        self.assertEqual(loaded.product_name, "laptop")
+        self.assertEqual(loaded.get_search_page(1), ([{"id": "1"}, {"id": "2"}], 3))
+        self.assertEqual(loaded.get_search_page(2), (None, None))
+        self.assertTrue(loaded.is_product_completed("1"))
+        self.assertFalse(loaded.is_product_completed("2"))
+        self.assertEqual(loaded.get_description("2"), "A laptop")
+        self.assertEqual(loaded.get_review_page("2", 100), ["Great", "Too heavy"])
+        self.assertIsNone(loaded.get_review_page("2", 0))
+
+    def test_completed_products_drop_their_progress(self) -> None:
+        self.checkpoint.record_description("1", "A laptop")
+        self.checkpoint.record_product_completed("1")
+        self.assertIsNone(self.checkpoint.get_description("1"))
+        self.assertEqual(self.checkpoint.products_in_progress, {})
+
+    def test_saves_are_throttled(self) -> None:
+        self.checkpoint.record_product_completed("1")
+        self.assertTrue(os.path.exists(self.path))
+        self.checkpoint.record_product_completed("2")
+        self.assertTrue(self.checkpoint.dirty)
+        self.assertFalse(ScrapeCheckpoint.load(self.path).is_product_completed("2"))
+
+    def test_track_saves_on_exit(self) -> None:
+        with ScrapeCheckpoint.track(self.checkpoint):
+            self.assertIs(ScrapeCheckpoint.current(), self.checkpoint)
+            self.checkpoint.record_product_completed("1")
+            self.checkpoint.record_product_completed("2")
+        self.assertIsNone(ScrapeCheckpoint.current())
+        self.assertTrue(ScrapeCheckpoint.load(self.path).is_product_completed("2"))
+
+    def test_old_checkpoint_is_not_loaded(self) -> None:
+        self.checkpoint.created_at = time.time() - 120
+        self.checkpoint.save()
+        self.assertIsNone(ScrapeCheckpoint.load(self.path, maxAge=60))
+        self.assertIsNotNone(ScrapeCheckpoint.load(self.path, maxAge=600))
+
+    def test_unreadable_checkpoint_is_not_loaded(self) -> None:
+        os.makedirs("CheckpointTestFolder")
+        with open(self.path, "w") as file:
+            file.write("{not json")
+        self.assertIsNone(ScrapeCheckpoint.load(self.path))
+
+    def test_delete(self) -> None:
+        self.assertTrue(self.checkpoint.is_empty)
+        self.checkpoint.record_product_completed("1")
+        self.assertFalse(self.checkpoint.is_empty)
+        self.checkpoint.delete()
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
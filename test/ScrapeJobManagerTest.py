@@ -0,0 +1,137 @@
+import unittest
+import asyncio
+import os
+import shutil
+import time
+from src.backend.ScraperRuntime import ScraperRuntime
+from src.backend.ScrapeJobManager import ScrapeJobManager, ScrapeJob
+from src.backend.ScrapeProgress import ScrapeProgress
+from src.backend.ScrapeTracer import ScrapeTracer
+
+class ScrapeJobManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager : ScrapeJobManager = ScrapeJobManager(ScraperRuntime.get(), maxConcurrentJobs=1)
+        self.savedTraceSettings = (ScrapeJobManager.TRACE_JOBS, ScrapeJobManager.TRACE_FOLDER)
+        ScrapeJobManager.TRACE_JOBS = True
+        ScrapeJobManager.TRACE_FOLDER = "JobTraceTestFolder"
+
+    def tearDown(self) -> None:
+        ScrapeJobManager.TRACE_JOBS, ScrapeJobManager.TRACE_FOLDER = self.savedTraceSettings
+        shutil.rmtree("JobTraceTestFolder", ignore_errors=True)
+
+    def wait_for(self, job : ScrapeJob, timeout : float = 5.0) -> None:
+        deadline = time.time() + timeout
+        while not job.is_finished and time.time() < deadline:
+            time.sleep(0.01)
+
+    def make_work(self, result, delay : float = 0.0):
+        async def work(client):
+            await asyncio.sleep(delay)
+            return result, f"Finished {result}"
+        return work
+
+    def test_completed_job(self) -> None:
+        job = self.manager.submit("search", "laptop", self.make_work("laptop"))
+        self.wait_for(job)
+        self.assertEqual(job.status, ScrapeJob.COMPLETED)
+        self.assertEqual(job.result, "laptop")
+        self.assertEqual(job.message, "Finished laptop")
+        self.assertIs(self.manager.last_finished_job, job)
+
+    def test_job_reports_to_its_own_progress(self) -> None:
+        async def work(client):
+            ScrapeProgress.current().record_products_discovered(4)
+            ScrapeProgress.current().record_product_scraped()
+            return None, "Finished"
+        job = self.manager.submit("search", "laptop", work)
+        self.wait_for(job)
+        self.assertEqual(job.progress.products_discovered, 4)
+        self.assertEqual(job.progress.products_scraped, 1)
+
+    def test_job_is_traced(self) -> None:
+        async def work(client):
+            with ScrapeTracer.phase("search_page"):
+                await asyncio.sleep(0.01)
+            return None, "Finished"
+        job = self.manager.submit("search", "laptop", work)
+        self.wait_for(job)
+        self.assertEqual(job.trace_summary["search_page"]["count"], 1)
+        self.assertEqual(job.trace_summary["job"]["count"], 1)
+        self.assertEqual(job.trace_path, os.path.join("JobTraceTestFolder", f"{job.jobId}.json"))
+        self.assertTrue(os.path.exists(job.trace_path))
+
+    def test_jobs_are_not_traced_by_default(self) -> None:
+        ScrapeJobManager.TRACE_JOBS = self.savedTraceSettings[0]
+        self.assertFalse(ScrapeJobManager.TRACE_JOBS)
+        job = self.manager.submit("search", "laptop", self.make_work("laptop"))
+        self.wait_for(job)
+        self.assertEqual(job.status, ScrapeJob.COMPLETED)
+        self.assertIsNone(job.trace_path)
+        self.assertFalse(os.path.exists("JobTraceTestFolder"))
+
+    def test_failed_job(self) -> None:
+        async def work(client):
+            raise ValueError("bad page")
+        job = self.manager.submit("search", "laptop", work)
+        self.wait_for(job)
+        self.assertEqual(job.status, ScrapeJob.FAILED)
+        self.assertIn("bad page", job.message)
+
+    def test_duplicate_jobs_are_not_run_twice(self) -> None:
+        first = self.manager.submit("search", "Laptop", self.make_work("first", 0.2))
+        second = self.manager.submit("search", " laptop ", self.make_work("second"))
+        other = self.manager.submit("refresh", "laptop", self.make_work("other"))
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.wait_for(other)
+        # Once finished the same search can be submitted again
+        third = self.manager.submit("search", "laptop", self.make_work("third"))
+        self.assertIsNot(first, third)
+        self.wait_for(third)
+
+    def test_jobs_beyond_the_limit_are_queued(self) -> None:
+        first = self.manager.submit("search", "laptop", self.make_work("laptop", 0.2))
+        second = self.manager.submit("search", "tablet", self.make_work("tablet"))
+        time.sleep(0.1)
+        self.assertEqual(first.status, ScrapeJob.RUNNING)
+        self.assertEqual(second.status, ScrapeJob.QUEUED)
+        self.wait_for(second)
+        self.assertEqual(second.status, ScrapeJob.COMPLETED)
+        self.assertGreaterEqual(second.started_at, first.finished_at)
+
+    def test_cancel_running_and_queued_jobs(self) -> None:
+        running = self.manager.submit("search", "laptop", self.make_work("laptop", 10))
+        queued = self.manager.submit("search", "tablet", self.make_work("tablet"))
+        time.sleep(0.1)
+        self.assertTrue(self.manager.cancel(running.jobId))
+        self.assertTrue(self.manager.cancel(queued.jobId))
+        self.wait_for(running)
+        self.wait_for(queued)
+        self.assertEqual(running.status, ScrapeJob.CANCELLED)
+        self.assertEqual(queued.status, ScrapeJob.CANCELLED)
+        self.assertEqual(self.manager.active_jobs(), [])
+        self.assertFalse(self.manager.cancel(running.jobId))
+        # The cancelled job is traced before it finishes, so into the test folder
+        self.assertEqual(running.trace_path, os.path.join("JobTraceTestFolder", f"{running.jobId}.json"))
+
+    def test_cancelled_job_is_finished_once_it_has_stopped(self) -> None:
+        cleanedUp = []
+        async def work(client):
+            try:
+                await asyncio.sleep(10)
+            finally:
+                await asyncio.sleep(0.2)
+                cleanedUp.append(True)
+            return None, "Finished"
+        job = self.manager.submit("search", "laptop", work)
+        time.sleep(0.1)
+        self.assertTrue(self.manager.cancel(job.jobId))
+        time.sleep(0.05)
+        self.assertEqual(job.status, ScrapeJob.RUNNING)
+        self.assertIs(self.manager.submit("search", "laptop", self.make_work("again")), job)
+        self.wait_for(job)
+        self.assertEqual(job.status, ScrapeJob.CANCELLED)
+        self.assertEqual(cleanedUp, [True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import asyncio
+from aiohttp import web
+import aiohttp
+from src.backend.ScrapeProgress import ScrapeProgress
+
+class ScrapeProgressTest(unittest.TestCase):
+    def test_no_progress_outside_of_a_scrape(self) -> None:
+        self.assertIsNone(ScrapeProgress.current())
+
+    def test_track_sets_current_progress(self) -> None:
+        progress = ScrapeProgress()
+        with ScrapeProgress.track(progress):
+            self.assertIs(ScrapeProgress.current(), progress)
+        self.assertIsNone(ScrapeProgress.current())
+
+    def test_tasks_inherit_current_progress(self) -> None:
+        async def scrape_product():
+            ScrapeProgress.current().record_product_scraped()
+
+        async def scrape(progress):
+            with ScrapeProgress.track(progress):
+                await asyncio.gather(*(asyncio.create_task(scrape_product()) for _ in range(3)))
+
+        first, second = ScrapeProgress(), ScrapeProgress()
+        async def scrape_both():
+            await asyncio.gather(scrape(first), scrape(second))
+        asyncio.run(scrape_both())
+        self.assertEqual(first.products_scraped, 3)
+        self.assertEqual(second.products_scraped, 3)
+
+    def test_record_response(self) -> None:
+        progress = ScrapeProgress()
+        progress.record_response(200)
+        progress.record_response(429)
+        self.assertEqual(progress.requests_sent, 2)
+        self.assertEqual(progress.rate_limited, 1)
+        self.assertGreater(progress.request_rate, 0)
+        self.assertEqual(progress.to_dict()["requests_sent"], 2)
+
+    def test_trace_config_records_responses(self) -> None:
+        async def handler(request):
+            return web.Response(status=429 if request.path == "/limited" else 200, text="ok")
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/{path}", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            progress = ScrapeProgress()
+            try:
+                async with aiohttp.ClientSession(trace_configs=[ScrapeProgress.create_trace_config()]) as session:
+                    # Requests made outside of a scrape are not recorded against it
+                    async with session.get(f"http://127.0.0.1:{port}/ok"):
+                        pass
+                    with ScrapeProgress.track(progress):
+                        for path in ["ok", "limited", "ok"]:
+                            async with session.get(f"http://127.0.0.1:{port}/{path}"):
+                                pass
+            finally:
+                await runner.cleanup()
+            return progress
+
+        progress = asyncio.run(run())
+        self.assertEqual(progress.requests_sent, 3)
+        self.assertEqual(progress.rate_limited, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import asyncio
+import json
+import os
+import shutil
+from src.backend.ScrapeTracer import ScrapeTracer
+
+class ScrapeTracerTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        shutil.rmtree("TraceTestFolder", ignore_errors=True)
+
+    def test_phases_are_ignored_without_a_tracer(self) -> None:
+        self.assertIsNone(ScrapeTracer.current())
+        with ScrapeTracer.phase("search_page"):
+            pass
+        ScrapeTracer.record_phase("rate_limit_wait", ScrapeTracer.now())
+
+    def test_spans_are_summarised_by_phase(self) -> None:
+        tracer = ScrapeTracer()
+        with ScrapeTracer.track(tracer):
+            self.assertIs(ScrapeTracer.current(), tracer)
+            with ScrapeTracer.phase("reviews", offset=0):
+                pass
+            with ScrapeTracer.phase("reviews", offset=100):
+                pass
+            startedAt = ScrapeTracer.now()
+            ScrapeTracer.record_phase("rate_limit_wait", startedAt - 0.5, endpoint="reviews")
+        self.assertIsNone(ScrapeTracer.current())
+
+        summary = tracer.summary()
+        self.assertEqual(list(summary.keys()), ["rate_limit_wait", "reviews"])
+        self.assertEqual(summary["reviews"]["count"], 2)
+        self.assertGreaterEqual(summary["rate_limit_wait"]["total"], 0.5)
+        self.assertEqual(summary["rate_limit_wait"]["max"], summary["rate_limit_wait"]["total"])
+        self.assertEqual(tracer.events[0]["args"], {"offset": 0})
+
+    def test_each_task_gets_its_own_track(self) -> None:
+        tracer = ScrapeTracer()
+        async def fetch(name):
+            with ScrapeTracer.phase("description", name):
+                await asyncio.sleep(0.01)
+        async def scrape():
+            with ScrapeTracer.track(tracer):
+                await asyncio.gather(
+                    asyncio.create_task(fetch("first"), name="product-1"), 
+                    asyncio.create_task(fetch("second"), name="product-2")
+                )
+                await asyncio.to_thread(lambda: ScrapeTracer.record_phase("csv_write", ScrapeTracer.now()))
+        asyncio.run(scrape())
+
+        tracks = {event["name"]: event["tid"] for event in tracer.events}
+        self.assertEqual(len(set(tracks.values())), 3)
+        trace = tracer.to_chrome_trace()
+        trackNames = {event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "thread_name"}
+        self.assertTrue({"product-1", "product-2"} <= trackNames)
+
+    def test_export_chrome_trace(self) -> None:
+        tracer = ScrapeTracer("search 'laptop'")
+        with tracer.span("search_page", "search page 1", page=1):
+            pass
+        path = tracer.export_chrome_trace(os.path.join("TraceTestFolder", "trace.json"))
+        with open(path, "r") as file:
+            trace = json.load(file)
+
+        spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]["name"], "search page 1")
+        self.assertEqual(spans[0]["cat"], "search_page")
+        self.assertGreaterEqual(spans[0]["dur"], 0)
+        self.assertEqual(trace["otherData"]["name"], "search 'laptop'")
+        self.assertFalse(os.path.exists(path + ".tmp"))
+
+    def test_events_beyond_the_limit_are_dropped(self) -> None:
+        ScrapeTracer.MAX_EVENTS, savedMaxEvents = 2, ScrapeTracer.MAX_EVENTS
+        try:
+            tracer = ScrapeTracer()
+            for _ in range(3):
+                with tracer.span("parse"):
+                    pass
+        finally:
+            ScrapeTracer.MAX_EVENTS = savedMaxEvents
+        self.assertEqual(len(tracer.events), 2)
+        self.assertEqual(tracer.dropped_events, 1)
+        self.assertEqual(tracer.summary()["parse"]["count"], 3)
+
+if __name__ == '__main__':
+    unittest.main()
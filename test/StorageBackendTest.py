@@ -0,0 +1,198 @@
+import unittest
+import json
+import os
+import shutil
+from src.backend.Collection import Collection
+from src.backend.CollectionSummary import CollectionSummary
+from src.backend.Product import Product
+from src.backend.DataManager import DataManager
+from src.backend.StorageBackend import StorageBackend, CsvStorageBackend
+from src.backend.SqliteStorageBackend import SqliteStorageBackend
+
+"""
+Tests every storage backend must pass, run against each backend by the test cases below
+"""
+class StorageBackendTests:
+    folder : str = "StorageTestFolder"
+
+    def create_backend(self) -> StorageBackend:
+        raise NotImplementedError
+
+    def setUp(self) -> None:
+        self.backend : StorageBackend = self.create_backend()
+        self.laptop : Product = Product("1", "Laptop", 499.99, "https://www.test.co.uk/product/1", 4.5,
+                                        "A laptop", ["Great, \"fast\"", "Too heavy"])
+        self.tablet : Product = Product("2", "Tablet", 199.99, "https://www.test.co.uk/product/2", 4.0, "A tablet", [])
+        self.collection : Collection = Collection("computers", [self.laptop, self.tablet])
+
+    def tearDown(self) -> None:
+        self.backend.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_empty_storage(self) -> None:
+        self.assertEqual(self.backend.list_collection_names(), [])
+        self.assertEqual(self.backend.load_collections(), [])
+        self.assertIsNone(self.backend.load_collection("computers"))
+        self.assertIsNone(self.backend.get_product("computers", "1"))
+        self.assertFalse(self.backend.delete_product("computers", "1"))
+
+    def test_save_and_load_collections(self) -> None:
+        self.backend.save_collections([self.collection, Collection("empty", [])])
+        self.assertEqual(self.backend.list_collection_names(), ["computers", "empty"])
+        loaded = self.backend.load_collection("computers")
+        self.assertEqual(loaded.name, "computers")
+        self.assertEqual([product.productID for product in loaded.products], ["1", "2"])
+        self.assertEqual(loaded.products[0].price, 499.99)
+        self.assertEqual(loaded.products[0].reviews, ["Great, \"fast\"", "Too heavy"])
+        self.assertEqual(loaded.products[1].reviews, [])
+        self.assertEqual(sorted(collection.name for collection in self.backend.load_collections()), ["computers", "empty"])
+
+    def test_saving_a_collection_replaces_it(self) -> None:
+        self.backend.save_collections([self.collection])
+        self.backend.save_collections([Collection("computers", [self.tablet])])
+        self.assertEqual([product.productID for product in self.backend.load_collection("computers").products], ["2"])
+
+    def test_save_product(self) -> None:
+        self.backend.save_collections([self.collection])
+        updated = Product("1", "Laptop Pro", 599.99, self.laptop.url, 4.8, "A better laptop", ["Faster"])
+        self.backend.save_product("computers", updated)
+        added = Product("3", "Monitor", 99.99, "https://www.test.co.uk/product/3", 3.5, "A monitor", ["Bright"])
+        self.backend.save_product("computers", added)
+
+        loaded = self.backend.load_collection("computers")
+        self.assertEqual([product.productID for product in loaded.products], ["1", "2", "3"])
+        self.assertEqual(loaded.products[0].name, "Laptop Pro")
+        self.assertEqual(loaded.products[0].reviews, ["Faster"])
+        self.assertEqual(self.backend.get_product("computers", "3").reviews, ["Bright"])
+        # Saving a product of a collection that does not exist yet creates it
+        self.backend.save_product("monitors", added)
+        self.assertEqual(self.backend.get_product("monitors", "3").name, "Monitor")
+
+    def test_delete_product(self) -> None:
+        self.backend.save_collections([self.collection])
+        self.assertTrue(self.backend.delete_product("computers", "1"))
+        self.assertFalse(self.backend.delete_product("computers", "1"))
+        self.assertIsNone(self.backend.get_product("computers", "1"))
+        self.assertEqual([product.productID for product in self.backend.load_collection("computers").products], ["2"])
+
+    def test_delete_collection(self) -> None:
+        self.backend.save_collections([self.collection])
+        self.backend.delete_collection("computers")
+        self.assertIsNone(self.backend.load_collection("computers"))
+        self.assertEqual(self.backend.list_collection_names(), [])
+
+    def test_collection_summaries(self) -> None:
+        self.assertEqual(self.backend.list_collection_summaries(), [])
+        self.backend.save_collections([self.collection, Collection("empty", [])])
+        self.assertEqual(self.backend.list_collection_summaries(), [
+            CollectionSummary.from_collection(self.collection),
+            CollectionSummary("empty", 0)
+        ])
+        summary = self.backend.list_collection_summaries()[0]
+        self.assertEqual(summary.product_count, 2)
+        self.assertAlmostEqual(summary.average_price, 349.99)
+        self.assertEqual((summary.min_price, summary.max_price), (199.99, 499.99))
+        self.assertAlmostEqual(summary.average_rating, 4.25)
+
+    def test_collection_summaries_follow_changes(self) -> None:
+        self.backend.save_collections([self.collection])
+        self.backend.save_product("computers", Product("3", "Monitor", 99.99, "https://www.test.co.uk/product/3", 3.5, "A monitor", []))
+        self.backend.delete_product("computers", "1")
+        summaries = self.backend.list_collection_summaries()
+        self.assertEqual(summaries, [CollectionSummary.from_collection(self.backend.load_collection("computers"))])
+        self.assertEqual(summaries[0].max_price, 199.99)
+        self.backend.delete_collection("computers")
+        self.assertEqual(self.backend.list_collection_summaries(), [])
+
+    def test_commit_partial_csv(self) -> None:
+        DataManager.append_products_to_partial_csv(self.folder, "computers", [self.laptop, self.tablet])
+        collection = self.backend.commit_partial_csv(self.folder, "computers")
+        self.assertEqual([product.productID for product in collection.products], ["1", "2"])
+        self.assertEqual(self.backend.get_product("computers", "1").reviews, self.laptop.reviews)
+        self.assertFalse(os.path.exists(DataManager.get_partial_csv_path(self.folder, "computers")))
+
+class CsvStorageBackendTest(StorageBackendTests, unittest.TestCase):
+    def create_backend(self) -> StorageBackend:
+        return CsvStorageBackend(self.folder)
+
+    def test_collection_summaries_are_kept_in_the_catalog(self) -> None:
+        self.backend.save_collections([self.collection])
+        with open(self.backend.get_catalog_path(), "r") as file:
+            catalog = json.load(file)
+        # Summaries are read from the catalog while the CSV is unchanged, rather than from the CSV
+        catalog["collections"]["computers"]["summary"]["productCount"] = 99
+        with open(self.backend.get_catalog_path(), "w") as file:
+            json.dump(catalog, file)
+        self.assertEqual(CsvStorageBackend(self.folder).list_collection_summaries()[0].product_count, 99)
+        os.utime(self.backend.get_csv_path("computers"), (0, 0))
+        self.assertEqual(CsvStorageBackend(self.folder).list_collection_summaries()[0].product_count, 2)
+
+    def test_csvs_changed_outside_the_backend_are_summarised_again(self) -> None:
+        self.backend.save_collections([self.collection])
+        self.backend.list_collection_summaries()
+        DataManager.save_collections_to_csv_folder(self.folder, [Collection("computers", [self.tablet]), Collection("tablets", [self.tablet])])
+        os.remove(self.backend.get_csv_path("tablets"))
+        DataManager.save_collections_to_csv_folder(self.folder, [Collection("tablets", [self.tablet])])
+        self.assertEqual(self.backend.list_collection_summaries(), [CollectionSummary("computers", 1, 199.99, 199.99, 199.99, 4.0), CollectionSummary("tablets", 1, 199.99, 199.99, 199.99, 4.0)])
+        os.remove(self.backend.get_csv_path("tablets"))
+        self.assertEqual([summary.name for summary in self.backend.list_collection_summaries()], ["computers"])
+
+    def test_summarising_a_csv_does_not_decode_its_reviews(self) -> None:
+        os.makedirs(self.folder)
+        with open(self.backend.get_csv_path("computers"), "w") as file:
+            file.write("productID,name,price,url,rating,description,reviews_json\n")
+            file.write("1,Laptop,10.5,https://www.test.co.uk/product/1,4.0,A laptop,not json\n")
+        self.assertEqual(self.backend.list_collection_summaries(), [CollectionSummary("computers", 1, 10.5, 10.5, 10.5, 4.0)])
+
+    def test_an_unreadable_catalog_is_rebuilt(self) -> None:
+        self.backend.save_collections([self.collection])
+        with open(self.backend.get_catalog_path(), "w") as file:
+            file.write("{")
+        self.assertEqual([summary.name for summary in self.backend.list_collection_summaries()], ["computers"])
+
+class SqliteStorageBackendTest(StorageBackendTests, unittest.TestCase):
+    def create_backend(self) -> StorageBackend:
+        return SqliteStorageBackend(os.path.join(self.folder, "collections.sqlite"))
+
+    def test_product_lookups_use_the_indexes(self) -> None:
+        connection = self.backend._connection
+        plan = " ".join(str(row) for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM products WHERE collection_id = 1 AND product_id = '1'"
+        ))
+        self.assertIn("products_by_product_id", plan)
+
+    def test_deleting_a_collection_deletes_its_reviews(self) -> None:
+        self.backend.save_collections([self.collection])
+        self.backend.delete_collection("computers")
+        self.assertEqual(self.backend._connection.execute("SELECT COUNT(*) FROM reviews").fetchone()[0], 0)
+
+class DataManagerStorageBackendTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.savedSettings = (DataManager.STORAGE_BACKEND, DataManager.CSV_FOLDER, DataManager.SQLITE_PATH, DataManager.storage_backend)
+        DataManager.storage_backend = None
+        DataManager.CSV_FOLDER = os.path.join("StorageTestFolder", "csv")
+        DataManager.SQLITE_PATH = os.path.join("StorageTestFolder", "collections.sqlite")
+
+    def tearDown(self) -> None:
+        if DataManager.storage_backend is not None:
+            DataManager.storage_backend.close()
+        DataManager.STORAGE_BACKEND, DataManager.CSV_FOLDER, DataManager.SQLITE_PATH, DataManager.storage_backend = self.savedSettings
+        shutil.rmtree("StorageTestFolder", ignore_errors=True)
+
+    def test_new_sqlite_storage_imports_the_csv_folder(self) -> None:
+        product = Product("1", "Laptop", 499.99, "https://www.test.co.uk/product/1", 4.5, "A laptop", ["Great"])
+        os.makedirs("StorageTestFolder")
+        DataManager.save_collections_to_csv_folder(DataManager.CSV_FOLDER, [Collection("laptop", [product])])
+        DataManager.STORAGE_BACKEND = "sqlite"
+        backend = DataManager.get_storage_backend()
+        self.assertIsInstance(backend, SqliteStorageBackend)
+        self.assertIs(DataManager.get_storage_backend(), backend)
+        self.assertEqual(backend.get_product("laptop", "1").reviews, ["Great"])
+
+    def test_unknown_storage_backend(self) -> None:
+        DataManager.STORAGE_BACKEND = "parquet"
+        with self.assertRaises(ValueError):
+            DataManager.get_storage_backend()
+
+if __name__ == '__main__':
+    unittest.main()
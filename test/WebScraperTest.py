@@ -0,0 +1,379 @@
+import unittest
+import asyncio
+import os
+import contextlib
+import shutil
+import time
+import aiohttp
+from src.backend.WebScraper import WebScraper
+from src.backend.DescriptionParser import DESCRIPTION_CLASS
+from src.backend.RetryPolicy import RetryPolicy
+from src.backend.ScrapeProgress import ScrapeProgress
+from src.backend.ScrapeCheckpoint import ScrapeCheckpoint
+from src.backend.ScrapeTracer import ScrapeTracer
+from src.backend.RequestScheduler import RequestScheduler
+from src.backend.Collection import Collection
+from src.benchmarks.argos_server import ArgosStandInServer
+
+class WebScraperTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.savedSettings = (WebScraper.BASE_URL, WebScraper.USE_HTTP_CACHE, WebScraper.USE_PRODUCT_STORE, WebScraper.scheduler, WebScraper.robots_rules)
+        WebScraper.USE_HTTP_CACHE = False
+        WebScraper.USE_PRODUCT_STORE = False
+        WebScraper.scheduler = RequestScheduler({
+            name: {"rate": 10000.0, "burst": 10000, "max_concurrency": 8} for name in WebScraper.ENDPOINT_LIMITS
+        }, maxConcurrency=16)
+        WebScraper.robots_rules = None
+        self.savedRetrySettings = (WebScraper.retry_policy, WebScraper.RETRY_BUDGET, WebScraper.REQUEST_TIMEOUT)
+        WebScraper.retry_policy = RetryPolicy(attempts=8, baseDelay=0.01, seed=0)
+
+    def tearDown(self) -> None:
+        WebScraper.BASE_URL, WebScraper.USE_HTTP_CACHE, WebScraper.USE_PRODUCT_STORE, WebScraper.scheduler, WebScraper.robots_rules = self.savedSettings
+        WebScraper.retry_policy, WebScraper.RETRY_BUDGET, WebScraper.REQUEST_TIMEOUT = self.savedRetrySettings
+
+    def run_against_server(self, server : ArgosStandInServer, coroutineFunction, *args):
+        async def run():
+            async with server:
+                WebScraper.BASE_URL = server.url
+                return await coroutineFunction(*args)
+        return asyncio.run(run())
+
+    def test_batch_search_scrapes_shared_products_once(self) -> None:
+        server = ArgosStandInServer(totalProducts=60, reviewsPerProduct=30, searchResults={
+            "tablet": list(range(0, 40)),
+            "computer": list(range(20, 60)),
+            "keyboard": []
+        })
+        collections = self.run_against_server(
+            server, WebScraper.search_for_products_batch, ["Tablet", "computer", "tablet ", "keyboard"]
+        )
+
+        self.assertEqual(list(collections.keys()), ["Tablet", "computer", "keyboard"])
+        self.assertEqual([p.productID for p in collections["Tablet"].products], [server.products[i]["id"] for i in range(0, 40)])
+        self.assertEqual([p.productID for p in collections["computer"].products], [server.products[i]["id"] for i in range(20, 60)])
+        self.assertIsNone(collections["keyboard"])
+        # The 20 products found by both searches are only scraped once
+        self.assertEqual(server.request_counts["product"], 60)
+        self.assertEqual(server.request_counts["reviews"], 60)
+        # Each collection has its own copy of the shared products
+        shared = collections["Tablet"].products[20]
+        self.assertEqual(shared, collections["computer"].products[0])
+        self.assertEqual(len(shared.reviews), 30)
+        shared.reviews.append("Edited")
+        self.assertEqual(len(collections["computer"].products[0].reviews), 30)
+
+    def test_failed_batch_search_does_not_stop_the_others(self) -> None:
+        server = ArgosStandInServer(totalProducts=40, reviewsPerProduct=5, searchResults={"tablet": list(range(0, 40))})
+        savedStream = WebScraper.stream_search_results
+
+        # The broken search lists the tablet products first and then fails, while the tablet search is still waiting
+        async def stream_search_results(session, productName, *args):
+            if productName == "broken":
+                async for page in savedStream(session, "tablet", *args):
+                    yield page
+                    raise ValueError("Search page failed")
+            await asyncio.sleep(0.2)
+            async for page in savedStream(session, productName, *args):
+                yield page
+
+        WebScraper.stream_search_results = staticmethod(stream_search_results)
+        try:
+            collections = self.run_against_server(server, WebScraper.search_for_products_batch, ["tablet", "broken"])
+        finally:
+            WebScraper.stream_search_results = savedStream
+        self.assertIsNone(collections["broken"])
+        self.assertEqual([p.productID for p in collections["tablet"].products], [product["id"] for product in server.products])
+        self.assertTrue(all(len(p.reviews) == 5 for p in collections["tablet"].products))
+
+    def test_search_for_products(self) -> None:
+        server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=5)
+        collection = self.run_against_server(server, WebScraper.search_for_products, "laptop")
+        self.assertEqual(len(collection.products), 10)
+        self.assertNotEqual(collection.products[0].description, "Description not found")
+
+    def test_stream_products_yields_every_product(self) -> None:
+        server = ArgosStandInServer(totalProducts=70, reviewsPerProduct=5)
+        async def collect():
+            return [product async for product in WebScraper.stream_products("laptop", maxProducts=65)]
+        products = self.run_against_server(server, collect)
+
+        self.assertEqual(sorted(p.productID for p in products), sorted(p["id"] for p in server.products[:65]))
+        self.assertEqual(server.request_counts["product"], 65)
+        self.assertTrue(all(len(product.reviews) == 5 for product in products))
+
+    def test_stopping_stream_cancels_scrape(self) -> None:
+        server = ArgosStandInServer(totalProducts=40, reviewsPerProduct=5, latency=0.01)
+        WebScraper.MAX_PRODUCTS_IN_FLIGHT, savedProductsInFlight = 2, WebScraper.MAX_PRODUCTS_IN_FLIGHT
+        async def take_first():
+            async with contextlib.aclosing(WebScraper.stream_products("laptop")) as products:
+                async for product in products:
+                    return product
+        try:
+            product = self.run_against_server(server, take_first)
+        finally:
+            WebScraper.MAX_PRODUCTS_IN_FLIGHT = savedProductsInFlight
+        self.assertIsNotNone(product)
+        self.assertLess(server.request_counts["product"], 40)
+
+    def test_checkpoint_path_is_safe_for_any_search_text(self) -> None:
+        savedFolder = WebScraper.CHECKPOINT_FOLDER
+        WebScraper.CHECKPOINT_FOLDER = "CheckpointTestFolder"
+        try:
+            for productName in ["a/b", "../..", "tv: 4k?", "\u7535\u89c6"]:
+                with self.subTest(productName=productName):
+                    path = WebScraper.get_checkpoint_path(productName)
+                    self.assertEqual(os.path.dirname(path), "CheckpointTestFolder")
+                    self.assertNotIn("/", os.path.basename(path))
+            # Searches that are the same job share a checkpoint, which keeps the name as it was searched
+            self.assertEqual(WebScraper.get_checkpoint_path("TV"), WebScraper.get_checkpoint_path(" tv "))
+            self.assertNotEqual(WebScraper.get_checkpoint_path("a/b"), WebScraper.get_checkpoint_path("a b"))
+            checkpoint = WebScraper.open_checkpoint("a/b")
+            checkpoint.record_product_completed("1")
+            checkpoint.save()
+            self.assertEqual(WebScraper.open_checkpoint("A/B ").product_name, "a/b")
+            self.assertTrue(WebScraper.open_checkpoint("A/B ").is_for("a/b"))
+            self.assertEqual(WebScraper.list_interrupted_scrapes(), ["a/b"])
+        finally:
+            WebScraper.CHECKPOINT_FOLDER = savedFolder
+            shutil.rmtree("CheckpointTestFolder", ignore_errors=True)
+
+    def test_checkpointed_scrape_resumes_without_refetching(self) -> None:
+        path = os.path.join("CheckpointTestFolder", "laptop.json")
+        server = ArgosStandInServer(totalProducts=20, reviewsPerProduct=150)
+        async def interrupted_scrape():
+            saved = []
+            with ScrapeCheckpoint.track(ScrapeCheckpoint(path, "laptop")) as checkpoint:
+                async with contextlib.aclosing(WebScraper.stream_products("laptop")) as products:
+                    async for product in products:
+                        saved.append(product.productID)
+                        checkpoint.record_product_completed(product.productID)
+                        if len(saved) == 5:
+                            break
+            return saved
+        try:
+            saved = self.run_against_server(server, interrupted_scrape)
+            checkpoint = ScrapeCheckpoint.load(path)
+            self.assertEqual(checkpoint.completed_products, set(saved))
+            self.assertIsNotNone(checkpoint.get_search_page(1)[0])
+            descriptionsFetched = sum(1 for state in checkpoint.products_in_progress.values() if state["description"] is not None)
+            reviewPagesFetched = sum(len(state["reviews"]) for state in checkpoint.products_in_progress.values())
+
+            server = ArgosStandInServer(totalProducts=20, reviewsPerProduct=150)
+            async def resumed_scrape():
+                with ScrapeCheckpoint.track(checkpoint):
+                    return [product async for product in WebScraper.stream_products("laptop")]
+            resumed = self.run_against_server(server, resumed_scrape)
+        finally:
+            shutil.rmtree("CheckpointTestFolder", ignore_errors=True)
+
+        self.assertEqual(sorted(saved + [p.productID for p in resumed]), sorted(p["id"] for p in server.products))
+        self.assertEqual(server.request_counts["search"], 0)
+        # Completed products, and descriptions and review pages fetched before the interruption are not fetched again
+        self.assertEqual(server.request_counts["product"], 15 - descriptionsFetched)
+        self.assertEqual(server.request_counts["reviews"], 15 * 2 - reviewPagesFetched)
+        self.assertTrue(all(len(p.reviews) == 150 for p in resumed))
+
+    def test_metadata_collection_is_hydrated(self) -> None:
+        server = ArgosStandInServer(totalProducts=15, reviewsPerProduct=120)
+        async def quick_search():
+            productData = await WebScraper.search_for_product_metadata("laptop")
+            products = [await WebScraper.create_metadata_product(data) for data in productData]
+            collection = Collection("laptop", products)
+            metadataRequests = dict(server.request_counts)
+            pending = [product for product in collection.products if not WebScraper.is_hydrated(product)]
+            hydrated = await WebScraper.hydrate_collection(collection, reviewCounts={data["id"]: data["numOfReviews"] for data in productData})
+            return collection, metadataRequests, pending, hydrated
+        collection, metadataRequests, pending, hydrated = self.run_against_server(server, quick_search)
+
+        self.assertEqual(metadataRequests["product"], 0)
+        self.assertEqual(metadataRequests["reviews"], 0)
+        self.assertEqual(len(pending), 15)
+        self.assertEqual(hydrated, 15)
+        self.assertEqual([product.productID for product in collection.products], [product["id"] for product in server.products])
+        self.assertEqual([product.price for product in collection.products], [product["attributes"]["price"] for product in server.products])
+        for product in collection.products:
+            self.assertTrue(WebScraper.is_hydrated(product))
+            self.assertNotEqual(product.description, "Description not found")
+            self.assertEqual(len(product.reviews), 120)
+        self.assertEqual(server.request_counts["product"], 15)
+        self.assertEqual(server.request_counts["reviews"], 30)
+
+    def test_product_is_hydrated_on_demand(self) -> None:
+        server = ArgosStandInServer(totalProducts=3, reviewsPerProduct=7)
+        async def open_product():
+            productData = await WebScraper.search_for_product_metadata("laptop")
+            product = await WebScraper.create_metadata_product(productData[0])
+            self.assertFalse(WebScraper.is_hydrated(product))
+            self.assertFalse(WebScraper.is_fully_scraped(product))
+            hydrated = await WebScraper.hydrate_product(product, searchTerm="laptop")
+            self.assertIs(hydrated, product)
+            return product
+        product = self.run_against_server(server, open_product)
+        self.assertTrue(WebScraper.is_hydrated(product))
+        self.assertEqual(len(product.reviews), 7)
+        self.assertEqual(server.request_counts["product"], 1)
+
+    def test_description_retry_is_not_mixed_with_a_failed_attempt(self) -> None:
+        def page(description):
+            return (f'<html><body><div class="nav"><a href="/">Home</a></div><div class="{DESCRIPTION_CLASS}"><p>{description}</p></div>'
+                    '<div class="footer">Footer</div></body></html>').encode()
+
+        class StreamedResponse:
+            charset = "utf-8"
+            def __init__(self, body, failAfter=None):
+                self.content = self
+                self.body, self.fail_after = body, failAfter
+            async def iter_chunked(self, size):
+                if self.fail_after is not None:
+                    yield self.body[:self.fail_after]
+                    raise aiohttp.ClientPayloadError("Connection lost")
+                yield self.body
+            def at_eof(self):
+                return True
+            def close(self):
+                pass
+
+        # The first attempt breaks off just after the description, the retry reads a different page
+        async def fetch(client, endpoint, url, headers, bodyReader=None, owner=None):
+            failAfter = page("Old description").index(b'<div class="footer">')
+            with contextlib.suppress(aiohttp.ClientPayloadError):
+                await bodyReader(StreamedResponse(page("Old description"), failAfter=failAfter))
+            return 200, await bodyReader(StreamedResponse(page("New description")))
+
+        savedFetch = WebScraper.fetch
+        WebScraper.fetch = staticmethod(fetch)
+        try:
+            description = asyncio.run(WebScraper.fetch_description(None, "https://www.argos.co.uk/product/1", "https://www.argos.co.uk/"))
+        finally:
+            WebScraper.fetch = savedFetch
+        self.assertEqual(description, "New description")
+
+    def test_failed_requests_are_retried(self) -> None:
+        WebScraper.RETRY_BUDGET = {"minRetries": 100, "retryRatio": 1.0}
+        server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=5, rateLimitRate=0.2, serverErrorRate=0.1, retryAfter=0, seed=1)
+        progress = ScrapeProgress()
+        async def scrape():
+            with ScrapeProgress.track(progress):
+                return await WebScraper.search_for_products("laptop")
+        collection = self.run_against_server(server, scrape)
+
+        self.assertEqual(len(collection.products), 10)
+        for product in collection.products:
+            self.assertFalse(product.description.startswith("Description not found"))
+            self.assertEqual(len(product.reviews), 5)
+        injectedErrors = sum(server.injected_errors.values())
+        self.assertGreater(injectedErrors, 0)
+        self.assertEqual(progress.retries, injectedErrors)
+        self.assertEqual(progress.failed_requests, 0)
+        self.assertEqual(WebScraper.retry_policy.counters[RetryPolicy.RETRIED], injectedErrors)
+
+    def test_traced_scrape_records_each_phase(self) -> None:
+        server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=150)
+        tracer = ScrapeTracer("laptop")
+        async def scrape():
+            with ScrapeTracer.track(tracer):
+                return await WebScraper.search_for_products("laptop")
+        self.run_against_server(server, scrape)
+
+        summary = tracer.summary()
+        self.assertEqual(summary["robots"]["count"], 1)
+        self.assertEqual(summary["search_page"]["count"], 1)
+        self.assertEqual(summary["description"]["count"], 10)
+        self.assertEqual(summary["reviews"]["count"], 20)
+        self.assertEqual(summary["product"]["count"], 10)
+        self.assertEqual(summary["request"]["count"], 31)
+        self.assertEqual(summary["rate_limit_wait"]["count"], 31)
+        # Products are scraped in their own tasks, each on its own track of the trace
+        productTracks = {event["tid"] for event in tracer.events if event["cat"] == "product"}
+        self.assertEqual(len(productTracks), 10)
+
+    def test_retries_stop_when_budget_is_spent(self) -> None:
+        WebScraper.RETRY_BUDGET = {"minRetries": 2, "retryRatio": 0.0}
+        server = ArgosStandInServer(totalProducts=10, serverErrorRate=1.0)
+        collection = self.run_against_server(server, WebScraper.search_for_products, "laptop")
+        self.assertIsNone(collection)
+        self.assertEqual(server.request_counts["search"], 3)
+        self.assertEqual(WebScraper.retry_policy.counters[RetryPolicy.BUDGET_EXHAUSTED], 1)
+
+    def test_retries_stop_after_attempts(self) -> None:
+        WebScraper.retry_policy = RetryPolicy(attempts=3, baseDelay=0.01)
+        server = ArgosStandInServer(totalProducts=10, serverErrorRate=1.0)
+        self.assertIsNone(self.run_against_server(server, WebScraper.search_for_products, "laptop"))
+        self.assertEqual(server.request_counts["search"], 3)
+        self.assertEqual(WebScraper.retry_policy.counters[RetryPolicy.GAVE_UP], 1)
+
+    def test_timed_out_requests_are_retried(self) -> None:
+        WebScraper.retry_policy = RetryPolicy(attempts=2, baseDelay=0.01)
+        WebScraper.REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=0.05)
+        server = ArgosStandInServer(totalProducts=10, latency=0.5)
+        self.assertIsNone(self.run_against_server(server, WebScraper.search_for_products, "laptop"))
+        self.assertEqual(WebScraper.retry_policy.counters[RetryPolicy.TIMEOUT], 2)
+        self.assertEqual(WebScraper.retry_policy.counters[RetryPolicy.GAVE_UP], 1)
+
+    def test_new_reviews_end_at_the_newest_stored_reviews(self) -> None:
+        serverReviews = ["New", "Great", "Also new", "Great", "Fine", "Poor", "Old"]
+        async def fetch_reviews_page(client, productId, productUrl, offset, limit, revalidate=False):
+            return serverReviews[offset:offset + limit]
+
+        savedFetch, savedPageSize = WebScraper.fetch_reviews_page, WebScraper.REVIEW_REFRESH_PAGE_SIZE
+        WebScraper.fetch_reviews_page = staticmethod(fetch_reviews_page)
+        # The stored reviews are split across pages
+        WebScraper.REVIEW_REFRESH_PAGE_SIZE = 4
+        try:
+            def get_new_reviews(storedReviews, numOfReviews=7):
+                return asyncio.run(WebScraper.get_new_reviews(None, "1", "https://www.argos.co.uk/product/1", storedReviews, numOfReviews))
+            # A new review with the same text as the newest stored review is not where the new reviews end
+            self.assertEqual(get_new_reviews(["Great", "Fine", "Poor", "Old"]), ["New", "Great", "Also new"])
+            self.assertEqual(get_new_reviews(["Poor", "Old"]), serverReviews[:5])
+            self.assertEqual(get_new_reviews(["Missing"]), serverReviews)
+            self.assertEqual(get_new_reviews([]), serverReviews)
+        finally:
+            WebScraper.fetch_reviews_page, WebScraper.REVIEW_REFRESH_PAGE_SIZE = savedFetch, savedPageSize
+
+    def test_stored_products_are_not_scraped_again(self) -> None:
+        savedStore = (WebScraper.PRODUCT_STORE_PATH, WebScraper.product_store)
+        WebScraper.USE_PRODUCT_STORE = True
+        WebScraper.PRODUCT_STORE_PATH = os.path.join("ProductStoreTestFolder", "products.sqlite")
+        WebScraper.product_store = None
+        try:
+            server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=5)
+            first = self.run_against_server(server, WebScraper.search_for_products, "laptop")
+            self.assertEqual(server.request_counts["product"], 10)
+
+            server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=5)
+            second = self.run_against_server(server, WebScraper.search_for_products, "laptop")
+            self.assertEqual(server.request_counts["product"], 0)
+            self.assertEqual(server.request_counts["reviews"], 0)
+            self.assertEqual([p.reviews for p in second.products], [p.reviews for p in first.products])
+
+            # Products with more reviews than are stored check for newer reviews, the stand-in server
+            # appends its extra reviews so none of them are newer and the older ones are retrieved instead
+            server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=7)
+            for product in server.products:
+                product["attributes"]["reviewsCount"] = 7
+            third = self.run_against_server(server, WebScraper.search_for_products, "laptop")
+            self.assertEqual(server.request_counts["product"], 0)
+            self.assertEqual(server.request_counts["reviews"], 20)
+            self.assertEqual([p.reviews[:5] for p in third.products], [p.reviews for p in first.products])
+            self.assertTrue(all(len(p.reviews) == 7 for p in third.products))
+
+            # Once retrieved, the older reviews are not asked for again
+            server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=7)
+            for product in server.products:
+                product["attributes"]["reviewsCount"] = 7
+            self.run_against_server(server, WebScraper.search_for_products, "laptop")
+            self.assertEqual(server.request_counts["reviews"], 0)
+
+            # Stale products are scraped again
+            WebScraper.product_store.clear()
+            WebScraper.product_store.put_many(third.products, time.time() - WebScraper.PRODUCT_STORE_MAX_AGE - 1)
+            server = ArgosStandInServer(totalProducts=10, reviewsPerProduct=7)
+            self.run_against_server(server, WebScraper.search_for_products, "laptop")
+            self.assertEqual(server.request_counts["product"], 10)
+        finally:
+            WebScraper.product_store.close()
+            WebScraper.PRODUCT_STORE_PATH, WebScraper.product_store = savedStore
+            shutil.rmtree("ProductStoreTestFolder", ignore_errors=True)
+
+if __name__ == '__main__':
+    unittest.main()